@@ -0,0 +1,190 @@
+# benchmarks/bench_ansi_parser.py
+"""
+Throughput of the streaming AnsiTextParser against the parser the terminal
+tab used before it (copied below) on synthetic UnrealBuildTool output.
+
+The old CSI pattern also matches SGR sequences ("m" is in [A-Za-z]), so the
+old parser removed every color code before its SGR loop ran and returned one
+uncolored run per chunk. "old, colors kept" is the same parser with only that
+pattern fixed: what the old design costs when it does the work it was meant
+to do.
+
+    python benchmarks/bench_ansi_parser.py [megabytes] [chunk_size]
+    python -m benchmarks.bench_ansi_parser [megabytes] [chunk_size]
+"""
+
+import os
+import random
+import re
+import sys
+import time
+
+if __package__ in (None, ""):
+    # started as a script: make `main` importable
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main.ui.ansi import SGR_COLOR_MAP, AnsiTextParser
+
+# ==== Old parser from ui/tabs/terminal.py, kept for comparison ==== #
+# ANSI SGR regex (matches sequences like \x1b[31m or \x1b[1;32m)
+SGR_RE = re.compile(r"\x1b\[((?:\d{1,3};?)+)m")
+# OSC (Operating System Command) sequences like ESC ] 0;title BEL or ESC ] 0;title ESC \
+OSC_RE = re.compile(r"\x1b\].*?(?:\x07|\x1b\\)")
+# Other CSI / control sequences (cursor moves, erase, etc.) - remove conservative set
+CSI_RE = re.compile(r"\x1b\[[:<>?=\d;]*[A-Za-z]")
+
+ATTR_BOLD = 1
+ATTR_UNDERLINE = 4
+ATTR_RESET = 0
+
+
+def parse_sgr_parts(sgr_code_str):
+    """Return list of int codes from SGR parameter string like '1;31' -> [1,31]"""
+    parts = []
+    for p in sgr_code_str.split(";"):
+        try:
+            parts.append(int(p))
+        except ValueError:
+            pass
+    return parts
+
+
+class LegacyAnsiTextParser:
+    # the only change to the copy: the CSI pattern is a class attribute
+    csi_re = CSI_RE
+
+    def __init__(self):
+        self.reset_state()
+
+    def reset_state(self):
+        self.current_fg = None
+        self.bold = False
+        self.underline = False
+
+    def _make_tags(self):
+        tags = []
+        if self.current_fg:
+            tags.append(self.current_fg)
+        if self.bold:
+            tags.append("attr_bold")
+        if self.underline:
+            tags.append("attr_underline")
+        return tags
+
+    def feed(self, text):
+        # First remove OSC and many cursor-control CSI sequences
+        text = OSC_RE.sub("", text)
+        text = self.csi_re.sub("", text)
+
+        # Now iterate over SGR sequences
+        pos = 0
+        for match in SGR_RE.finditer(text):
+            start, end = match.span()
+            if start > pos:
+                yield text[pos:start], self._make_tags()
+
+            codes = parse_sgr_parts(match.group(1))
+            # Apply codes
+            if not codes:
+                codes = [0]
+
+            for code in codes:
+                if code == ATTR_RESET:
+                    self.reset_state()
+                elif code == ATTR_BOLD:
+                    self.bold = True
+                elif code == ATTR_UNDERLINE:
+                    self.underline = True
+                elif 30 <= code <= 37 or 90 <= code <= 97:
+                    # Set foreground
+                    mapping = SGR_COLOR_MAP.get(code)
+                    if mapping:
+                        self.current_fg = mapping[0]
+                elif code == 39:
+                    # default fg
+                    self.current_fg = None
+                # NOTE: bg colors, 256-color, truecolor not implemented here
+            pos = end
+
+        # Remainder
+        if pos < len(text):
+            yield text[pos:], self._make_tags()
+
+
+class LegacyColorParser(LegacyAnsiTextParser):
+    # the old CSI pattern without "m": SGR sequences reach the color loop
+    csi_re = re.compile(r"\x1b\[[:<>?=\d;]*[A-Za-ln-z]")
+
+
+ROUNDS = 7
+# share of lines with escape sequences: a colored build, a plain compile log
+WORKLOADS = (0.3, 0.0)
+
+
+def ue_build_log(megabytes: float, escaped: float = 0.3, seed: int = 7) -> str:
+    """`escaped`: share of lines with escape sequences (colors, titles)."""
+    rng = random.Random(seed)
+    lines = []
+    size = 0
+    target = int(megabytes * 1024 * 1024)
+    n = 0
+    while size < target:
+        n += 1
+        roll = rng.random()
+        if roll >= escaped:
+            line = f"[{n}/48211] Compile Module.Game.{n % 97}.cpp\r\n"
+            lines.append(line)
+            size += len(line)
+            continue
+        roll /= escaped
+        if roll < 0.5:
+            line = (
+                f"\x1b[33mC:\\UE\\Game\\Source\\Actor{n}.cpp(12): warning C4996: "
+                f"'FMemory::Malloc' deprecated\x1b[0m\r\n"
+            )
+        elif roll < 4 / 6:
+            line = f"\x1b[1;31mError: Unresolved external symbol Foo{n}\x1b[0m\r\n"
+        elif roll < 5 / 6:
+            line = (
+                f"\x1b]0;UnrealBuildTool {n}\x07\x1b[2K\x1b[0G{n} actions remaining\r\n"
+            )
+        else:
+            line = (
+                f"\x1b[38;5;{n % 256}mLogCook: Display: Cooked {n} packages\x1b[0m\r\n"
+            )
+        lines.append(line)
+        size += len(line)
+    return "".join(lines)
+
+
+def bench(parser, data: str, chunk_size: int) -> float:
+    start = time.perf_counter()
+    for i in range(0, len(data), chunk_size):
+        for _ in parser.feed(data[i : i + chunk_size]):
+            pass
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 20
+    chunk_size = int(sys.argv[2]) if len(sys.argv) > 2 else 4096
+    parsers = {
+        "old parser": LegacyAnsiTextParser,
+        "old, colors kept": LegacyColorParser,
+        "streaming": AnsiTextParser,
+    }
+
+    for escaped in WORKLOADS:
+        data = ue_build_log(megabytes, escaped)
+        print(f"{escaped:.0%} of the lines with escape sequences")
+        best = dict.fromkeys(parsers, float("inf"))
+        # alternating rounds, best of each: load on the machine hits both alike
+        for _ in range(ROUNDS):
+            for name, parser in parsers.items():
+                best[name] = min(best[name], bench(parser(), data, chunk_size))
+        for name, elapsed in best.items():
+            print(f"{name:>18}: {elapsed:.3f}s  {megabytes / elapsed:.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# benchmarks/bench_staging.py
+"""
+Wall time of one `git add -A` against the StagingPipeline on a synthetic
+changeset of binary assets in a throwaway repository. The changeset is the
+same for every run (fixed seed); the variants take turns for `repeats` rounds,
+each on a fresh repository, and the median and best time are printed.
+
+    python -m benchmarks.bench_staging [files] [kilobytes per file] [repeats]
+"""
+
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from main.core.git import GitRepo
+from main.core.staging import BATCH_SIZE, StagingPipeline
+
+NUL = b"\0"
+
+
+def make_repo(root: str, files: int, size: int) -> None:
+    subprocess.run(["git", "init", "-q", root], check=True)
+    rng = random.Random(1)
+    # half random, half repetitive: compressible like real assets
+    block = bytes(rng.getrandbits(8) for _ in range(size // 2))
+    for i in range(files):
+        folder = os.path.join(root, "Content", f"Folder{i % 100}")
+        os.makedirs(folder, exist_ok=True)
+        with open(os.path.join(folder, f"SM_Asset{i}.uasset"), "wb") as f:
+            f.write(block + i.to_bytes(4, "little") * (size // 8))
+
+
+def run_once(name: str, batch_size: int | None, files: int, size: int) -> float:
+    root = tempfile.mkdtemp(prefix="bench-staging-")
+    try:
+        make_repo(root, files, size)
+        repo = GitRepo(root)
+        start = time.perf_counter()
+        if batch_size is None:
+            repo.run("add", "-A")
+        else:
+            StagingPipeline(repo, batch_size=batch_size).stage(repo.status().entries)
+        elapsed = time.perf_counter() - start
+        staged = repo.run("diff", "--cached", "--name-only", "-z").stdout
+        assert staged.count(NUL) == files, f"{name}: {staged.count(NUL)} staged"
+        repo.close()
+        return elapsed
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def main() -> None:
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    size = (int(sys.argv[2]) if len(sys.argv) > 2 else 256) * 1024
+    repeats = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+    print(
+        f"{files} files of {size // 1024} KiB, {repeats} runs each,"
+        f" {os.cpu_count()} CPUs"
+    )
+
+    variants = [("git add -A", None), (f"batches of {BATCH_SIZE}", BATCH_SIZE)]
+    if files > 500:
+        variants.append(("batches of 500", 500))
+    # interleaved, so a slower phase of the machine hits every variant alike
+    times: dict[str, list[float]] = {name: [] for name, _ in variants}
+    for _ in range(repeats):
+        for name, batch_size in variants:
+            times[name].append(run_once(name, batch_size, files, size))
+    for name, runs in times.items():
+        print(
+            f"{name:<16} median {statistics.median(runs):6.2f}s"
+            f"  best {min(runs):6.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
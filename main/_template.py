@@ -1,56 +1,93 @@
-from rich.traceback import install as rich_tcbck_install
+"""
+Shared logger and application bootstrap.
 
-rich_tcbck_install()
-# ============================#
+Importing this module has no side effects: it only creates the logger and the
+in-memory log buffer. `init_app()` (called once by `main.main.run`) installs
+the rich tracebacks, creates the log file and the temporary files, and checks
+pyproject.toml. pyproject.toml is parsed at most once per process.
+"""
 
 import atexit
+import functools
 import getpass
 import logging
 import os
 import platform
 import tempfile
+import threading
 from datetime import datetime
 from pathlib import Path
 
-import toml
-from rich.logging import RichHandler
-
+from main.appdirs import APP_NAME
+from main.core.logbuffer import RingBufferHandler
 from main.errors import PyProjectError
 
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+PYPROJECT = PROJECT_ROOT / "pyproject.toml"
+
+# in-memory copy of the log stream for the UI panels
+log_buffer = RingBufferHandler(capacity=5000)
+log_buffer.setLevel(logging.DEBUG)
+
+LOGGER = logging.getLogger(APP_NAME)
+
+# created by init_app()
+TMPDIR: str | None = None
+TMPFILE: str | None = None
+
+_init_lock = threading.Lock()
+_initialized = False
+
+
+@functools.cache
+def _pyproject() -> dict:
+    import toml
+
+    return toml.load(PYPROJECT)
+
 
 def _get_project_name() -> str:
-    pyproject = toml.load(Path("./pyproject.toml"))
-    return pyproject["project"]["name"]
+    return _pyproject()["project"]["name"]
 
 
-# ensure logs directory exists and add a file handler alongside the RichHandler
-logs_dir = Path("./logs")
-logs_dir.mkdir(parents=True, exist_ok=True)
-log_file = f"logs/{_get_project_name()}-{datetime.now().strftime('%d%m%Y%H%M%S')}-{platform.node()}.log"
+def _setup_logging() -> None:
+    from rich.logging import RichHandler
 
-file_handler = logging.FileHandler(Path(log_file), encoding="utf-8")
-file_handler.setLevel(logging.DEBUG)
-file_formatter = logging.Formatter(
-    "%(asctime)s @ %(name)s | %(levelname)s | %(message)s"
-)
-file_handler.setFormatter(file_formatter)
+    # ensure logs directory exists and add a file handler alongside the RichHandler
+    logs_dir = Path("./logs")
+    logs_dir.mkdir(parents=True, exist_ok=True)
+    log_file = f"logs/{_get_project_name()}-{datetime.now().strftime('%d%m%Y%H%M%S')}-{platform.node()}.log"
 
-console_handler = RichHandler(rich_tracebacks=True)
-console_handler.setLevel(logging.DEBUG)
+    file_handler = logging.FileHandler(Path(log_file), encoding="utf-8")
+    file_handler.setLevel(logging.DEBUG)
+    file_formatter = logging.Formatter(
+        "%(asctime)s @ %(name)s | %(levelname)s | %(message)s"
+    )
+    file_handler.setFormatter(file_formatter)
 
-logging.basicConfig(level=logging.DEBUG, handlers=[console_handler, file_handler])
+    console_handler = RichHandler(rich_tracebacks=True)
+    console_handler.setLevel(logging.DEBUG)
 
-LOGGER = logging.getLogger(_get_project_name())
-LOGGER.debug("Logger initialized.")
+    log_buffer.setFormatter(file_formatter)
 
+    logging.basicConfig(
+        level=logging.DEBUG, handlers=[console_handler, file_handler, log_buffer]
+    )
+    LOGGER.debug("Logger initialized.")
 
-def check_pyproject(path: Path = Path("./pyproject.toml")):
+
+def check_pyproject(path: Path = PYPROJECT):
     if Path("./development.run").exists():
         LOGGER.warning("Development run detected. Skipping pyproject.toml checks.")
         return
 
     LOGGER.debug(f'Checking pyproject.toml at: "{path.resolve()}"')
-    pyproject = toml.load(path)
+    if path == PYPROJECT:
+        pyproject = _pyproject()
+    else:
+        import toml
+
+        pyproject = toml.load(path)
 
     if pyproject["project"]["name"] == "YOURPROJECTNAME":
         LOGGER.error("The 'name' field in pyproject.toml is not set.")
@@ -69,7 +106,6 @@ def check_pyproject(path: Path = Path("./pyproject.toml")):
         )
 
 
-@atexit.register
 def at_exit_cleanup():
     LOGGER.debug("Running at_exit cleanup.")
     try:
@@ -83,16 +119,24 @@ def at_exit_cleanup():
         LOGGER.error(f"Error during cleanup of temporary file: {e}")
 
 
-TMPDIR = tempfile.mkdtemp(
-    suffix=f"-{_get_project_name()}-{getpass.getuser()}-{platform.node()}"
-)
-LOGGER.info(f'Temporary directory created at: "{TMPDIR}"')
+def init_app() -> None:
+    """Process-wide setup for the GUI; safe to call more than once."""
+    global TMPDIR, TMPFILE, _initialized
+    with _init_lock:
+        if _initialized:
+            return
+        _initialized = True
+
+    from rich.traceback import install as rich_tcbck_install
 
-TMPFILE = tempfile.mkstemp(
-    suffix=f"-{_get_project_name()}-{getpass.getuser()}-{platform.node()}.tmp",
-)[1]
-LOGGER.info(f'Temporary file created at: "{TMPFILE}"')
+    rich_tcbck_install()
+    _setup_logging()
 
+    suffix = f"-{_get_project_name()}-{getpass.getuser()}-{platform.node()}"
+    TMPDIR = tempfile.mkdtemp(suffix=suffix)
+    LOGGER.info(f'Temporary directory created at: "{TMPDIR}"')
+    TMPFILE = tempfile.mkstemp(suffix=f"{suffix}.tmp")[1]
+    LOGGER.info(f'Temporary file created at: "{TMPFILE}"')
+    atexit.register(at_exit_cleanup)
 
-# ==== MAIN ==== #
-check_pyproject(Path("./pyproject.toml"))
+    check_pyproject(PYPROJECT)
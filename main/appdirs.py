@@ -0,0 +1,21 @@
+import os
+import platform
+from pathlib import Path
+
+APP_NAME = "unrealgitui"
+
+
+def user_cache_dir() -> Path:
+    """Per-user cache directory, created on first use."""
+    system = platform.system()
+    if system == "Windows":
+        base = Path(os.getenv("LOCALAPPDATA") or Path.home() / "AppData" / "Local")
+        path = base / APP_NAME / "Cache"
+    elif system == "Darwin":
+        path = Path.home() / "Library" / "Caches" / APP_NAME
+    else:
+        base = Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache")
+        path = base / APP_NAME
+
+    path.mkdir(parents=True, exist_ok=True)
+    return path
@@ -1,30 +1,253 @@
+"""
+Config service.
+
+`main/config.json` is parsed once per process and cached; `load()` only stats
+the file and re-parses it when its mtime or size changed. Subscribers are told
+which (dotted) keys changed, whether by `set_value()` or by an edit on disk. Writes go
+to a temp file in the same folder that then replaces config.json, so a crash
+never leaves a half-written file behind.
+
+The GitHub token comes from `main/.env` (or the environment) and is kept apart
+from the config data: it is never logged and never written to config.json.
+"""
+
+import copy
 import json
 import os
-from dotenv import load_dotenv
-from main.errors import MissingDotEnvFile, MissingGithubToken
+import tempfile
+import threading
+from typing import Any, Callable
+
+from dotenv import dotenv_values
+
 from main._template import LOGGER
+from main.errors import MissingDotEnvFile, MissingGithubToken
+
+CONFIG_PATH = "main/config.json"
+ENV_PATH = "main/.env"
+TOKEN_KEY = "GITHUB_TOKEN"
+
+_MISSING = object()
+
+
+def _flatten(data: Any, prefix: str = "") -> dict[str, Any]:
+    """{"git": {"user": "x"}} -> {"git.user": "x"}; lists are leaves."""
+    if not isinstance(data, dict) or (prefix and not data):
+        return {prefix: data}
+    flat: dict[str, Any] = {}
+    for key, value in data.items():
+        flat.update(_flatten(value, f"{prefix}.{key}" if prefix else key))
+    return flat
+
+
+def _changed_keys(old: dict, new: dict) -> set[str]:
+    old_flat, new_flat = _flatten(old), _flatten(new)
+    return {
+        key
+        for key in old_flat.keys() | new_flat.keys()
+        if old_flat.get(key, _MISSING) != new_flat.get(key, _MISSING)
+    }
+
+
+def _write_atomic(path: str, text: str) -> None:
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(
+        dir=directory, prefix=os.path.basename(path) + ".", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class ConfigService:
+    def __init__(self, path: str = CONFIG_PATH, env_path: str = ENV_PATH):
+        self.path = path
+        self.env_path = env_path
+        self._lock = threading.RLock()
+        # one dict for the whole process: reloads update it in place, so
+        # modules that kept a reference see the new values
+        self._data: dict = {}
+        self._stamp: tuple[int, int] | None = None
+        self._token: str | None = None
+        self._subscribers: list[tuple[Callable[[set[str]], None], tuple]] = []
+        # number of times config.json was parsed
+        self.loads = 0
 
+    # ==== reading ==== #
+    def _file_stamp(self) -> tuple[int, int]:
+        st = os.stat(self.path)
+        return st.st_mtime_ns, st.st_size
 
-def load_config(file_path: str) -> dict:
-    with open(file_path, "r") as file:
-        config = json.load(file)
-    if os.path.exists('main/.env'):
-        load_dotenv('main/.env')
-        token: str | None = os.getenv('GITHUB_TOKEN')
+    def load(self) -> dict:
+        """The cached config; re-parsed only if the file changed on disk."""
+        with self._lock:
+            stamp = self._file_stamp()
+            if stamp == self._stamp:
+                return self._data
+            first = self._stamp is None
+            with open(self.path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            self.loads += 1
+            changed = set() if first else _changed_keys(self._data, data)
+            self._data.clear()
+            self._data.update(data)
+            if first:
+                # no stamp without a token: the next load() raises again
+                self._load_token()
+            self._stamp = stamp
+            if first:
+                LOGGER.info(
+                    f"Config loaded from {self.path}: {', '.join(sorted(data))}"
+                )
+            elif changed:
+                LOGGER.info(f"Config reloaded, changed: {', '.join(sorted(changed))}")
+        if changed:
+            self._notify(changed)
+        return self._data
+
+    def _load_token(self) -> None:
+        if not os.path.exists(self.env_path):
+            raise MissingDotEnvFile(f"Your .env file at `{self.env_path}` is missing")
+        token = os.environ.get(TOKEN_KEY) or dotenv_values(self.env_path).get(TOKEN_KEY)
         if not token:
-            raise MissingGithubToken('Your Github Token is Missing in the `main/.env` file, or there is no Entry named `GITHUB_TOKEN` in the `main/.env` file')
-        config['git']['token'] = token
-    else:
-        raise MissingDotEnvFile('Your .env file at `main/.env` is missing')
-    
-    LOGGER.info(f'Config loaded: {config}')
-    return config
+            raise MissingGithubToken(
+                f"Your Github Token is Missing in the `{self.env_path}` file, or there"
+                f" is no Entry named `{TOKEN_KEY}` in the `{self.env_path}` file"
+            )
+        self._token = token
+
+    @property
+    def token(self) -> str | None:
+        with self._lock:
+            if self._stamp is None:
+                self.load()
+            # an older config.json may still carry the token itself
+            return self._token or self._data.get("git", {}).get("token")
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Value of a dotted key, e.g. `get("terminal.overflow", "drop")`."""
+        value: Any = self.load()
+        for part in key.split("."):
+            if not isinstance(value, dict) or part not in value:
+                return default
+            value = value[part]
+        return value
+
+    # ==== writing ==== #
+    def set_value(self, key: str, value: Any) -> None:
+        """Set a dotted key and save; subscribers of the key are notified."""
+        with self._lock:
+            data = copy.deepcopy(self.load())
+            node = data
+            *parents, last = key.split(".")
+            for part in parents:
+                node = node.setdefault(part, {})
+            node[last] = value
+        self.replace(data)
+
+    def replace(self, data: dict) -> None:
+        """Write `data` as the new config (atomically) and notify subscribers."""
+        data = copy.deepcopy(data)
+        git = data.get("git")
+        if isinstance(git, dict) and self._token and git.get("token") == self._token:
+            # the token from .env never ends up in config.json
+            del git["token"]
+        with self._lock:
+            if self._stamp is None:
+                self.load()
+            changed = _changed_keys(self._data, data)
+            if not changed:
+                return
+            _write_atomic(self.path, json.dumps(data, indent=4))
+            self._data.clear()
+            self._data.update(data)
+            # our own write must not look like an external edit
+            self._stamp = self._file_stamp()
+        LOGGER.info(f"Config saved, changed: {', '.join(sorted(changed))}")
+        self._notify(changed)
+
+    def set_token(self, token: str) -> None:
+        """Store the GitHub token in the .env file, never in config.json."""
+        with self._lock:
+            lines = []
+            if os.path.exists(self.env_path):
+                with open(self.env_path, "r", encoding="utf-8") as f:
+                    lines = [
+                        line
+                        for line in f.read().splitlines()
+                        if not line.strip().startswith(f"{TOKEN_KEY}=")
+                    ]
+            lines.append(f"{TOKEN_KEY}={token}")
+            _write_atomic(self.env_path, "\n".join(lines) + "\n")
+            self._token = token
+        LOGGER.info("Git authentication token saved.")
+
+    # ==== change notifications ==== #
+    def subscribe(
+        self, callback: Callable[[set[str]], None], *keys: str
+    ) -> Callable[[], None]:
+        """
+        callback(changed keys) for changes below one of `keys` (all if none).
+        Called on the thread that made or noticed the change.
+        """
+        entry = (callback, keys)
+        with self._lock:
+            self._subscribers.append(entry)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                if entry in self._subscribers:
+                    self._subscribers.remove(entry)
+
+        return unsubscribe
+
+    def _notify(self, changed: set[str]) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback, keys in subscribers:
+            relevant = {
+                key
+                for key in changed
+                if not keys or any(key == k or key.startswith(k + ".") for k in keys)
+            }
+            if not relevant:
+                continue
+            try:
+                callback(relevant)
+            except Exception as e:
+                LOGGER.error(f"Config subscriber failed: {e}")
+
+
+_SERVICES: dict[str, ConfigService] = {}
+_SERVICES_LOCK = threading.Lock()
+
+
+def get_config_service(file_path: str = CONFIG_PATH) -> ConfigService:
+    """One service per config file for the whole process."""
+    key = os.path.normcase(os.path.abspath(file_path))
+    with _SERVICES_LOCK:
+        service = _SERVICES.get(key)
+        if service is None:
+            service = _SERVICES[key] = ConfigService(file_path)
+        return service
+
+
+def load_config(file_path: str = CONFIG_PATH) -> dict:
+    return get_config_service(file_path).load()
 
 
 def save_config(file_path: str, config: dict) -> None:
-    with open(file_path, "w") as file:
-        json.dump(config, file, indent=4)
+    get_config_service(file_path).replace(config)
 
 
 def check_config(required_keys: list) -> bool:
-    return all(key in load_config("main/config.json") for key in required_keys)
+    return all(key in load_config(CONFIG_PATH) for key in required_keys)
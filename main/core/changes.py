@@ -0,0 +1,288 @@
+"""
+Unreal change inspector.
+
+Sorts the entries of the git status stream into Blueprints, Materials, C++,
+Config, Plugins, Maps and Other. The rules are compiled once into a trie over
+leading path components (Plugins/, Source/, Config/), an extension table, a
+set of folder names and a trie over asset name prefixes (BP_, M_, MI_, ...).
+
+`ChangeIndex` keeps the last status per path. A refresh only classifies and
+sizes paths that are new or whose status changed; per-category counts and
+byte totals are adjusted instead of recomputed.
+"""
+
+import os
+from typing import Callable, Iterable, NamedTuple
+
+from main.core.git import StatusEntry
+
+BLUEPRINTS = "Blueprints"
+MATERIALS = "Materials"
+CPP = "C++"
+CONFIG = "Config"
+PLUGINS = "Plugins"
+MAPS = "Maps"
+OTHER = "Other"
+CATEGORIES = (BLUEPRINTS, MATERIALS, CPP, CONFIG, PLUGINS, MAPS, OTHER)
+
+# leading path components -> category; the deepest match wins
+PATH_RULES = {
+    "Plugins": PLUGINS,
+    "Source": CPP,
+    "Config": CONFIG,
+}
+EXTENSION_RULES = {
+    ".umap": MAPS,
+    ".ini": CONFIG,
+    ".h": CPP,
+    ".hpp": CPP,
+    ".inl": CPP,
+    ".c": CPP,
+    ".cc": CPP,
+    ".cpp": CPP,
+    ".cs": CPP,  # *.Build.cs / *.Target.cs
+}
+# folders anywhere below Content/
+FOLDER_RULES = {
+    "blueprints": BLUEPRINTS,
+    "materials": MATERIALS,
+    "maps": MAPS,
+}
+# Unreal asset naming conventions
+NAME_PREFIX_RULES = {
+    "BP_": BLUEPRINTS,
+    "BPI_": BLUEPRINTS,
+    "BPFL_": BLUEPRINTS,
+    "ABP_": BLUEPRINTS,
+    "WBP_": BLUEPRINTS,
+    "GM_": BLUEPRINTS,
+    "M_": MATERIALS,
+    "MI_": MATERIALS,
+    "MF_": MATERIALS,
+    "MPC_": MATERIALS,
+}
+ASSET_EXTENSIONS = (".uasset",)
+
+_VALUE = object()
+
+
+class Trie:
+    """Longest-prefix lookup over sequences (path components or characters)."""
+
+    def __init__(self, rules: dict | None = None):
+        self._root: dict = {}
+        for key, value in (rules or {}).items():
+            self.insert(key, value)
+
+    def insert(self, key: Iterable, value: str) -> None:
+        node = self._root
+        for part in key:
+            node = node.setdefault(part, {})
+        node[_VALUE] = value
+
+    def longest(self, parts: Iterable) -> str | None:
+        node = self._root
+        found = None
+        for part in parts:
+            node = node.get(part)
+            if node is None:
+                break
+            found = node.get(_VALUE, found)
+        return found
+
+
+class CategoryMatcher:
+    def __init__(
+        self,
+        path_rules: dict[str, str] = PATH_RULES,
+        extension_rules: dict[str, str] = EXTENSION_RULES,
+        folder_rules: dict[str, str] = FOLDER_RULES,
+        name_prefix_rules: dict[str, str] = NAME_PREFIX_RULES,
+    ):
+        # case-insensitive like the file systems Unreal projects live on
+        self._paths = Trie(
+            {tuple(k.lower().split("/")): v for k, v in path_rules.items()}
+        )
+        self._extensions = {k.lower(): v for k, v in extension_rules.items()}
+        self._folders = {k.lower(): v for k, v in folder_rules.items()}
+        self._prefixes = Trie({k.lower(): v for k, v in name_prefix_rules.items()})
+        # projects have far fewer folders than files
+        self._dirs: dict[str, tuple[str | None, str | None]] = {}
+
+    def _classify_dir(self, directory: str) -> tuple[str | None, str | None]:
+        # (category from the leading components, innermost matching folder)
+        cached = self._dirs.get(directory)
+        if cached is None:
+            parts = directory.split("/") if directory else []
+            folder = None
+            for part in reversed(parts):
+                folder = self._folders.get(part)
+                if folder is not None:
+                    break
+            cached = self._dirs[directory] = (self._paths.longest(parts), folder)
+        return cached
+
+    def classify(self, path: str) -> str:
+        directory, _, name = path.replace("\\", "/").lower().rpartition("/")
+        by_path, by_folder = self._classify_dir(directory)
+        if by_path is not None:
+            return by_path
+
+        ext = name[name.rfind(".") :] if "." in name else ""
+        category = self._extensions.get(ext)
+        if category is not None:
+            return category
+
+        if ext in ASSET_EXTENSIONS:
+            category = self._prefixes.longest(name)
+            if category is not None:
+                return category
+            # innermost matching folder, e.g. Content/Maps/Materials/x.uasset
+            if by_folder is not None:
+                return by_folder
+        return OTHER
+
+
+class IndexedChange(NamedTuple):
+    entry: StatusEntry
+    category: str
+    size: int
+
+
+class IndexDelta(NamedTuple):
+    added: list[str]
+    changed: list[str]
+    removed: list[str]
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+
+def stat_sizes(root: str, paths: list[str]) -> dict[str, int]:
+    """Sizes of files in the working tree, 0 for missing (deleted) files."""
+    sizes = {}
+    for path in paths:
+        try:
+            sizes[path] = os.stat(os.path.join(root, path)).st_size
+        except OSError:
+            sizes[path] = 0
+    return sizes
+
+
+def touched_paths(
+    root: str, entries: Iterable[StatusEntry], mtimes: dict[str, int]
+) -> list[str]:
+    """
+    Paths whose mtime moved since the last call, for `ChangeIndex.update`'s
+    restat: a file saved again keeps its status line but not its size.
+    `mtimes` carries the mtimes from one call to the next.
+    """
+    touched = []
+    current = {}
+    for entry in entries:
+        if entry.kind == "ignored":
+            continue
+        try:
+            mtime = os.stat(os.path.join(root, entry.path)).st_mtime_ns
+        except OSError:
+            continue
+        current[entry.path] = mtime
+        if entry.path in mtimes and mtimes[entry.path] != mtime:
+            touched.append(entry.path)
+    mtimes.clear()
+    mtimes.update(current)
+    return touched
+
+
+class ChangeIndex:
+    def __init__(
+        self,
+        root: str,
+        matcher: CategoryMatcher | None = None,
+        sizer: Callable[[str, list[str]], dict[str, int]] = stat_sizes,
+    ):
+        """
+        sizer(root, paths) -> {path: bytes}: only called for paths that changed,
+        e.g. a cached/threaded stat from the large asset detector
+        """
+        self.root = root
+        self.matcher = matcher or CategoryMatcher()
+        self._sizer = sizer
+        self._entries: dict[str, IndexedChange] = {}
+        # classification depends only on the path, keep it across refreshes
+        self._categories: dict[str, str] = {}
+        self._counts = dict.fromkeys(CATEGORIES, 0)
+        self._bytes = dict.fromkeys(CATEGORIES, 0)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def category_of(self, path: str) -> str:
+        category = self._categories.get(path)
+        if category is None:
+            category = self._categories[path] = self.matcher.classify(path)
+        return category
+
+    def update(
+        self, entries: Iterable[StatusEntry], restat: Iterable[str] = ()
+    ) -> IndexDelta:
+        """Apply one full status listing; `restat` forces new sizes for known paths."""
+        old = self._entries
+        seen: dict[str, StatusEntry] = {}
+        dirty: list[str] = []
+        added: list[str] = []
+        changed: list[str] = []
+
+        for entry in entries:
+            if entry.kind == "ignored":
+                continue
+            seen[entry.path] = entry
+            known = old.get(entry.path)
+            if known is None:
+                added.append(entry.path)
+                dirty.append(entry.path)
+            elif known.entry != entry:
+                changed.append(entry.path)
+                dirty.append(entry.path)
+
+        for path in restat:
+            if path in seen and path in old and old[path].entry == seen[path]:
+                changed.append(path)
+                dirty.append(path)
+
+        removed = [path for path in old if path not in seen]
+        for path in removed:
+            self._remove(path)
+
+        sizes = self._sizer(self.root, dirty) if dirty else {}
+        for path in dirty:
+            if path in old:
+                self._remove(path)
+            self._add(seen[path], sizes.get(path, 0))
+
+        return IndexDelta(added, changed, removed)
+
+    def _add(self, entry: StatusEntry, size: int) -> None:
+        category = self.category_of(entry.path)
+        self._entries[entry.path] = IndexedChange(entry, category, size)
+        self._counts[category] += 1
+        self._bytes[category] += size
+
+    def _remove(self, path: str) -> None:
+        indexed = self._entries.pop(path)
+        self._counts[indexed.category] -= 1
+        self._bytes[indexed.category] -= indexed.size
+
+    def summary(self) -> dict[str, tuple[int, int]]:
+        """category -> (changed files, bytes in the working tree)."""
+        return {c: (self._counts[c], self._bytes[c]) for c in CATEGORIES}
+
+    def files(self, category: str | None = None) -> list[IndexedChange]:
+        return [
+            change
+            for change in self._entries.values()
+            if category is None or change.category == category
+        ]
+
+    def get(self, path: str) -> IndexedChange | None:
+        return self._entries.get(path)
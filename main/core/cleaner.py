@@ -0,0 +1,318 @@
+"""
+Auto clean for the generated folders of an Unreal project.
+
+`plan()` walks the target folders in parallel: every directory is one
+`os.scandir` job on a thread pool, subdirectories are queued as soon as they
+are seen, and file sizes come from the scandir entry. The result is a dry-run
+report per folder, nothing is deleted.
+
+`clean()` deletes exactly the planned files on the same kind of pool, then the
+emptied directories from the deepest level up, and reports progress after
+every batch. Excluded paths (and everything below them) are never touched.
+Symlinks and Windows junctions are removed as links and never followed.
+"""
+
+import os
+import stat
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Callable, Iterable, NamedTuple
+
+from main._template import LOGGER
+
+DEFAULT_FOLDERS = (
+    "Intermediate",
+    "Saved",
+    "DerivedDataCache",
+    "Binaries",
+    "Plugins/*/Intermediate",
+    "Plugins/*/Binaries",
+)
+# editor settings and save games live in Saved/
+DEFAULT_EXCLUDE = ("Saved/Config", "Saved/SaveGames")
+WORKERS = 16
+DELETE_BATCH = 256
+
+
+class FolderPlan(NamedTuple):
+    folder: str
+    # (path, size)
+    files: list[tuple[str, int]]
+    # deepest first, so they can be removed in order
+    dirs: list[str]
+    bytes: int
+
+
+class CleanPlan(NamedTuple):
+    root: str
+    folders: list[FolderPlan]
+    excluded: list[str]
+    elapsed: float
+
+    @property
+    def bytes(self) -> int:
+        return sum(f.bytes for f in self.folders)
+
+    @property
+    def files(self) -> int:
+        return sum(len(f.files) for f in self.folders)
+
+
+class CleanProgress(NamedTuple):
+    files_done: int
+    files_total: int
+    bytes_done: int
+    bytes_total: int
+
+
+class CleanReport(NamedTuple):
+    freed_bytes: int
+    files: int
+    dirs: int
+    errors: list[str]
+    elapsed: float
+
+
+def _normalize(path: str) -> str:
+    path = path.replace("\\", "/").strip("/")
+    # Windows file systems are case-insensitive
+    return path.lower() if sys.platform == "win32" else path
+
+
+def _is_link(st: os.stat_result) -> bool:
+    """lstat() result of a symlink, junction or other reparse point (see shutil.rmtree)."""
+    return (
+        stat.S_ISLNK(st.st_mode)
+        or bool(
+            getattr(st, "st_file_attributes", 0) & stat.FILE_ATTRIBUTE_REPARSE_POINT
+        )
+        or bool(getattr(st, "st_reparse_tag", 0))
+    )
+
+
+def _remove_file(path: str) -> None:
+    try:
+        os.unlink(path)
+    except PermissionError:
+        if _is_link(os.lstat(path)):
+            # directory symlink / junction, planned as a file: rmdir removes
+            # only the link, the target stays
+            os.rmdir(path)
+            return
+        # read-only files (e.g. from Perforce/plugins) on Windows
+        os.chmod(path, stat.S_IWRITE)
+        os.unlink(path)
+
+
+class ProjectCleaner:
+    def __init__(
+        self,
+        root: str,
+        folders: Iterable[str] = DEFAULT_FOLDERS,
+        exclude: Iterable[str] = DEFAULT_EXCLUDE,
+        workers: int = WORKERS,
+    ):
+        """
+        folders: glob patterns of the folders to clean, relative to the project
+        exclude: glob patterns relative to the project; a matching directory
+                 keeps its whole subtree
+        """
+        self.root = os.path.abspath(root)
+        self.folders = list(folders)
+        self.exclude = [_normalize(pattern) for pattern in exclude]
+        self.workers = workers
+
+    def _excluded(self, relative: str) -> bool:
+        relative = _normalize(relative)
+        return any(fnmatchcase(relative, pattern) for pattern in self.exclude)
+
+    def _real_dir(self, relative: str) -> bool:
+        # every component below the root: glob() walks through links, e.g. a
+        # plugin folder that is a junction into another project
+        path = self.root
+        for part in relative.split("/"):
+            path = os.path.join(path, part)
+            try:
+                st = os.lstat(path)
+            except OSError:
+                return False
+            if _is_link(st):
+                return False
+        return stat.S_ISDIR(st.st_mode)
+
+    def targets(self) -> list[str]:
+        """Existing folders matched by `folders`, relative to the project."""
+        found: list[str] = []
+        root = Path(self.root)
+        for pattern in self.folders:
+            for path in sorted(root.glob(pattern)):
+                relative = path.relative_to(root).as_posix()
+                if (
+                    relative not in found
+                    and not self._excluded(relative)
+                    and self._real_dir(relative)
+                ):
+                    found.append(relative)
+        return found
+
+    # ==== dry run ==== #
+    def _scan_dir(
+        self, relative: str
+    ) -> tuple[list[tuple[str, int]], list[str], list[str]]:
+        files: list[tuple[str, int]] = []
+        dirs: list[str] = []
+        excluded: list[str] = []
+        with os.scandir(os.path.join(self.root, relative)) as entries:
+            for entry in entries:
+                child = f"{relative}/{entry.name}"
+                if self._excluded(child):
+                    excluded.append(child)
+                    continue
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    files.append((child, 0))
+                    continue
+                # is_dir(follow_symlinks=False) is also true for a junction
+                if stat.S_ISDIR(st.st_mode) and not _is_link(st):
+                    dirs.append(child)
+                else:
+                    # files and links; a link is removed, never followed
+                    files.append((child, st.st_size))
+        return files, dirs, excluded
+
+    def plan(self) -> CleanPlan:
+        start = time.perf_counter()
+        targets = self.targets()
+        results = {target: {"files": [], "dirs": [], "bytes": 0} for target in targets}
+        excluded: list[str] = []
+
+        with ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="clean-scan"
+        ) as pool:
+            pending = {
+                pool.submit(self._scan_dir, target): (target, target)
+                for target in targets
+            }
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    target, relative = pending.pop(future)
+                    result = results[target]
+                    try:
+                        files, dirs, skipped = future.result()
+                    except OSError as e:
+                        LOGGER.warning(f"Clean: cannot read {relative}: {e}")
+                        continue
+                    result["dirs"].append(relative)
+                    result["files"].extend(files)
+                    result["bytes"] += sum(size for _, size in files)
+                    excluded.extend(skipped)
+                    for child in dirs:
+                        pending[pool.submit(self._scan_dir, child)] = (target, child)
+
+        folders = [
+            FolderPlan(
+                target,
+                sorted(results[target]["files"]),
+                sorted(
+                    results[target]["dirs"], key=lambda d: d.count("/"), reverse=True
+                ),
+                results[target]["bytes"],
+            )
+            for target in targets
+        ]
+        plan = CleanPlan(
+            self.root, folders, sorted(excluded), time.perf_counter() - start
+        )
+        LOGGER.info(
+            f"Clean dry run: {plan.files} files, {plan.bytes / 2**20:.1f} MiB"
+            f" in {len(folders)} folders ({plan.elapsed:.2f}s)"
+        )
+        return plan
+
+    # ==== delete ==== #
+    def clean(
+        self,
+        plan: CleanPlan | None = None,
+        on_progress: Callable[[CleanProgress], None] | None = None,
+        cancel: threading.Event | None = None,
+    ) -> CleanReport:
+        """Delete the planned files; `on_progress` is called from a worker thread."""
+        start = time.perf_counter()
+        if plan is None:
+            plan = self.plan()
+        # sizes from the plan: no second stat per file
+        files = [item for folder in plan.folders for item in folder.files]
+        total_bytes = plan.bytes
+        errors: list[str] = []
+        lock = threading.Lock()
+        done = [0, 0]
+
+        def delete_batch(batch: list[tuple[str, int]]) -> None:
+            if cancel is not None and cancel.is_set():
+                return
+            freed = 0
+            for relative, size in batch:
+                try:
+                    _remove_file(os.path.join(self.root, relative))
+                    freed += size
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    with lock:
+                        errors.append(f"{relative}: {e.strerror or e}")
+            with lock:
+                done[0] += len(batch)
+                done[1] += freed
+                progress = CleanProgress(done[0], len(files), done[1], total_bytes)
+            if on_progress is not None:
+                on_progress(progress)
+
+        batches = [
+            files[i : i + DELETE_BATCH] for i in range(0, len(files), DELETE_BATCH)
+        ]
+
+        removed_dirs = 0
+        with ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="clean-delete"
+        ) as pool:
+            # batches queued after a cancel return without deleting
+            for future in [pool.submit(delete_batch, batch) for batch in batches]:
+                future.result()
+
+            # directories level by level, deepest first; non-empty ones stay
+            dirs = [d for folder in plan.folders for d in folder.dirs]
+            by_depth: dict[int, list[str]] = {}
+            for directory in dirs:
+                by_depth.setdefault(directory.count("/"), []).append(directory)
+            for depth in sorted(by_depth, reverse=True):
+                removed_dirs += sum(pool.map(self._remove_dir, by_depth[depth]))
+
+        report = CleanReport(
+            done[1],
+            done[0] - len(errors),
+            removed_dirs,
+            errors,
+            time.perf_counter() - start,
+        )
+        LOGGER.info(
+            f"Clean: {report.files} files, {report.freed_bytes / 2**20:.1f} MiB freed"
+            f" in {report.elapsed:.2f}s ({len(errors)} errors)"
+        )
+        for error in errors[:20]:
+            LOGGER.warning(f"Clean: {error}")
+        return report
+
+    def _remove_dir(self, relative: str) -> int:
+        path = os.path.join(self.root, relative)
+        try:
+            os.rmdir(path)
+            return 1
+        except OSError:
+            # not empty: excluded content or a file that could not be deleted
+            return 0
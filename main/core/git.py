@@ -0,0 +1,495 @@
+"""
+Local git engine.
+
+- `CatFile` keeps one `git cat-file --batch` process per repository and
+  answers object lookups over its pipes instead of starting git every time.
+- `StatusParser` parses `git status --porcelain=v2 -z --branch` output as a
+  stream: records are yielded while git is still writing.
+- `GitRepo.status()` runs status with the untracked cache and, where git has a
+  built-in file system monitor (Windows/macOS, git >= 2.37), with fsmonitor.
+  Both are passed as `-c` options, so the repository config is left alone.
+  `--no-optional-locks` keeps the background refreshes from taking the index
+  lock that a commit or pull in another process needs at the same time. It
+  also keeps git from writing the caches back to the index, so the first
+  status and one every `CACHE_WRITE_INTERVAL` seconds run with optional locks
+  and store the untracked cache (UNTR) and the fsmonitor token; the others
+  reuse them.
+- `StatusWorker` refreshes the status as a scheduler job and coalesces
+  refresh requests that arrive while a run is in progress.
+"""
+
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from typing import Callable, Iterable, Iterator, NamedTuple
+
+from main._template import LOGGER
+from main.core.jobs import NORMAL, Job, JobContext, JobScheduler, get_scheduler
+from main.errors import GitError, JobCancelled
+
+# keep git from flashing a console window on Windows
+_NO_WINDOW = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+READ_SIZE = 65536
+# how often a cancellable git command looks at its cancel event
+CANCEL_POLL = 0.2
+# seconds between status runs that write the untracked cache to the index
+CACHE_WRITE_INTERVAL = 300.0
+VERSION_RE = re.compile(rb"(\d+)\.(\d+)(?:\.(\d+))?")
+
+
+def _decode_path(raw: bytes) -> str:
+    # git writes paths as UTF-8 bytes with -z, undecodable bytes survive
+    return raw.decode("utf-8", errors="surrogateescape")
+
+
+class StatusEntry(NamedTuple):
+    # "changed", "renamed", "unmerged", "untracked" or "ignored"
+    kind: str
+    # X / Y of the XY field, "." = unmodified; "?" / "!" for untracked / ignored
+    index: str
+    worktree: str
+    path: str
+    orig_path: str | None = None
+
+
+class GitStatus(NamedTuple):
+    branch: str | None
+    head: str | None
+    upstream: str | None
+    ahead: int
+    behind: int
+    entries: list[StatusEntry]
+    elapsed: float
+
+    @property
+    def clean(self) -> bool:
+        return not any(e.kind != "ignored" for e in self.entries)
+
+
+class StatusParser:
+    """Incremental parser for `git status --porcelain=v2 -z --branch`."""
+
+    def __init__(self):
+        self._rest = b""
+        # a rename record is followed by one more NUL terminated field
+        self._rename: StatusEntry | None = None
+        self.branch: str | None = None
+        self.head: str | None = None
+        self.upstream: str | None = None
+        self.ahead = 0
+        self.behind = 0
+
+    def feed(self, data: bytes) -> list[StatusEntry]:
+        fields = (self._rest + data).split(b"\0")
+        self._rest = fields.pop()
+        entries: list[StatusEntry] = []
+        for field in fields:
+            entry = self._parse_field(field)
+            if entry is not None:
+                entries.append(entry)
+        return entries
+
+    def _parse_field(self, field: bytes) -> StatusEntry | None:
+        if self._rename is not None:
+            entry = self._rename._replace(orig_path=_decode_path(field))
+            self._rename = None
+            return entry
+        if not field:
+            return None
+
+        kind = field[:1]
+        if kind == b"1":
+            # 1 XY sub mH mI mW hH hI path
+            parts = field.split(b" ", 8)
+            xy = parts[1].decode("ascii")
+            return StatusEntry("changed", xy[0], xy[1], _decode_path(parts[8]))
+        if kind == b"2":
+            # 2 XY sub mH mI mW hH hI Xscore path \0 origPath
+            parts = field.split(b" ", 9)
+            xy = parts[1].decode("ascii")
+            self._rename = StatusEntry("renamed", xy[0], xy[1], _decode_path(parts[9]))
+            return None
+        if kind == b"u":
+            # u XY sub m1 m2 m3 mW h1 h2 h3 path
+            parts = field.split(b" ", 10)
+            xy = parts[1].decode("ascii")
+            return StatusEntry("unmerged", xy[0], xy[1], _decode_path(parts[10]))
+        if kind == b"?":
+            return StatusEntry("untracked", "?", "?", _decode_path(field[2:]))
+        if kind == b"!":
+            return StatusEntry("ignored", "!", "!", _decode_path(field[2:]))
+        if kind == b"#":
+            self._parse_header(field[2:].decode("utf-8", errors="replace"))
+        return None
+
+    def _parse_header(self, header: str) -> None:
+        key, _, value = header.partition(" ")
+        if key == "branch.oid":
+            self.head = None if value == "(initial)" else value
+        elif key == "branch.head":
+            self.branch = None if value == "(detached)" else value
+        elif key == "branch.upstream":
+            self.upstream = value
+        elif key == "branch.ab":
+            ahead, behind = value.split(" ")
+            self.ahead, self.behind = int(ahead), -int(behind)
+
+
+def iter_status(chunks: Iterable[bytes], parser: StatusParser) -> Iterator[StatusEntry]:
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    if parser._rest:
+        yield from parser.feed(b"\0")
+
+
+def git_version(git: str = "git") -> tuple[int, int, int]:
+    try:
+        out = subprocess.run(
+            [git, "--version"], capture_output=True, creationflags=_NO_WINDOW
+        ).stdout
+    except OSError as e:
+        raise GitError(f"git not found: {git}") from e
+    match = VERSION_RE.search(out)
+    if not match:
+        raise GitError(f"Unexpected git version output: {out!r}")
+    return tuple(int(v or 0) for v in match.groups())  # type: ignore[return-value]
+
+
+class CatFile:
+    """One long-lived `git cat-file --batch` process, safe to share between threads."""
+
+    def __init__(self, repo_path: str, git: str = "git"):
+        self.repo_path = repo_path
+        self.git = git
+        self._lock = threading.Lock()
+        self._proc: subprocess.Popen | None = None
+
+    def _ensure_started(self) -> subprocess.Popen:
+        if self._proc is None or self._proc.poll() is not None:
+            self._proc = subprocess.Popen(
+                [self.git, "-C", self.repo_path, "cat-file", "--batch"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                creationflags=_NO_WINDOW,
+            )
+        return self._proc
+
+    def read(self, rev: str) -> tuple[str, str, bytes] | None:
+        """Return (sha, type, content) of `rev`, None if it does not exist."""
+        if "\n" in rev:
+            raise ValueError("rev must not contain a newline")
+        with self._lock:
+            proc = self._ensure_started()
+            try:
+                proc.stdin.write(rev.encode("utf-8") + b"\n")
+                proc.stdin.flush()
+                header = proc.stdout.readline()
+                if not header:
+                    raise GitError("git cat-file exited")
+                parts = header.split()
+                if len(parts) != 3:
+                    # "<rev> missing" / "<rev> ambiguous"
+                    return None
+                sha, kind, size = parts
+                content = proc.stdout.read(int(size))
+                proc.stdout.read(1)  # trailing LF
+            except (OSError, ValueError) as e:
+                self._kill()
+                raise GitError(f"git cat-file failed: {e}") from e
+            return sha.decode("ascii"), kind.decode("ascii"), content
+
+    def _kill(self) -> None:
+        if self._proc is not None and self._proc.poll() is None:
+            self._proc.kill()
+            self._proc.wait()
+        self._proc = None
+
+    def close(self) -> None:
+        with self._lock:
+            if self._proc is not None and self._proc.poll() is None:
+                self._proc.stdin.close()
+                try:
+                    self._proc.wait(timeout=2)
+                except subprocess.TimeoutExpired:
+                    pass
+            self._kill()
+
+
+class GitRepo:
+    def __init__(self, path: str, git: str = "git"):
+        self.path = os.path.abspath(path)
+        self.git = git
+        self._cat_file: CatFile | None = None
+        self._status_options: list[str] | None = None
+        # monotonic time of the last status that could write the index
+        self._cache_written: float | None = None
+        self._lock = threading.Lock()
+
+    def run(
+        self,
+        *args: str,
+        input: bytes | None = None,
+        check: bool = True,
+        timeout: float | None = None,
+        cancel: threading.Event | None = None,
+    ) -> subprocess.CompletedProcess:
+        """
+        cancel: git is killed and JobCancelled raised once the event is set,
+                e.g. `ctx.cancel_event` of the job running the command
+        """
+        argv = [self.git, "-C", self.path, *args]
+        # never wait for a credential prompt nobody can see
+        env = dict(os.environ, GIT_TERMINAL_PROMPT="0")
+        try:
+            if cancel is None:
+                proc = subprocess.run(
+                    argv,
+                    input=input,
+                    capture_output=True,
+                    env=env,
+                    timeout=timeout,
+                    creationflags=_NO_WINDOW,
+                )
+            else:
+                proc = _run_cancellable(argv, input, env, timeout, cancel)
+        except subprocess.TimeoutExpired as e:
+            raise GitError(f"git {args[0]} timed out after {timeout}s") from e
+        except OSError as e:
+            raise GitError(f"git not found: {self.git}") from e
+        if check and proc.returncode != 0:
+            raise GitError(
+                f"git {args[0]} failed: {proc.stderr.decode('utf-8', 'replace').strip()}"
+            )
+        return proc
+
+    def popen(self, *args: str, **kwargs) -> subprocess.Popen:
+        """Start git without waiting, for commands that stream their output."""
+        return subprocess.Popen(
+            [self.git, "-C", self.path, *args],
+            env=dict(os.environ, GIT_TERMINAL_PROMPT="0"),
+            creationflags=_NO_WINDOW,
+            **kwargs,
+        )
+
+    def config(self, key: str) -> str | None:
+        proc = self.run("config", "--get", key, check=False)
+        if proc.returncode != 0:
+            return None
+        return proc.stdout.decode("utf-8", errors="replace").strip()
+
+    @property
+    def cat_file(self) -> CatFile:
+        with self._lock:
+            if self._cat_file is None:
+                self._cat_file = CatFile(self.path, self.git)
+            return self._cat_file
+
+    def read_object(self, rev: str) -> tuple[str, str, bytes] | None:
+        return self.cat_file.read(rev)
+
+    def status_options(self) -> list[str]:
+        """`-c` options that make status fast on this machine, detected once."""
+        with self._lock:
+            if self._status_options is not None:
+                return self._status_options
+
+        options = []
+        if self.config("core.untrackedCache") is None:
+            options += ["-c", "core.untrackedCache=true"]
+        # built-in fsmonitor daemon: Windows and macOS only, git >= 2.37
+        if (
+            sys.platform in ("win32", "darwin")
+            and self.config("core.fsmonitor") is None
+            and git_version(self.git) >= (2, 37, 0)
+        ):
+            options += ["-c", "core.fsmonitor=true"]
+        LOGGER.debug(f"git status options for {self.path}: {options or 'none'}")
+
+        with self._lock:
+            self._status_options = options
+        return options
+
+    def _claim_cache_write(self) -> bool:
+        """True if this status should run with optional locks and save the caches."""
+        now = time.monotonic()
+        with self._lock:
+            if (
+                self._cache_written is not None
+                and now - self._cache_written < CACHE_WRITE_INTERVAL
+            ):
+                return False
+            self._cache_written = now
+        return True
+
+    def iter_status(
+        self, untracked: str = "all", ignored: bool = False
+    ) -> tuple[StatusParser, Iterator[StatusEntry]]:
+        """Start `git status` and return the parser and a generator over its entries.
+
+        The branch fields of the parser are complete once the generator is exhausted.
+        """
+        # a busy index lock only means git skips writing, status still works
+        locks = [] if self._claim_cache_write() else ["--no-optional-locks"]
+        args = [
+            self.git,
+            *self.status_options(),
+            *locks,
+            "-C",
+            self.path,
+            "status",
+            "--porcelain=v2",
+            "-z",
+            "--branch",
+            f"--untracked-files={untracked}",
+        ]
+        if ignored:
+            args.append("--ignored")
+        parser = StatusParser()
+
+        def generate() -> Iterator[StatusEntry]:
+            proc = subprocess.Popen(
+                args,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                creationflags=_NO_WINDOW,
+            )
+            try:
+                chunks = iter(lambda: proc.stdout.read1(READ_SIZE), b"")
+                yield from iter_status(chunks, parser)
+            finally:
+                proc.stdout.close()
+                stderr = proc.stderr.read()
+                proc.stderr.close()
+                if proc.wait() != 0:
+                    raise GitError(
+                        f"git status failed: {stderr.decode('utf-8', 'replace').strip()}"
+                    )
+
+        return parser, generate()
+
+    def status(self, untracked: str = "all", ignored: bool = False) -> GitStatus:
+        start = time.perf_counter()
+        parser, entries = self.iter_status(untracked, ignored)
+        entries = list(entries)
+        return GitStatus(
+            parser.branch,
+            parser.head,
+            parser.upstream,
+            parser.ahead,
+            parser.behind,
+            entries,
+            time.perf_counter() - start,
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            cat_file, self._cat_file = self._cat_file, None
+        if cat_file is not None:
+            cat_file.close()
+
+
+def _run_cancellable(
+    argv: list[str],
+    input: bytes | None,
+    env: dict,
+    timeout: float | None,
+    cancel: threading.Event,
+) -> subprocess.CompletedProcess:
+    deadline = None if timeout is None else time.monotonic() + timeout
+    with subprocess.Popen(
+        argv,
+        stdin=None if input is None else subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=env,
+        creationflags=_NO_WINDOW,
+    ) as proc:
+        while True:
+            try:
+                # a retry keeps the output read so far
+                stdout, stderr = proc.communicate(input, timeout=CANCEL_POLL)
+                break
+            except subprocess.TimeoutExpired:
+                if cancel.is_set():
+                    proc.kill()
+                    proc.wait()
+                    raise JobCancelled(f"git {argv[3]} was cancelled")
+                if deadline is not None and time.monotonic() > deadline:
+                    proc.kill()
+                    proc.wait()
+                    raise subprocess.TimeoutExpired(argv, timeout)
+    return subprocess.CompletedProcess(argv, proc.returncode, stdout, stderr)
+
+
+class StatusWorker:
+    """Background status refreshes for one repository.
+
+    `refresh()` never blocks; requests that arrive while git is running are
+    merged into one follow-up run of the same job. Results go to `on_status`
+    (or `on_error`) from the scheduler's worker thread.
+    """
+
+    def __init__(
+        self,
+        repo: GitRepo,
+        on_status: Callable[[GitStatus], None],
+        on_error: Callable[[Exception], None] | None = None,
+        untracked: str = "all",
+        scheduler: JobScheduler | None = None,
+    ):
+        self.repo = repo
+        self._on_status = on_status
+        self._on_error = on_error
+        self.untracked = untracked
+        self._scheduler = scheduler or get_scheduler()
+        self._lock = threading.Lock()
+        self._job: Job | None = None
+        self._again = False
+        self._stopped = False
+        self.last: GitStatus | None = None
+
+    def refresh(self) -> None:
+        with self._lock:
+            if self._stopped:
+                return
+            if self._job is not None:
+                # picked up by the queued or running job
+                self._again = True
+                return
+            self._job = self._scheduler.submit(
+                self._run, name=f"git-status {self.repo.path}", priority=NORMAL
+            )
+
+    def _run(self, ctx: JobContext) -> None:
+        while True:
+            with self._lock:
+                self._again = False
+            try:
+                status = self.repo.status(self.untracked)
+            except Exception as e:
+                LOGGER.error(f"git status failed for {self.repo.path}: {e}")
+                if self._on_error is not None:
+                    self._on_error(e)
+            else:
+                self.last = status
+                LOGGER.debug(
+                    f"git status of {self.repo.path}: {len(status.entries)} entries"
+                    f" in {status.elapsed * 1000:.0f} ms"
+                )
+                self._on_status(status)
+            with self._lock:
+                if not self._again or self._stopped or ctx.cancelled:
+                    self._job = None
+                    return
+
+    def stop(self, timeout: float | None = 2.0) -> None:
+        with self._lock:
+            self._stopped = True
+            job = self._job
+        if job is not None:
+            job.cancel()
+            job.wait(timeout)
@@ -0,0 +1,587 @@
+"""
+Central scheduler for background jobs.
+
+Long-running operations (git, GitHub, clean, LFS, …) are submitted here instead
+of starting their own thread. A bounded pool of worker threads takes jobs from
+a priority queue: lower priority number first, FIFO within one priority.
+
+Cancellation is cooperative: the job function gets a `JobContext` as its first
+argument and checks `ctx.cancelled` / `ctx.check()`, or hands
+`ctx.cancel_event` on to code that takes a `threading.Event`.
+
+Progress and completion callbacks never run on a worker thread. They are
+queued and run by `dispatch()`; in the GUI a single `after()` loop
+(`attach(rootwin)`) calls it on the Tk thread, headless callers and tests call
+it directly; `post()` hands any other callback from a worker thread over the
+same way. Progress is coalesced: a job that reports faster than the
+dispatcher runs only delivers its latest state.
+
+Recurring work (refreshing, sampling) is registered with `every()` instead of
+a sleeping thread: an idle worker waits for the next due time and queues the
+job again, a run is skipped while the previous one is still queued or running.
+Jobs that block for their whole lifetime (waiting on a process, reading a pty)
+are submitted with `long_running=True` and get a thread of their own, so they
+do not occupy the bounded pool but are still cancelled and joined on shutdown.
+A job blocked in something `ctx.cancel_event` cannot reach registers a wake-up
+with `ctx.on_cancel()`; if nothing can wake it (waiting on a process that
+outlives the application), it runs with `daemon=True` and is abandoned on
+shutdown instead of joined.
+
+Workers are not daemon threads. `shutdown()` drops the queued jobs and the
+periodic ones, asks the running ones to stop and joins the workers; idle
+workers exit on their own after `IDLE_TIMEOUT` unless a periodic job is
+registered, so a forgotten scheduler never keeps the process alive.
+"""
+
+import heapq
+import itertools
+import queue
+import threading
+import time
+from typing import Any, Callable, NamedTuple
+
+from main._template import LOGGER
+from main.errors import JobCancelled
+
+# priorities, lower runs first
+HIGH = 0
+NORMAL = 10
+LOW = 20
+
+# job states
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+WORKERS = 4
+IDLE_TIMEOUT = 2.0
+DISPATCH_MS = 50
+
+
+class JobProgress(NamedTuple):
+    done: float
+    # None if the amount of work is unknown
+    total: float | None
+    message: str
+
+    @property
+    def fraction(self) -> float | None:
+        if not self.total:
+            return None
+        return min(1.0, self.done / self.total)
+
+
+class JobContext:
+    """Handed to the job function; the job's side of cancel and progress."""
+
+    def __init__(self, job: "Job"):
+        self._job = job
+
+    @property
+    def job(self) -> "Job":
+        return self._job
+
+    @property
+    def cancel_event(self) -> threading.Event:
+        return self._job._cancel
+
+    @property
+    def cancelled(self) -> bool:
+        return self._job._cancel.is_set()
+
+    def on_cancel(self, callback: Callable[[], None]) -> None:
+        """Call `callback` from the cancelling thread, now if already cancelled."""
+        self._job._add_cancel_hook(callback)
+
+    def check(self) -> None:
+        """Raise JobCancelled if the job was cancelled."""
+        if self._job._cancel.is_set():
+            raise JobCancelled(f"Job '{self._job.name}' was cancelled")
+
+    def progress(self, done: float, total: float | None = None, message: str = ""):
+        self._job._report(JobProgress(done, total, message))
+
+
+class Job:
+    def __init__(
+        self,
+        scheduler: "JobScheduler",
+        job_id: int,
+        name: str,
+        priority: int,
+        func: Callable[..., Any],
+        args: tuple,
+        kwargs: dict,
+        on_progress: Callable[["Job", JobProgress], None] | None,
+        on_done: Callable[["Job"], None] | None,
+    ):
+        self.id = job_id
+        self.name = name
+        self.priority = priority
+        self.state = PENDING
+        self.progress: JobProgress | None = None
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.submitted = time.monotonic()
+        # seconds the job function ran
+        self.elapsed = 0.0
+        self._scheduler = scheduler
+        self._func = func
+        self._args = args
+        self._kwargs = kwargs
+        self._on_progress = on_progress
+        self._on_done = on_done
+        self._cancel = threading.Event()
+        self._cancel_hooks: list[Callable[[], None]] = []
+        self._done = threading.Event()
+        self._progress_queued = False
+
+    def __repr__(self) -> str:
+        return f"<Job {self.id} '{self.name}' {self.state}>"
+
+    @property
+    def done(self) -> bool:
+        """Finished, failed or cancelled."""
+        return self._done.is_set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self) -> bool:
+        """Ask the job to stop; False if it already finished."""
+        if self.done:
+            return False
+        self._request_cancel()
+        self._scheduler._drop(self)
+        return True
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self._done.wait(timeout)
+
+    def _request_cancel(self) -> None:
+        with self._scheduler._cond:
+            self._cancel.set()
+            hooks, self._cancel_hooks = self._cancel_hooks, []
+        for hook in hooks:
+            try:
+                hook()
+            except Exception as e:
+                LOGGER.error(f"Cancel hook of job '{self.name}' failed: {e}")
+
+    def _add_cancel_hook(self, callback: Callable[[], None]) -> None:
+        with self._scheduler._cond:
+            if not self._cancel.is_set():
+                self._cancel_hooks.append(callback)
+                return
+        callback()
+
+    # ==== worker side ==== #
+    def _report(self, progress: JobProgress) -> None:
+        self.progress = progress
+        if self._on_progress is None or self._progress_queued:
+            # the queued event will pick up the newest progress
+            return
+        self._progress_queued = True
+        self._scheduler.post(self._deliver_progress)
+
+    def _deliver_progress(self) -> None:
+        self._progress_queued = False
+        if not self.done:
+            self._on_progress(self, self.progress)
+
+    def _run(self) -> None:
+        self.state = RUNNING
+        start = time.perf_counter()
+        try:
+            self.result = self._func(JobContext(self), *self._args, **self._kwargs)
+            state = DONE
+        except JobCancelled:
+            state = CANCELLED
+        except Exception as e:
+            self.error = e
+            state = FAILED
+        self.elapsed = time.perf_counter() - start
+
+        if state == FAILED:
+            LOGGER.error(
+                f"Job '{self.name}' failed after {self.elapsed:.2f}s: {self.error}"
+            )
+        else:
+            LOGGER.debug(f"Job '{self.name}' {state} in {self.elapsed:.2f}s")
+        self._finish(state)
+
+    def _finish(self, state: str) -> None:
+        self.state = state
+        self._done.set()
+        if self._on_done is not None:
+            self._scheduler.post(lambda: self._on_done(self))
+
+
+class PeriodicJob:
+    """Handle of a job registered with `JobScheduler.every()`."""
+
+    def __init__(
+        self,
+        scheduler: "JobScheduler",
+        name: str,
+        interval: float,
+        priority: int,
+        func: Callable[..., Any],
+        args: tuple,
+        kwargs: dict,
+    ):
+        self.name = name
+        self.interval = interval
+        self.priority = priority
+        # the last queued run
+        self.job: Job | None = None
+        self.runs = 0
+        self._scheduler = scheduler
+        self._func = func
+        self._args = args
+        self._kwargs = kwargs
+        self._cancelled = False
+
+    def __repr__(self) -> str:
+        state = "cancelled" if self._cancelled else f"every {self.interval:g}s"
+        return f"<PeriodicJob '{self.name}' {state}>"
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def cancel(self) -> None:
+        """Stop scheduling runs and cancel the current one."""
+        self._scheduler._remove_timer(self)
+        job = self.job
+        if job is not None:
+            job.cancel()
+
+
+class JobScheduler:
+    def __init__(self, max_workers: int = WORKERS, name: str = "jobs"):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        self.name = name
+        self._cond = threading.Condition()
+        # (priority, sequence, job); the sequence keeps FIFO order per priority
+        self._heap: list[tuple[int, int, Job]] = []
+        # (due time, sequence, periodic job)
+        self._timers: list[tuple[float, int, PeriodicJob]] = []
+        # the idle worker that waits for the next due time
+        self._keeper: threading.Thread | None = None
+        self._ids = itertools.count(1)
+        self._workers: list[threading.Thread] = []
+        # threads of the long-running jobs
+        self._dedicated: list[threading.Thread] = []
+        self._idle = 0
+        self._running: set[Job] = set()
+        self._events: queue.SimpleQueue[Callable[[], None]] = queue.SimpleQueue()
+        self._closed = False
+
+    # ==== submitting ==== #
+    def submit(
+        self,
+        func: Callable[..., Any],
+        *args: Any,
+        name: str | None = None,
+        priority: int = NORMAL,
+        on_progress: Callable[[Job, JobProgress], None] | None = None,
+        on_done: Callable[[Job], None] | None = None,
+        long_running: bool = False,
+        daemon: bool = False,
+        **kwargs: Any,
+    ) -> Job:
+        """
+        Queue func(ctx, *args, **kwargs). on_progress(job, progress) and
+        on_done(job) run in `dispatch()`; on_done is called for every final
+        state, check `job.state`.
+
+        long_running: run on a thread of its own instead of the pool, for jobs
+                      that block until cancelled; `priority` is ignored
+        daemon: with long_running, a daemon thread that shutdown cancels but
+                does not join; the job gives up its work in `ctx.on_cancel()`
+        """
+        with self._cond:
+            if self._closed:
+                raise RuntimeError(f"Scheduler '{self.name}' is shut down")
+            job_id = next(self._ids)
+            job = Job(
+                self,
+                job_id,
+                name or getattr(func, "__name__", f"job-{job_id}"),
+                priority,
+                func,
+                args,
+                kwargs,
+                on_progress,
+                on_done,
+            )
+            if long_running:
+                self._start_dedicated(job, daemon)
+                return job
+            heapq.heappush(self._heap, (priority, job_id, job))
+            self._wake_worker()
+        return job
+
+    def every(
+        self,
+        interval: float,
+        func: Callable[..., Any],
+        *args: Any,
+        name: str | None = None,
+        priority: int = LOW,
+        first: float | None = None,
+        **kwargs: Any,
+    ) -> PeriodicJob:
+        """
+        Queue func(ctx, *args, **kwargs) every `interval` seconds until the
+        returned handle is cancelled. A run is skipped while the previous one
+        is still queued or running.
+
+        first: seconds until the first run, `interval` if None
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        with self._cond:
+            if self._closed:
+                raise RuntimeError(f"Scheduler '{self.name}' is shut down")
+            periodic = PeriodicJob(
+                self,
+                name or getattr(func, "__name__", "periodic"),
+                interval,
+                priority,
+                func,
+                args,
+                kwargs,
+            )
+            due = time.monotonic() + (interval if first is None else first)
+            heapq.heappush(self._timers, (due, next(self._ids), periodic))
+            self._wake_worker()
+        return periodic
+
+    def _wake_worker(self) -> None:
+        # caller holds self._cond
+        if self._idle == 0 and len(self._workers) < self.max_workers:
+            self._start_worker()
+        else:
+            self._cond.notify_all()
+
+    def _remove_timer(self, periodic: PeriodicJob) -> None:
+        with self._cond:
+            periodic._cancelled = True
+            self._timers = [t for t in self._timers if t[2] is not periodic]
+            heapq.heapify(self._timers)
+            # the keeper may be waiting for this one
+            self._cond.notify_all()
+
+    def _fire_timers(self) -> None:
+        # caller holds self._cond
+        now = time.monotonic()
+        while self._timers and self._timers[0][0] <= now:
+            _, sequence, periodic = heapq.heappop(self._timers)
+            if periodic.job is None or periodic.job.done:
+                job_id = next(self._ids)
+                periodic.job = Job(
+                    self,
+                    job_id,
+                    periodic.name,
+                    periodic.priority,
+                    periodic._func,
+                    periodic._args,
+                    periodic._kwargs,
+                    None,
+                    None,
+                )
+                periodic.runs += 1
+                heapq.heappush(self._heap, (periodic.priority, job_id, periodic.job))
+            heapq.heappush(self._timers, (now + periodic.interval, sequence, periodic))
+
+    def _start_dedicated(self, job: Job, daemon: bool = False) -> None:
+        # caller holds self._cond
+        self._dedicated = [t for t in self._dedicated if t.is_alive()]
+        self._running.add(job)
+        thread = threading.Thread(
+            target=self._run_dedicated,
+            args=(job,),
+            name=f"{self.name}-{job.name}",
+            daemon=daemon,
+        )
+        self._dedicated.append(thread)
+        thread.start()
+
+    def _run_dedicated(self, job: Job) -> None:
+        try:
+            job._run()
+        finally:
+            with self._cond:
+                self._running.discard(job)
+
+    def _start_worker(self) -> None:
+        worker = threading.Thread(
+            target=self._work, name=f"{self.name}-{len(self._workers) + 1}"
+        )
+        self._workers.append(worker)
+        worker.start()
+
+    def _work(self) -> None:
+        while True:
+            me = threading.current_thread()
+            with self._cond:
+                self._idle += 1
+                while True:
+                    self._fire_timers()
+                    if self._heap or self._closed:
+                        break
+                    if self._timers and self._keeper in (None, me):
+                        # one idle worker stays for the periodic jobs
+                        self._keeper = me
+                        self._cond.wait(max(0.0, self._timers[0][0] - time.monotonic()))
+                    elif (
+                        not self._cond.wait(IDLE_TIMEOUT)
+                        and not self._heap
+                        and not (self._timers and self._keeper is None)
+                    ):
+                        break
+                if self._keeper is me:
+                    self._keeper = None
+                    # another idle worker takes over the timers, or a new one
+                    if self._idle > 1:
+                        self._cond.notify_all()
+                    elif self._timers and len(self._workers) < self.max_workers:
+                        self._start_worker()
+                self._idle -= 1
+                if not self._heap:
+                    # idle too long or shut down
+                    self._workers.remove(me)
+                    return
+                _, _, job = heapq.heappop(self._heap)
+                self._running.add(job)
+            try:
+                job._run()
+            finally:
+                with self._cond:
+                    self._running.discard(job)
+                    self._cond.notify_all()
+
+    def _drop(self, job: Job) -> None:
+        """Remove a cancelled job from the queue, if it has not started."""
+        with self._cond:
+            for i, (_, _, queued) in enumerate(self._heap):
+                if queued is job:
+                    self._heap[i] = self._heap[-1]
+                    self._heap.pop()
+                    heapq.heapify(self._heap)
+                    break
+            else:
+                return
+        job._finish(CANCELLED)
+
+    # ==== state ==== #
+    def jobs(self) -> list[Job]:
+        """Running jobs, then the queued ones in the order they will run."""
+        with self._cond:
+            running = sorted(self._running, key=lambda job: job.id)
+            return running + [job for _, _, job in sorted(self._heap)]
+
+    @property
+    def busy(self) -> bool:
+        with self._cond:
+            return bool(self._heap or self._running)
+
+    def cancel_all(self) -> None:
+        for job in self.jobs():
+            job.cancel()
+
+    # ==== dispatching ==== #
+    def post(self, callback: Callable[[], None]) -> None:
+        """Run `callback()` in the next `dispatch()`; callable from any thread."""
+        self._events.put(callback)
+
+    def dispatch(self) -> int:
+        """Run the queued callbacks on the calling thread; returns how many ran."""
+        count = 0
+        while True:
+            try:
+                event = self._events.get_nowait()
+            except queue.Empty:
+                return count
+            count += 1
+            try:
+                event()
+            except Exception as e:
+                LOGGER.error(f"Job callback failed: {e}")
+
+    def attach(self, widget, interval_ms: int = DISPATCH_MS) -> None:
+        """Run `dispatch()` on the Tk thread of `widget` every interval_ms."""
+
+        def tick() -> None:
+            self.dispatch()
+            try:
+                widget.after(interval_ms, tick)
+            except Exception:
+                # widget destroyed, the window is closing
+                pass
+
+        widget.after(interval_ms, tick)
+
+    # ==== shutdown ==== #
+    def shutdown(self, wait: bool = True, timeout: float | None = None) -> bool:
+        """
+        Cancel the queued jobs, ask the running ones to stop and join the
+        workers. Returns False if a worker was still busy after `timeout`.
+        """
+        with self._cond:
+            self._closed = True
+            queued = [job for _, _, job in self._heap]
+            self._heap.clear()
+            for _, _, periodic in self._timers:
+                periodic._cancelled = True
+            self._timers.clear()
+            running = list(self._running)
+            # abandoned daemon jobs are not waited for
+            workers = list(self._workers) + [
+                thread for thread in self._dedicated if not thread.daemon
+            ]
+            self._cond.notify_all()
+        for job in queued:
+            job._cancel.set()
+            job._finish(CANCELLED)
+        for job in running:
+            job._request_cancel()
+        if queued or running:
+            LOGGER.info(
+                f"Scheduler '{self.name}' shutting down:"
+                f" {len(queued)} queued, {len(running)} running job(s) cancelled"
+            )
+        if not wait:
+            return True
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for worker in workers:
+            if worker is threading.current_thread():
+                continue
+            worker.join(
+                None if deadline is None else max(0.0, deadline - time.monotonic())
+            )
+        stuck = [worker.name for worker in workers if worker.is_alive()]
+        if stuck:
+            LOGGER.warning(f"Jobs still running after shutdown: {', '.join(stuck)}")
+        return not stuck
+
+
+_SCHEDULER: JobScheduler | None = None
+_SCHEDULER_LOCK = threading.Lock()
+
+
+def get_scheduler() -> JobScheduler:
+    """The scheduler shared by the whole application, created on first use."""
+    global _SCHEDULER
+    with _SCHEDULER_LOCK:
+        if _SCHEDULER is None:
+            _SCHEDULER = JobScheduler()
+        return _SCHEDULER
@@ -0,0 +1,374 @@
+"""
+Large asset / Git LFS detector.
+
+Streams over the changed files, stats them on a thread pool (network drives
+answer stat slowly, not in bulk) and looks each (path, mtime, size) up in a
+persistent SQLite index. Only files missing from the index are opened: the
+first bytes tell binary from text and LFS pointers from real content, and a
+zlib pass over a sample estimates how well git will compress the file.
+
+`LfsMatcher` compiles the `filter=lfs` patterns of `.gitattributes` into
+regular expressions, so every path is checked with a single combined match
+before the ordered rules are consulted.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, NamedTuple
+
+from main._template import LOGGER
+from main.appdirs import user_cache_dir
+from main.core.git import GitRepo, StatusEntry
+
+DEFAULT_THRESHOLD = 50 * 1024 * 1024
+STAT_WORKERS = 16
+SAMPLE_SIZE = 64 * 1024
+LFS_POINTER_PREFIX = b"version https://git-lfs.github.com/spec/"
+# a pointer file is ~130 bytes
+LFS_POINTER_MAX = 1024
+
+
+# ==== .gitattributes ==== #
+def _translate_pattern(pattern: str) -> str:
+    """gitattributes pattern -> regex over a path relative to its directory."""
+    anchored = "/" in pattern.rstrip("/")
+    pattern = pattern.lstrip("/")
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == len(pattern):
+            out.append("/.*")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        elif pattern[i] == "[":
+            end = pattern.find("]", i + 1)
+            if end < 0:
+                out.append(re.escape("["))
+                i += 1
+            else:
+                body = pattern[i + 1 : end].replace("\\", "\\\\")
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = end + 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    regex = "".join(out)
+    # without a slash the pattern matches the file name at any depth
+    return regex if anchored else "(?:.*/)?" + regex
+
+
+class LfsMatcher:
+    def __init__(self, ignore_case: bool = sys.platform == "win32"):
+        self._flags = re.IGNORECASE if ignore_case else 0
+        # (regex, tracked by lfs) in file order, the last match wins
+        self._rules: list[tuple[re.Pattern, bool]] = []
+        self._any: re.Pattern | None = None
+        self.patterns: list[str] = []
+
+    @classmethod
+    def from_repo(cls, root: str, repo: GitRepo | None = None) -> "LfsMatcher":
+        matcher = cls()
+        files = [".gitattributes"]
+        if repo is not None:
+            # nested .gitattributes from the index instead of walking the tree
+            proc = repo.run("ls-files", "-z", "--", "*.gitattributes", check=False)
+            files += [
+                f
+                for f in proc.stdout.decode("utf-8", "surrogateescape").split("\0")
+                if f and f != ".gitattributes"
+            ]
+        for rel in sorted(files, key=lambda f: f.count("/")):
+            try:
+                text = Path(root, rel).read_text(encoding="utf-8", errors="replace")
+            except OSError:
+                continue
+            matcher.add_file(text, os.path.dirname(rel).replace("\\", "/"))
+        return matcher
+
+    def add_file(self, text: str, base: str = "") -> None:
+        for line in text.splitlines():
+            line = line.strip()
+            if not line or line.startswith("#") or line.startswith("[attr]"):
+                continue
+            pattern, *attrs = line.split()
+            state = None
+            for attr in attrs:
+                if attr == "filter=lfs":
+                    state = True
+                elif attr in ("-filter", "!filter") or attr.startswith("filter="):
+                    state = False
+            if state is not None:
+                self.add(pattern, state, base)
+
+    def add(self, pattern: str, lfs: bool = True, base: str = "") -> None:
+        regex = _translate_pattern(pattern)
+        if base:
+            regex = re.escape(base.strip("/")) + "/" + regex
+        self._rules.append((re.compile(regex + r"\Z", self._flags), lfs))
+        self.patterns.append(pattern)
+        self._any = None
+
+    def matches(self, path: str) -> bool:
+        """True if git would store `path` through the LFS filter."""
+        if not self._rules:
+            return False
+        if self._any is None:
+            self._any = re.compile(
+                "|".join(f"(?:{rule.pattern})" for rule, _ in self._rules),
+                self._flags,
+            )
+        path = path.replace("\\", "/")
+        # most paths match no pattern at all: one combined test
+        if not self._any.match(path):
+            return False
+        for rule, lfs in reversed(self._rules):
+            if rule.match(path):
+                return lfs
+        return False
+
+
+# ==== persistent per-file index ==== #
+class FileInfo(NamedTuple):
+    size: int
+    binary: bool
+    lfs_pointer: bool
+    # bytes git is expected to send after zlib compression
+    packed: int
+
+
+class AssetIndex:
+    """SQLite index of FileInfo keyed by (path, mtime, size)."""
+
+    def __init__(self, path: Path | None = None):
+        self.path = Path(path) if path else user_cache_dir() / "asset-index.sqlite3"
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "key TEXT PRIMARY KEY, mtime INTEGER, size INTEGER, binary INTEGER, "
+            "lfs_pointer INTEGER, packed INTEGER)"
+        )
+        self._db.commit()
+
+    @staticmethod
+    def key_for(path: str) -> str:
+        normalized = os.path.normcase(os.path.abspath(path))
+        return hashlib.sha1(normalized.encode("utf-8", "surrogateescape")).hexdigest()
+
+    def get_many(self, stats: dict[str, tuple[int, int]]) -> dict[str, FileInfo]:
+        """Look up {path: (mtime_ns, size)}; entries with other stat data are misses."""
+        keys = {self.key_for(path): path for path in stats}
+        found: dict[str, FileInfo] = {}
+        with self._lock:
+            items = list(keys.items())
+            # SQLite limits the number of host parameters per statement
+            for i in range(0, len(items), 500):
+                batch = [key for key, _ in items[i : i + 500]]
+                rows = self._db.execute(
+                    "SELECT key, mtime, size, binary, lfs_pointer, packed FROM files"
+                    f" WHERE key IN ({','.join('?' * len(batch))})",
+                    batch,
+                ).fetchall()
+                for key, mtime, size, binary, pointer, packed in rows:
+                    path = keys[key]
+                    if stats[path] == (mtime, size):
+                        found[path] = FileInfo(
+                            size, bool(binary), bool(pointer), packed
+                        )
+            self.hits += len(found)
+            self.misses += len(stats) - len(found)
+        return found
+
+    def put_many(self, infos: dict[str, tuple[int, FileInfo]]) -> None:
+        """Store {path: (mtime_ns, FileInfo)}."""
+        rows = [
+            (
+                self.key_for(path),
+                mtime,
+                info.size,
+                int(info.binary),
+                int(info.lfs_pointer),
+                info.packed,
+            )
+            for path, (mtime, info) in infos.items()
+        ]
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+            self._db.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM files")
+            self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def inspect_file(path: str, size: int) -> FileInfo:
+    """Read a sample of the file: binary?, LFS pointer?, compressed size estimate."""
+    try:
+        with open(path, "rb") as f:
+            sample = f.read(SAMPLE_SIZE)
+    except OSError:
+        return FileInfo(size, False, False, size)
+
+    pointer = size <= LFS_POINTER_MAX and sample.startswith(LFS_POINTER_PREFIX)
+    binary = b"\0" in sample[:8192]
+    if not sample:
+        return FileInfo(size, binary, pointer, 0)
+    ratio = len(zlib.compress(sample, 1)) / len(sample)
+    return FileInfo(size, binary, pointer, int(size * min(ratio, 1.0)))
+
+
+# ==== detector ==== #
+class LargeAsset(NamedTuple):
+    path: str
+    size: int
+    lfs: bool
+
+
+class AssetReport(NamedTuple):
+    # large binaries that are NOT covered by an LFS pattern
+    untracked_large: list[LargeAsset]
+    # large files that LFS will take care of
+    lfs_large: list[LargeAsset]
+    # estimated upload: compressed git objects + LFS objects
+    push_bytes: int
+    lfs_bytes: int
+    files: int
+    elapsed: float
+
+
+class LargeAssetDetector:
+    def __init__(
+        self,
+        root: str,
+        threshold: int = DEFAULT_THRESHOLD,
+        matcher: LfsMatcher | None = None,
+        index: AssetIndex | None = None,
+        workers: int = STAT_WORKERS,
+        repo: GitRepo | None = None,
+    ):
+        """
+        repo: read the nested .gitattributes listed in its index as well;
+              only used when no matcher is given
+        """
+        self.root = root
+        self.threshold = threshold
+        self.matcher = (
+            matcher if matcher is not None else LfsMatcher.from_repo(root, repo)
+        )
+        self.index = index if index is not None else AssetIndex()
+        self.workers = workers
+
+    def _stat(self, path: str) -> tuple[str, str, tuple[int, int] | None]:
+        full = os.path.join(self.root, path)
+        try:
+            st = os.stat(full)
+        except OSError:
+            return path, full, None
+        return path, full, (st.st_mtime_ns, st.st_size)
+
+    def file_infos(self, paths: Iterable[str]) -> dict[str, FileInfo]:
+        """FileInfo for every existing path; stats run while `paths` is consumed."""
+        with ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="asset-stat"
+        ) as pool:
+            futures = [pool.submit(self._stat, path) for path in paths]
+            # the index is keyed by absolute path, results by repo path
+            stats: dict[str, tuple[int, int]] = {}
+            relative: dict[str, str] = {}
+            for future in futures:
+                path, full, stat = future.result()
+                if stat is not None:
+                    stats[full] = stat
+                    relative[full] = path
+
+            cached = self.index.get_many(stats)
+            missing = [full for full in stats if full not in cached]
+            inspected = pool.map(
+                lambda full: inspect_file(full, stats[full][1]), missing
+            )
+            new = {
+                full: (stats[full][0], info) for full, info in zip(missing, inspected)
+            }
+
+        if new:
+            self.index.put_many(new)
+            cached.update((full, info) for full, (_, info) in new.items())
+        return {relative[full]: info for full, info in cached.items()}
+
+    def sizes(self, root: str, paths: list[str]) -> dict[str, int]:
+        """Drop-in `sizer` for ChangeIndex, backed by the same index."""
+        return {path: info.size for path, info in self.file_infos(paths).items()}
+
+    def scan(self, entries: Iterable[StatusEntry | str]) -> AssetReport:
+        start = time.perf_counter()
+        hits, misses = self.index.hits, self.index.misses
+        paths = (
+            entry if isinstance(entry, str) else entry.path
+            for entry in entries
+            if isinstance(entry, str)
+            or (entry.kind != "ignored" and "D" not in (entry.index, entry.worktree))
+        )
+        infos = self.file_infos(paths)
+
+        untracked_large: list[LargeAsset] = []
+        lfs_large: list[LargeAsset] = []
+        push_bytes = 0
+        lfs_bytes = 0
+        for path, info in infos.items():
+            lfs = self.matcher.matches(path)
+            if lfs and not info.lfs_pointer:
+                # uploaded as is to the LFS store, git only gets the pointer
+                lfs_bytes += info.size
+            else:
+                push_bytes += info.packed
+            if info.size >= self.threshold:
+                if lfs:
+                    lfs_large.append(LargeAsset(path, info.size, True))
+                elif info.binary:
+                    untracked_large.append(LargeAsset(path, info.size, False))
+
+        untracked_large.sort(key=lambda a: a.size, reverse=True)
+        lfs_large.sort(key=lambda a: a.size, reverse=True)
+        elapsed = time.perf_counter() - start
+        LOGGER.debug(
+            f"Asset scan: {len(infos)} files in {elapsed:.3f}s"
+            f" ({self.index.hits - hits} cached, {self.index.misses - misses} inspected)"
+        )
+        return AssetReport(
+            untracked_large,
+            lfs_large,
+            push_bytes + lfs_bytes,
+            lfs_bytes,
+            len(infos),
+            elapsed,
+        )
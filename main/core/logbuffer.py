@@ -0,0 +1,83 @@
+"""
+Bounded in-memory log handler that UI panels subscribe to.
+
+Keeps the last `capacity` formatted records and pushes every new record to its
+subscribers, so log panels never have to read back the log file.
+"""
+
+import logging
+import threading
+from collections import deque
+from typing import Callable
+
+
+def _deliver(callback: Callable[[str], None], message: str) -> None:
+    try:
+        callback(message)
+    except Exception:
+        # never let a broken panel break logging
+        pass
+
+
+class RingBufferHandler(logging.Handler):
+    def __init__(self, capacity: int = 5000, level: int = logging.NOTSET):
+        super().__init__(level)
+        self.capacity = capacity
+        self._records: deque[tuple[int, str]] = deque(maxlen=capacity)
+        self._subscribers: list[tuple[Callable[[str], None], int]] = []
+        self._lock_rb = threading.Lock()
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        # without the handler lock of logging.Handler.handle(): subscribers run
+        # outside of every lock and may log themselves
+        rv = self.filter(record)
+        if isinstance(rv, logging.LogRecord):
+            record = rv
+        if rv:
+            self.emit(record)
+        return bool(rv)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            message = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+
+        with self._lock_rb:
+            self._records.append((record.levelno, message))
+            subscribers = list(self._subscribers)
+        for callback, level in subscribers:
+            if record.levelno >= level:
+                _deliver(callback, message)
+
+    def records(self, level: int = logging.NOTSET) -> list[str]:
+        with self._lock_rb:
+            return [message for levelno, message in self._records if levelno >= level]
+
+    def subscribe(
+        self,
+        callback: Callable[[str], None],
+        level: int = logging.NOTSET,
+        replay: bool = True,
+    ) -> Callable[[], None]:
+        """Register `callback` and return a function that unsubscribes it.
+
+        With `replay` the buffered records are delivered first, in order.
+        """
+        if not isinstance(level, int):
+            raise TypeError(f"level must be an int, not {level!r}")
+        entry = (callback, level)
+        with self._lock_rb:
+            backlog = list(self._records) if replay else []
+            self._subscribers.append(entry)
+        for levelno, message in backlog:
+            if levelno >= level:
+                _deliver(callback, message)
+
+        def unsubscribe() -> None:
+            with self._lock_rb:
+                if entry in self._subscribers:
+                    self._subscribers.remove(entry)
+
+        return unsubscribe
@@ -0,0 +1,349 @@
+"""
+Pre-launch checks as a small dependency graph.
+
+Every check is a node with the names of the checks it needs. Nodes without
+pending dependencies run concurrently as jobs of the application's
+`JobScheduler`, a node starts as soon as its last dependency succeeded, and
+dependents of a failed node are skipped. Wall time is therefore the critical
+path, not the sum of all checks. Check functions get the `JobContext`, so the
+fetch is killed when the pipeline is cancelled or the application closes.
+
+Results are queued like the project registry's: the Tk thread drains them
+with `poll()`, headless callers use `run()`.
+
+The sync check fetches a repository at most once per `fetch_interval`, so
+switching between projects does not go to the network every time.
+"""
+
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+from main._template import LOGGER
+from main.core.git import GitRepo, git_version
+from main.core.jobs import (
+    CANCELLED,
+    HIGH,
+    Job,
+    JobContext,
+    JobScheduler,
+    get_scheduler,
+)
+from main.errors import JobCancelled
+
+PENDING = "pending"
+RUNNING = "running"
+OK = "ok"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+FETCH_TIMEOUT = 30.0
+FETCH_INTERVAL = 600.0
+
+# repository path -> monotonic time of its last fetch, shared by all pipelines
+_last_fetch: dict[str, float] = {}
+_fetch_lock = threading.Lock()
+
+
+class Check(NamedTuple):
+    name: str
+    # func(ctx) returns a short detail text, raises to fail
+    func: Callable[[JobContext], str | None]
+    deps: tuple[str, ...] = ()
+    # optional checks may fail without blocking the workflow
+    required: bool = True
+    label: str | None = None
+
+
+class CheckResult(NamedTuple):
+    name: str
+    status: str
+    detail: str
+    elapsed: float
+
+
+class CheckPipeline:
+    def __init__(self, checks: list[Check], scheduler: JobScheduler | None = None):
+        self.checks = {check.name: check for check in checks}
+        if len(self.checks) != len(checks):
+            raise ValueError("Duplicate check names")
+        self._dependents: dict[str, list[str]] = {name: [] for name in self.checks}
+        for check in checks:
+            for dep in check.deps:
+                if dep not in self.checks:
+                    raise ValueError(f"Check '{check.name}' depends on unknown '{dep}'")
+                self._dependents[dep].append(check.name)
+        self.order = self._topological_order()
+
+        self._scheduler = scheduler or get_scheduler()
+        self._jobs: dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._waiting: dict[str, int] = {}
+        self._cancelled = False
+        self.results: dict[str, CheckResult] = {}
+        self._queue: queue.Queue[CheckResult] = queue.Queue()
+        self._done = threading.Event()
+        self._started_at = 0.0
+        self.elapsed = 0.0
+
+    def _topological_order(self) -> list[str]:
+        indegree = {name: len(check.deps) for name, check in self.checks.items()}
+        ready = [name for name, degree in indegree.items() if degree == 0]
+        order = []
+        while ready:
+            name = ready.pop(0)
+            order.append(name)
+            for dependent in self._dependents[name]:
+                indegree[dependent] -= 1
+                if indegree[dependent] == 0:
+                    ready.append(dependent)
+        if len(order) != len(self.checks):
+            cyclic = sorted(set(self.checks) - set(order))
+            raise ValueError(f"Cyclic check dependencies: {', '.join(cyclic)}")
+        return order
+
+    @property
+    def finished(self) -> bool:
+        return self._done.is_set()
+
+    @property
+    def passed(self) -> bool:
+        """All required checks succeeded (only meaningful once finished)."""
+        return all(
+            self.results.get(name, CheckResult(name, PENDING, "", 0)).status == OK
+            for name, check in self.checks.items()
+            if check.required
+        )
+
+    def start(self) -> None:
+        self._started_at = time.perf_counter()
+        self._waiting = {name: len(check.deps) for name, check in self.checks.items()}
+        if not self.checks:
+            self._finish()
+            return
+        for name in self.order:
+            if not self.checks[name].deps:
+                self._submit(name)
+
+    def _submit(self, name: str) -> None:
+        with self._lock:
+            # under the lock: cancel() either sees the job or we see the flag
+            if not self._cancelled:
+                self._queue.put(CheckResult(name, RUNNING, "", 0.0))
+                self._jobs[name] = self._scheduler.submit(
+                    self._run,
+                    self.checks[name],
+                    name=f"prelaunch: {name}",
+                    priority=HIGH,
+                )
+                return
+        self._complete(CheckResult(name, SKIPPED, "Cancelled", 0.0))
+
+    def cancel(self) -> None:
+        """Cancel the checks that are queued or running, e.g. a slow fetch."""
+        with self._lock:
+            self._cancelled = True
+            jobs = list(self._jobs.items())
+        for name, job in jobs:
+            if job.cancel() and job.state == CANCELLED:
+                # dropped from the queue before it ran
+                self._complete(CheckResult(name, FAILED, "Cancelled", 0.0))
+
+    def _run(self, ctx: JobContext, check: Check) -> None:
+        start = time.perf_counter()
+        try:
+            detail = check.func(ctx) or ""
+            status = OK
+        except JobCancelled:
+            detail = "Cancelled"
+            status = FAILED
+        except Exception as e:
+            detail = str(e) or type(e).__name__
+            status = FAILED
+        elapsed = time.perf_counter() - start
+
+        log = LOGGER.info if status == OK else LOGGER.warning
+        log(f"Pre-launch check '{check.name}' {status} in {elapsed:.2f}s: {detail}")
+        self._complete(CheckResult(check.name, status, detail, elapsed))
+
+    def _complete(self, result: CheckResult) -> None:
+        ready: list[str] = []
+        skipped: list[CheckResult] = []
+        with self._lock:
+            self.results[result.name] = result
+            self._queue.put(result)
+            stack = [result]
+            while stack:
+                done = stack.pop()
+                for dependent in self._dependents[done.name]:
+                    if dependent in self.results:
+                        continue
+                    if done.status != OK or self._cancelled:
+                        # a check that finished after cancel() starts nothing
+                        detail = (
+                            "Cancelled"
+                            if self._cancelled
+                            else f"'{done.name}' {done.status}"
+                        )
+                        skip = CheckResult(dependent, SKIPPED, detail, 0.0)
+                        self.results[dependent] = skip
+                        skipped.append(skip)
+                        stack.append(skip)
+                        continue
+                    self._waiting[dependent] -= 1
+                    if self._waiting[dependent] == 0:
+                        ready.append(dependent)
+            all_done = len(self.results) == len(self.checks)
+
+        for skip in skipped:
+            self._queue.put(skip)
+        for name in ready:
+            self._submit(name)
+        if all_done:
+            self._finish()
+
+    def _finish(self) -> None:
+        self.elapsed = time.perf_counter() - self._started_at
+        total = sum(r.elapsed for r in self.results.values())
+        LOGGER.info(
+            f"Pre-launch checks finished in {self.elapsed:.2f}s"
+            f" (sum of all steps {total:.2f}s)"
+        )
+        self._done.set()
+
+    def poll(self) -> list[CheckResult]:
+        """Status changes since the last call. Call from the Tk thread."""
+        results: list[CheckResult] = []
+        try:
+            while True:
+                results.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        return results
+
+    def run(self, timeout: float | None = None) -> dict[str, CheckResult]:
+        """Run all checks and wait for them, for headless use."""
+        self.start()
+        self._done.wait(timeout)
+        return dict(self.results)
+
+
+# ==== default checks ==== #
+def _require(condition: bool, message: str) -> None:
+    if not condition:
+        raise RuntimeError(message)
+
+
+def _claim_fetch(path: str, interval: float) -> float | None:
+    """None if `path` may be fetched now (and is marked), else its last fetch time."""
+    now = time.monotonic()
+    with _fetch_lock:
+        last = _last_fetch.get(path)
+        if last is not None and now - last < interval:
+            return last
+        _last_fetch[path] = now
+    return None
+
+
+def build_prelaunch_checks(
+    paths: dict,
+    git: str = "git",
+    repo_path: str | None = None,
+    fetch_interval: float = FETCH_INTERVAL,
+) -> list[Check]:
+    """Checks before Unreal is started, built from the `paths` config section.
+
+    fetch_interval: seconds before the sync check fetches the same repository
+                    again, 0 fetches every time
+    """
+    unreal = paths.get("unreal") or ""
+    project = paths.get("unreal_project_file") or ""
+    repo_path = repo_path or paths.get("repo") or os.path.dirname(project)
+    repo = GitRepo(repo_path, git)
+
+    def check_unreal(ctx: JobContext) -> str:
+        _require(os.path.isfile(unreal), f"Not found: {unreal}")
+        # UnrealEditor has no extension outside of Windows
+        _require(
+            (
+                unreal.lower().endswith(".exe")
+                if sys.platform == "win32"
+                else os.access(unreal, os.X_OK)
+            ),
+            f"Not an executable: {unreal}",
+        )
+        return "Found"
+
+    def check_project(ctx: JobContext) -> str:
+        _require(
+            os.path.isfile(project) and project.endswith(".uproject"),
+            f"Not found: {project}",
+        )
+        return "Found"
+
+    def check_git(ctx: JobContext) -> str:
+        return "git {}.{}.{}".format(*git_version(git))
+
+    def check_repo(ctx: JobContext) -> str:
+        repo.run("rev-parse", "--is-inside-work-tree")
+        return repo_path
+
+    def check_sync(ctx: JobContext) -> str:
+        # fetch only; the pull itself is a workflow step
+        last = _claim_fetch(repo.path, fetch_interval)
+        if last is None:
+            try:
+                repo.run(
+                    "fetch",
+                    "--quiet",
+                    "--no-tags",
+                    timeout=FETCH_TIMEOUT,
+                    cancel=ctx.cancel_event,
+                )
+            except Exception:
+                # the next check tries again
+                with _fetch_lock:
+                    _last_fetch.pop(repo.path, None)
+                raise
+        status = repo.status(untracked="no")
+        if status.upstream is None:
+            return "No upstream"
+        detail = f"{status.behind} behind, {status.ahead} ahead"
+        if last is not None:
+            detail += f" (fetched {(time.monotonic() - last) / 60:.0f} min ago)"
+        return detail
+
+    def check_conflicts(ctx: JobContext) -> str:
+        status = repo.status(untracked="no")
+        conflicts = [e.path for e in status.entries if e.kind == "unmerged"]
+        _require(
+            not conflicts, f"{len(conflicts)} conflicts: {', '.join(conflicts[:3])}"
+        )
+        return "None"
+
+    def check_plugins(ctx: JobContext) -> str:
+        data = json.loads(Path(project).read_text(encoding="utf-8-sig"))
+        enabled = [p["Name"] for p in data.get("Plugins", []) if p.get("Enabled")]
+        broken = []
+        for uplugin in Path(project).parent.glob("Plugins/*/*.uplugin"):
+            try:
+                json.loads(uplugin.read_text(encoding="utf-8-sig"))
+            except (OSError, ValueError):
+                broken.append(uplugin.stem)
+        _require(not broken, f"Invalid .uplugin: {', '.join(broken)}")
+        return f"{len(enabled)} enabled"
+
+    return [
+        Check("unreal", check_unreal, label="Unreal"),
+        Check("project", check_project, label="Unreal Project File"),
+        Check("git", check_git, label="Git"),
+        Check("repo", check_repo, ("git",), label="Repository"),
+        Check("sync", check_sync, ("repo",), required=False, label="Sync (fetch)"),
+        Check("conflicts", check_conflicts, ("repo",), label="Conflicts"),
+        Check("plugins", check_plugins, ("project",), required=False, label="Plugins"),
+    ]
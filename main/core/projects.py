@@ -0,0 +1,283 @@
+"""
+Registry of the local Unreal projects for fast switching.
+
+Every project keeps the last result of each of its dashboard fetches (GitHub
+data, plus the local git status that the dashboard posts from its status
+workers). Switching shows those cached results right
+away and refreshes the project in the background; the other projects are
+refreshed one at a time by a periodic job, spread evenly over the refresh
+interval so they never hit GitHub or the disk all at once. All fetches are
+jobs of the application's `JobScheduler`, the active project's ahead of the
+background ones, and `stop()` cancels whatever has not run yet.
+
+Results are queued per (project, widget): the Tk thread drains them with
+`poll()`. A failed fetch is only queued while the widget has no good value
+yet, so a flaky refresh never replaces data on screen with an error.
+"""
+
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, NamedTuple
+
+from main._template import LOGGER
+from main.core.jobs import (
+    LOW,
+    NORMAL,
+    Job,
+    JobContext,
+    JobScheduler,
+    PeriodicJob,
+    get_scheduler,
+)
+
+REFRESH_INTERVAL = 300.0
+
+
+class WidgetResult(NamedTuple):
+    name: str
+    value: Any
+    error: Exception | None
+    elapsed: float
+
+
+class Project(NamedTuple):
+    name: str
+    # "user/repo" on GitHub
+    repo: str
+    # local clone, may be empty
+    path: str = ""
+    unreal_project_file: str = ""
+
+
+def projects_from_config(config: dict) -> list[Project]:
+    """`projects` list of the config, or the single project of `git` / `paths`."""
+    projects = []
+    for entry in config.get("projects", []):
+        project_file = entry.get("unreal_project_file", "")
+        projects.append(
+            Project(
+                entry.get("name") or entry["repo"].split("/")[-1],
+                entry["repo"],
+                entry.get("path") or os.path.dirname(project_file),
+                project_file,
+            )
+        )
+    if projects:
+        return projects
+
+    git = config.get("git", {})
+    paths = config.get("paths", {})
+    project_file = paths.get("unreal_project_file", "")
+    return [
+        Project(
+            git.get("repo", ""),
+            "{}/{}".format(git.get("user", ""), git.get("repo", "")),
+            paths.get("repo") or os.path.dirname(project_file),
+            project_file,
+        )
+    ]
+
+
+class ProjectState:
+    def __init__(self, project: Project):
+        self.project = project
+        # widget name -> last result, kept until a newer one arrives
+        self.results: dict[str, WidgetResult] = {}
+        # monotonic time of the last finished refresh
+        self.refreshed_at: float | None = None
+        self.refreshing = False
+        self._pending = 0
+
+
+class ProjectRegistry:
+    def __init__(
+        self,
+        projects: list[Project],
+        tasks: Callable[[Project], dict[str, Callable[[], Any]]],
+        interval: float = REFRESH_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+        scheduler: JobScheduler | None = None,
+    ):
+        """
+        tasks(project) -> {widget name: fetch}: the fetches of one project's
+        dashboard widgets
+        """
+        if not projects:
+            raise ValueError("No projects configured")
+        self._states = {project.name: ProjectState(project) for project in projects}
+        if len(self._states) != len(projects):
+            raise ValueError("Duplicate project names")
+        self._tasks = tasks
+        self.interval = interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._queue: queue.Queue[tuple[str, WidgetResult]] = queue.Queue()
+        self._scheduler = scheduler or get_scheduler()
+        # fetches that may still be queued, cancelled by stop()
+        self._jobs: list[Job] = []
+        self._ticker: PeriodicJob | None = None
+        self.active = projects[0].name
+        # first background refresh of project i at i * interval / n
+        now = clock()
+        step = interval / len(projects)
+        self._due = {project.name: now + i * step for i, project in enumerate(projects)}
+
+    @property
+    def names(self) -> list[str]:
+        return list(self._states)
+
+    def state(self, name: str) -> ProjectState:
+        return self._states[name]
+
+    def switch(self, name: str) -> ProjectState:
+        """Make `name` active, refresh it, and return its cached state at once."""
+        state = self._states[name]
+        self.active = name
+        self.refresh(name)
+        return state
+
+    def is_refreshing(self, name: str) -> bool:
+        with self._lock:
+            return self._states[name].refreshing
+
+    def refresh(self, name: str) -> bool:
+        """Start a refresh unless one is running; False if it was already running."""
+        state = self._states[name]
+        with self._lock:
+            if state.refreshing:
+                return False
+            state.refreshing = True
+            self._due[name] = self._clock() + self.interval
+        try:
+            tasks = self._tasks(state.project)
+        except Exception:
+            with self._lock:
+                state.refreshing = False
+            raise
+        with self._lock:
+            state._pending = len(tasks)
+        if not tasks:
+            self._finish(state)
+        priority = NORMAL if name == self.active else LOW
+        jobs = [
+            self._scheduler.submit(
+                self._run,
+                state,
+                widget,
+                task,
+                name=f"{name}: {widget}",
+                priority=priority,
+            )
+            for widget, task in tasks.items()
+        ]
+        with self._lock:
+            self._jobs = [job for job in self._jobs if not job.done] + jobs
+        return True
+
+    def _run(
+        self,
+        ctx: JobContext,
+        state: ProjectState,
+        widget: str,
+        task: Callable[[], Any],
+    ) -> None:
+        start = time.perf_counter()
+        value, error = None, None
+        try:
+            value = task()
+        except Exception as e:
+            error = e
+        result = WidgetResult(widget, value, error, time.perf_counter() - start)
+        if error is not None:
+            LOGGER.warning(f"Project '{state.project.name}' {widget} failed: {error}")
+        else:
+            LOGGER.info(
+                f"Dashboard widget '{widget}' loaded in {result.elapsed:.2f}s"
+                f" ({state.project.name})"
+            )
+
+        with self._lock:
+            show = self._store(state, result)
+            state._pending -= 1
+            done = state._pending == 0
+        if show:
+            self._queue.put((state.project.name, result))
+        if done:
+            self._finish(state)
+
+    @staticmethod
+    def _store(state: ProjectState, result: WidgetResult) -> bool:
+        """Cache `result`; False if it is an error and a good value is kept instead."""
+        known = state.results.get(result.name)
+        if result.error is not None and known is not None and known.error is None:
+            return False
+        state.results[result.name] = result
+        return True
+
+    def post(self, name: str, result: WidgetResult) -> None:
+        """Add a result produced outside the registry, e.g. by a status worker."""
+        state = self._states[name]
+        with self._lock:
+            show = self._store(state, result)
+        if show:
+            self._queue.put((name, result))
+
+    def _finish(self, state: ProjectState) -> None:
+        with self._lock:
+            state.refreshing = False
+            state.refreshed_at = self._clock()
+        LOGGER.debug(f"Project '{state.project.name}' refreshed")
+
+    def poll(self) -> list[tuple[str, WidgetResult]]:
+        """(project, result) pairs finished since the last call. Call from the Tk thread."""
+        results: list[tuple[str, WidgetResult]] = []
+        try:
+            while True:
+                results.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        return results
+
+    # ==== background refresh ==== #
+    def tick(self) -> str | None:
+        """Refresh the most overdue inactive project, if any; one per call."""
+        now = self._clock()
+        with self._lock:
+            if any(state.refreshing for state in self._states.values()):
+                # one project at a time, the active one must not queue behind more
+                return None
+            overdue = [
+                (due, name)
+                for name, due in self._due.items()
+                if name != self.active and due <= now
+            ]
+        if not overdue:
+            return None
+        _, name = min(overdue)
+        self.refresh(name)
+        return name
+
+    def start(self) -> None:
+        if self._ticker is not None:
+            return
+        # often enough to keep the stagger between projects
+        step = max(1.0, self.interval / len(self._states) / 4)
+        self._ticker = self._scheduler.every(
+            step, self._tick, name="project-refresh", priority=LOW
+        )
+
+    def _tick(self, ctx: JobContext) -> None:
+        try:
+            self.tick()
+        except Exception as e:
+            LOGGER.error(f"Project refresh scheduler: {e}")
+
+    def stop(self) -> None:
+        if self._ticker is not None:
+            self._ticker.cancel()
+        with self._lock:
+            jobs, self._jobs = self._jobs, []
+        for job in jobs:
+            job.cancel()
@@ -0,0 +1,220 @@
+"""
+Pseudo-terminal backends for the terminal tab and headless builds.
+
+`spawn_pty()` picks winpty on Windows and `os.openpty()` everywhere else. Both
+backends expose a selectable `fileno()`, so readers wait in a selector instead
+of polling `read()` in a loop.
+"""
+
+import errno
+import os
+import selectors
+import shlex
+import subprocess
+import sys
+from abc import ABC, abstractmethod
+
+IS_WINDOWS = sys.platform == "win32"
+READ_SIZE = 65536
+
+
+def default_shell() -> str:
+    if IS_WINDOWS:
+        return "cmd.exe /Q"
+    return os.environ.get("SHELL") or "/bin/sh"
+
+
+class PtyProcess(ABC):
+    """Common interface of the backends.
+
+    `read()` returns b"" once the child is gone and None when nothing is
+    available right now.
+    """
+
+    # what the enter key sends
+    newline = "\n"
+
+    @abstractmethod
+    def fileno(self) -> int: ...
+
+    @abstractmethod
+    def read(self, size: int = READ_SIZE) -> bytes | None: ...
+
+    @abstractmethod
+    def write(self, data: str | bytes) -> None: ...
+
+    @abstractmethod
+    def isalive(self) -> bool: ...
+
+    @abstractmethod
+    def close(self) -> None: ...
+
+    def wait_readable(self, timeout: float | None = None) -> bool:
+        """Block until output (or EOF) is available, at most `timeout` seconds."""
+        with selectors.DefaultSelector() as selector:
+            selector.register(self.fileno(), selectors.EVENT_READ)
+            return bool(selector.select(timeout))
+
+
+class PosixPty(PtyProcess):
+    def __init__(
+        self,
+        argv: list[str],
+        cwd: str | None = None,
+        env: dict[str, str] | None = None,
+        dimensions: tuple[int, int] = (24, 80),
+    ):
+        env = dict(os.environ if env is None else env)
+        env.setdefault("TERM", "xterm-256color")
+
+        master, slave = os.openpty()
+        try:
+            self._set_size(slave, dimensions)
+            self._proc = subprocess.Popen(
+                argv,
+                stdin=slave,
+                stdout=slave,
+                stderr=slave,
+                cwd=cwd,
+                env=env,
+                # eigene Session, damit die PTY das Controlling Terminal wird
+                start_new_session=True,
+                close_fds=True,
+            )
+        except BaseException:
+            os.close(master)
+            raise
+        finally:
+            os.close(slave)
+
+        os.set_blocking(master, False)
+        self._fd = master
+        self.pid = self._proc.pid
+
+    @staticmethod
+    def _set_size(fd: int, dimensions: tuple[int, int]) -> None:
+        try:
+            import fcntl
+            import struct
+            import termios
+
+            rows, cols = dimensions
+            fcntl.ioctl(fd, termios.TIOCSWINSZ, struct.pack("HHHH", rows, cols, 0, 0))
+        except (ImportError, OSError):
+            pass
+
+    def fileno(self) -> int:
+        return self._fd
+
+    def read(self, size: int = READ_SIZE) -> bytes | None:
+        if self._fd < 0:
+            return b""
+        try:
+            return os.read(self._fd, size)
+        except BlockingIOError:
+            # selector meldete bereit, aber jemand anderes war schneller
+            return None
+        except OSError as e:
+            # Linux reports EIO on the master once the child side is closed
+            if e.errno in (errno.EIO, errno.EBADF):
+                return b""
+            raise
+
+    def write(self, data: str | bytes) -> None:
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        view = memoryview(data)
+        while view:
+            try:
+                written = os.write(self._fd, view)
+            except BlockingIOError:
+                with selectors.DefaultSelector() as selector:
+                    selector.register(self._fd, selectors.EVENT_WRITE)
+                    selector.select(1.0)
+                continue
+            view = view[written:]
+
+    def resize(self, rows: int, cols: int) -> None:
+        self._set_size(self._fd, (rows, cols))
+
+    def isalive(self) -> bool:
+        return self._proc.poll() is None
+
+    def close(self) -> None:
+        # closing the master hangs up the terminal: the shell gets SIGHUP,
+        # interactive shells ignore SIGTERM
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+        for stop in (None, self._proc.terminate, self._proc.kill):
+            if stop is not None:
+                stop()
+            try:
+                self._proc.wait(timeout=1)
+                return
+            except subprocess.TimeoutExpired:
+                continue
+
+
+class WinPty(PtyProcess):
+    newline = "\r\n"
+
+    def __init__(
+        self,
+        cmd: str,
+        cwd: str | None = None,
+        env: dict[str, str] | None = None,
+        dimensions: tuple[int, int] = (24, 80),
+    ):
+        import winpty
+
+        self._proc = winpty.PtyProcess.spawn(
+            cmd, cwd=cwd, env=env, dimensions=dimensions
+        )
+        self.pid = self._proc.pid
+
+    def fileno(self) -> int:
+        # pywinpty forwards the console output through a local socket
+        return self._proc.fileno()
+
+    def read(self, size: int = READ_SIZE) -> bytes | None:
+        try:
+            data = self._proc.read(size)
+        except EOFError:
+            return b""
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        return data
+
+    def write(self, data: str | bytes) -> None:
+        if isinstance(data, bytes):
+            data = data.decode("utf-8", errors="replace")
+        self._proc.write(data)
+
+    def resize(self, rows: int, cols: int) -> None:
+        self._proc.setwinsize(rows, cols)
+
+    def isalive(self) -> bool:
+        return self._proc.isalive()
+
+    def close(self) -> None:
+        try:
+            self._proc.close(force=True)
+        except TypeError:
+            self._proc.close()
+
+
+def spawn_pty(
+    cmd: str | list[str] | None = None,
+    cwd: str | None = None,
+    env: dict[str, str] | None = None,
+    dimensions: tuple[int, int] = (24, 80),
+) -> PtyProcess:
+    """Start `cmd` (default: the user's shell) attached to a new pseudo-terminal."""
+    cmd = cmd or default_shell()
+    if IS_WINDOWS:
+        if not isinstance(cmd, str):
+            cmd = subprocess.list2cmdline(cmd)
+        return WinPty(cmd, cwd=cwd, env=env, dimensions=dimensions)
+    argv = shlex.split(cmd) if isinstance(cmd, str) else list(cmd)
+    return PosixPty(argv, cwd=cwd, env=env, dimensions=dimensions)
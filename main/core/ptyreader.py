@@ -0,0 +1,194 @@
+"""
+One background job that reads every open pseudo-terminal.
+
+Sessions register their PtyProcess with callbacks; a long-running job of the
+application's `JobScheduler` sleeps in a single selector over all of them and
+calls `on_data(bytes)` / `on_eof()` from its thread. Registration changes are
+queued and applied by the reader, a socketpair wakes it up (works with
+winpty's sockets and POSIX fds alike); cancelling the job, e.g. on shutdown,
+wakes it the same way.
+"""
+
+import selectors
+import socket
+import threading
+from typing import Callable
+
+from main._template import LOGGER
+from main.core.jobs import Job, JobContext, JobScheduler, get_scheduler
+from main.core.ptyprocess import PtyProcess
+
+
+class _Entry:
+    __slots__ = ("proc", "fd", "on_data", "on_eof", "paused")
+
+    def __init__(
+        self,
+        proc: PtyProcess,
+        on_data: Callable[[bytes], None],
+        on_eof: Callable[[], None],
+    ):
+        self.proc = proc
+        # kept: a closed PosixPty reports -1 as its fileno
+        self.fd = proc.fileno()
+        self.on_data = on_data
+        self.on_eof = on_eof
+        self.paused = False
+
+
+class PtyReader:
+    def __init__(self, scheduler: JobScheduler | None = None):
+        self._scheduler = scheduler
+        self._lock = threading.Lock()
+        self._ops: list[tuple[str, PtyProcess, _Entry | None]] = []
+        self._entries: dict[int, _Entry] = {}
+        self._job: Job | None = None
+        # the thread running the job, close() must not wait for itself
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+
+    @property
+    def sessions(self) -> int:
+        with self._lock:
+            return len(self._entries) + sum(op == "add" for op, _, _ in self._ops)
+
+    def register(
+        self,
+        proc: PtyProcess,
+        on_data: Callable[[bytes], None],
+        on_eof: Callable[[], None],
+    ) -> None:
+        self._submit("add", proc, _Entry(proc, on_data, on_eof))
+
+    def unregister(self, proc: PtyProcess) -> None:
+        self._submit("remove", proc)
+
+    def pause(self, proc: PtyProcess) -> None:
+        """Stop reading `proc` until resume(); its output waits in the PTY."""
+        self._submit("pause", proc)
+
+    def resume(self, proc: PtyProcess) -> None:
+        self._submit("resume", proc)
+
+    def close(self) -> None:
+        with self._lock:
+            self._stopping = True
+            job = self._job
+        self._wake()
+        if job is not None and self._thread is not threading.current_thread():
+            job.wait(timeout=2)
+
+    def _submit(self, op: str, proc: PtyProcess, entry: _Entry | None = None) -> None:
+        with self._lock:
+            self._ops.append((op, proc, entry))
+            if self._job is None and not self._stopping:
+                # started with the first session
+                scheduler = self._scheduler or get_scheduler()
+                self._job = scheduler.submit(
+                    self._run, name="pty-reader", long_running=True
+                )
+        self._wake()
+
+    def _wake(self) -> None:
+        try:
+            self._wake_w.send(b"\0")
+        except (BlockingIOError, OSError):
+            # buffer full: a wakeup is already pending
+            pass
+
+    def _apply_ops(self, selector: selectors.BaseSelector) -> None:
+        with self._lock:
+            ops, self._ops = self._ops, []
+        for op, proc, entry in ops:
+            if op == "add":
+                try:
+                    selector.register(entry.fd, selectors.EVENT_READ, entry)
+                except (OSError, ValueError, KeyError) as e:
+                    LOGGER.error(f"Cannot watch PTY of pid {proc.pid}: {e}")
+                    entry.on_eof()
+                    continue
+                self._entries[entry.fd] = entry
+                continue
+
+            # by identity, the fd number may already belong to a newer session
+            current = next((e for e in self._entries.values() if e.proc is proc), None)
+            if current is None:
+                continue
+            fd = current.fd
+            if op == "remove":
+                del self._entries[fd]
+                if not current.paused:
+                    selector.unregister(fd)
+            elif op == "pause" and not current.paused:
+                current.paused = True
+                selector.unregister(fd)
+            elif op == "resume" and current.paused:
+                current.paused = False
+                selector.register(fd, selectors.EVENT_READ, current)
+
+    def _drop(self, selector: selectors.BaseSelector, entry: _Entry) -> None:
+        self._entries.pop(entry.fd, None)
+        try:
+            selector.unregister(entry.fd)
+        except (KeyError, ValueError):
+            pass
+
+    def _run(self, ctx: JobContext) -> None:
+        self._thread = threading.current_thread()
+        ctx.on_cancel(self._wake)
+        with selectors.DefaultSelector() as selector:
+            selector.register(self._wake_r, selectors.EVENT_READ, None)
+            while True:
+                with self._lock:
+                    if ctx.cancelled:
+                        self._stopping = True
+                    if self._stopping:
+                        break
+                for key, _ in selector.select():
+                    entry = key.data
+                    if entry is None:
+                        try:
+                            while self._wake_r.recv(4096):
+                                pass
+                        except BlockingIOError:
+                            pass
+                        continue
+                    if entry.paused or self._entries.get(key.fd) is not entry:
+                        # removed or paused by an op of this round
+                        continue
+
+                    try:
+                        data = entry.proc.read()
+                    except Exception as e:
+                        LOGGER.error(f"PTY read failed: {e}")
+                        data = b""
+                    if data is None:
+                        continue
+                    try:
+                        if data:
+                            entry.on_data(data)
+                        else:
+                            self._drop(selector, entry)
+                            entry.on_eof()
+                    except Exception as e:
+                        LOGGER.error(f"PTY output handler failed: {e}")
+                self._apply_ops(selector)
+
+        self._wake_r.close()
+        self._wake_w.close()
+
+
+_reader: PtyReader | None = None
+_reader_lock = threading.Lock()
+
+
+def get_pty_reader() -> PtyReader:
+    """The process-wide reader shared by all terminal sessions."""
+    global _reader
+    with _reader_lock:
+        if _reader is None:
+            _reader = PtyReader()
+        return _reader
@@ -0,0 +1,281 @@
+"""
+Snapshots of the working tree before a pull.
+
+Only what differs from HEAD is captured, so a snapshot takes about as long as
+`git status`, not as long as the project is big:
+
+- tracked changes go into a commit from `git stash create` (index and
+  working tree, the working tree itself is not touched) that is kept alive by
+  a ref below `refs/unrealgitui/snapshots/`
+- untracked files are cloned into the store next to the git directory:
+  reflink (copy-on-write) where the file system supports it, else a hard
+  link, else a real copy. Git and Unreal replace files instead of rewriting
+  them in place, so a hard link keeps the old content after a pull.
+
+Every snapshot is a folder with `manifest.json` and `files/`; the oldest ones
+are evicted once more than `keep` exist or `max_bytes` is exceeded.
+"""
+
+import errno
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+
+from main._template import LOGGER
+from main.core.git import GitRepo, GitStatus
+from main.errors import SnapshotError
+
+REF_PREFIX = "refs/unrealgitui/snapshots/"
+DEFAULT_KEEP = 10
+CLONE_WORKERS = 16
+# linux/fs.h
+FICLONE = 0x40049409
+# the file system can't do it at all, don't try again for the next file
+_UNSUPPORTED = {errno.EXDEV, errno.EPERM, errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL}
+
+REFLINK = "reflink"
+HARDLINK = "hardlink"
+COPY = "copy"
+
+
+class SnapshotInfo(NamedTuple):
+    id: str
+    # unix time
+    created: float
+    label: str
+    head: str | None
+    # commit from `git stash create`, None if tracked files were unchanged
+    stash: str | None
+    untracked: list[str]
+    # size of all changed and untracked files
+    bytes: int
+    # bytes really written to disk (copies only, links and clones share data)
+    stored_bytes: int
+    elapsed: float
+
+
+class _Cloner:
+    """Clones files with the cheapest method that works on this file system."""
+
+    def __init__(self):
+        self.reflink = sys.platform.startswith("linux")
+        self.hardlink = True
+
+    def clone(self, src: str, dst: str) -> str:
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        if self.reflink:
+            try:
+                import fcntl
+
+                with open(src, "rb") as s, open(dst, "wb") as d:
+                    fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+                shutil.copystat(src, dst)
+                return REFLINK
+            except OSError as e:
+                if os.path.exists(dst):
+                    os.remove(dst)
+                if e.errno in _UNSUPPORTED:
+                    self.reflink = False
+        if self.hardlink:
+            try:
+                os.link(src, dst)
+                return HARDLINK
+            except OSError as e:
+                if e.errno in _UNSUPPORTED or sys.platform == "win32":
+                    self.hardlink = False
+        shutil.copy2(src, dst)
+        return COPY
+
+
+class SnapshotStore:
+    def __init__(
+        self,
+        repo: GitRepo,
+        root: str | Path | None = None,
+        keep: int = DEFAULT_KEEP,
+        max_bytes: int | None = None,
+        workers: int = CLONE_WORKERS,
+    ):
+        """
+        root defaults to `<git dir>/unrealgitui/snapshots`: inside the repository
+        (so on the same drive, hard links work) but invisible to git.
+        """
+        self.repo = repo
+        if root is None:
+            git_dir = repo.run("rev-parse", "--absolute-git-dir").stdout
+            root = Path(git_dir.decode("utf-8", "surrogateescape").strip())
+            root = root / "unrealgitui" / "snapshots"
+        self.root = Path(root)
+        self.keep = keep
+        self.max_bytes = max_bytes
+        self.workers = workers
+        self._cloner = _Cloner()
+
+    # ==== create ==== #
+    def _new_id(self) -> str:
+        now = time.time()
+        base = time.strftime("%Y%m%d-%H%M%S", time.localtime(now))
+        snapshot_id = f"{base}-{int(now * 1000) % 1000:03d}"
+        suffix = 1
+        while (self.root / snapshot_id).exists():
+            snapshot_id = f"{base}-{int(now * 1000) % 1000:03d}-{suffix}"
+            suffix += 1
+        return snapshot_id
+
+    def _stash_create(self, label: str) -> str | None:
+        args = []
+        # stash create writes a commit and needs an identity
+        if self.repo.config("user.email") is None:
+            args += [
+                "-c",
+                "user.name=UnrealGitUI",
+                "-c",
+                "user.email=unrealgitui@localhost",
+            ]
+        proc = self.repo.run(*args, "stash", "create", label or "UnrealGitUI snapshot")
+        return proc.stdout.decode("ascii").strip() or None
+
+    def create(self, label: str = "", status: GitStatus | None = None) -> SnapshotInfo:
+        """Snapshot all changes; pass a fresh `status` to skip running git status."""
+        start = time.perf_counter()
+        if status is None:
+            status = self.repo.status()
+        snapshot_id = self._new_id()
+        folder = self.root / snapshot_id
+        files = folder / "files"
+        folder.mkdir(parents=True)
+
+        try:
+            stash = self._stash_create(label)
+            if stash is not None:
+                self.repo.run("update-ref", REF_PREFIX + snapshot_id, stash)
+
+            untracked = [e.path for e in status.entries if e.kind == "untracked"]
+            changed = [
+                e.path
+                for e in status.entries
+                if e.kind in ("changed", "renamed", "unmerged") and e.worktree != "D"
+            ]
+
+            def capture(path: str) -> tuple[int, int]:
+                src = os.path.join(self.repo.path, path)
+                try:
+                    size = os.stat(src).st_size
+                    method = self._cloner.clone(src, str(files / path))
+                except FileNotFoundError:
+                    # removed since the status ran
+                    return 0, 0
+                return size, size if method == COPY else 0
+
+            def size_of(path: str) -> int:
+                try:
+                    return os.stat(os.path.join(self.repo.path, path)).st_size
+                except OSError:
+                    return 0
+
+            with ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="snapshot"
+            ) as pool:
+                captured = list(pool.map(capture, untracked))
+                tracked_bytes = sum(pool.map(size_of, changed))
+        except Exception:
+            self._remove(snapshot_id)
+            raise
+
+        info = SnapshotInfo(
+            snapshot_id,
+            time.time(),
+            label,
+            status.head,
+            stash,
+            untracked,
+            tracked_bytes + sum(size for size, _ in captured),
+            sum(stored for _, stored in captured),
+            time.perf_counter() - start,
+        )
+        self._write_manifest(info)
+        LOGGER.info(
+            f"Snapshot {snapshot_id}: {len(changed)} changed, {len(untracked)} untracked"
+            f" files, {info.bytes / 2**20:.1f} MiB ({info.stored_bytes / 2**20:.1f} MiB"
+            f" stored) in {info.elapsed:.2f}s"
+        )
+        self.prune()
+        return info
+
+    def _write_manifest(self, info: SnapshotInfo) -> None:
+        path = self.root / info.id / "manifest.json"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(info._asdict(), indent=2), encoding="utf-8")
+        os.replace(tmp, path)
+
+    # ==== list / restore ==== #
+    def snapshots(self) -> list[SnapshotInfo]:
+        """All complete snapshots, newest first."""
+        snapshots = []
+        if not self.root.is_dir():
+            return snapshots
+        for folder in self.root.iterdir():
+            try:
+                data = json.loads((folder / "manifest.json").read_text("utf-8"))
+                snapshots.append(SnapshotInfo(**data))
+            except (OSError, ValueError, TypeError):
+                # interrupted snapshot or foreign folder
+                continue
+        snapshots.sort(key=lambda s: s.created, reverse=True)
+        return snapshots
+
+    def get(self, snapshot_id: str) -> SnapshotInfo:
+        for info in self.snapshots():
+            if info.id == snapshot_id:
+                return info
+        raise SnapshotError(f"No snapshot {snapshot_id}")
+
+    def restore(self, snapshot_id: str) -> SnapshotInfo:
+        """Apply the tracked changes and copy the untracked files back."""
+        info = self.get(snapshot_id)
+        if info.stash is not None:
+            proc = self.repo.run("stash", "apply", info.stash, check=False)
+            if proc.returncode != 0:
+                raise SnapshotError(
+                    f"Could not apply snapshot {snapshot_id}: "
+                    + proc.stderr.decode("utf-8", "replace").strip()
+                )
+        files = self.root / snapshot_id / "files"
+        for path in info.untracked:
+            src = files / path
+            if src.exists():
+                dst = Path(self.repo.path, path)
+                dst.parent.mkdir(parents=True, exist_ok=True)
+                # a real copy: later edits must not reach into the snapshot
+                shutil.copy2(src, dst)
+        LOGGER.info(f"Snapshot {snapshot_id} restored")
+        return info
+
+    # ==== retention ==== #
+    def _remove(self, snapshot_id: str) -> None:
+        self.repo.run("update-ref", "-d", REF_PREFIX + snapshot_id, check=False)
+        shutil.rmtree(self.root / snapshot_id, ignore_errors=True)
+
+    def delete(self, snapshot_id: str) -> None:
+        self._remove(snapshot_id)
+        LOGGER.info(f"Snapshot {snapshot_id} deleted")
+
+    def prune(self) -> list[str]:
+        """Evict the oldest snapshots beyond `keep` / `max_bytes`."""
+        removed = []
+        total = 0
+        for index, info in enumerate(self.snapshots()):
+            total += info.stored_bytes
+            if index >= self.keep or (
+                self.max_bytes is not None and total > self.max_bytes and index > 0
+            ):
+                self._remove(info.id)
+                removed.append(info.id)
+        if removed:
+            LOGGER.info(f"Evicted snapshots: {', '.join(removed)}")
+        return removed
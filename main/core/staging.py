@@ -0,0 +1,221 @@
+"""
+Chunked staging for large asset changesets.
+
+`git add -A` over tens of thousands of assets is one long call without any
+progress, and if it dies nothing is staged. `StagingPipeline.stage()` hands
+the paths to `git add --pathspec-from-file` in batches instead. Every batch
+updates the index on its own: an interrupted run keeps what it staged, and
+paths that are already staged are skipped when it runs again.
+
+There is no separate hash phase. Blob ids written with `update-index
+--index-info` carry no stat data, so the `--refresh` afterwards reads and
+hashes every file a second time; measured, that was only ever slower than
+letting git add hash the files itself.
+
+`commit()` can commit only some paths (e.g. the categories of the change
+inspector); changes to everything else stay where they are.
+"""
+
+import os
+import stat
+import threading
+import time
+from typing import Callable, Iterable, NamedTuple
+
+from main._template import LOGGER
+from main.core.changes import CategoryMatcher
+from main.core.git import GitRepo, StatusEntry, git_version
+from main.errors import GitError, JobCancelled
+
+BATCH_SIZE = 2000
+# --pathspec-from-file needs git 2.26; older git gets the paths as arguments
+PATHSPEC_FROM_FILE = (2, 26, 0)
+# stay well below the 32k command line of Windows
+ARGS_LIMIT = 24000
+
+ADD = "add"
+
+
+class StageProgress(NamedTuple):
+    phase: str
+    files_done: int
+    files_total: int
+    bytes_done: int
+    bytes_total: int
+
+
+class StageReport(NamedTuple):
+    files: int
+    bytes: int
+    batches: int
+    elapsed: float
+
+
+def entry_paths(entries: Iterable[StatusEntry]) -> list[str]:
+    """Paths of the entries, with the old path of renames."""
+    paths = []
+    for entry in entries:
+        paths.append(entry.path)
+        if entry.orig_path:
+            paths.append(entry.orig_path)
+    return paths
+
+
+def _needs_add(entry: StatusEntry) -> bool:
+    # "." in the worktree column: the change is staged already
+    return entry.kind in ("untracked", "unmerged") or (
+        entry.kind in ("changed", "renamed") and entry.worktree != "."
+    )
+
+
+class StagingPipeline:
+    def __init__(
+        self,
+        repo: GitRepo,
+        batch_size: int = BATCH_SIZE,
+        matcher: CategoryMatcher | None = None,
+        lfs=None,
+    ):
+        """
+        lfs: LfsMatcher for the repository; read from .gitattributes if None
+        """
+        self.repo = repo
+        self.batch_size = max(1, batch_size)
+        self.matcher = matcher or CategoryMatcher()
+        self._lfs = lfs
+        self._from_file: bool | None = None
+
+    @property
+    def lfs(self):
+        if self._lfs is None:
+            from main.core.lfs import LfsMatcher
+
+            self._lfs = LfsMatcher.from_repo(self.repo.path, self.repo)
+        return self._lfs
+
+    def _pathspec_from_file(self) -> bool:
+        if self._from_file is None:
+            self._from_file = git_version(self.repo.git) >= PATHSPEC_FROM_FILE
+        return self._from_file
+
+    def select(
+        self, entries: Iterable[StatusEntry], categories: Iterable[str] | None = None
+    ) -> list[StatusEntry]:
+        """Entries (not ignored) in one of `categories`, all if None."""
+        wanted = None if categories is None else set(categories)
+        return [
+            entry
+            for entry in entries
+            if entry.kind != "ignored"
+            and (wanted is None or self.matcher.classify(entry.path) in wanted)
+        ]
+
+    # ==== add ==== #
+    def _sizes(self, paths: list[str]) -> dict[str, int]:
+        """Sizes of the regular files; deleted files and links are left out."""
+        sizes = {}
+        for path in paths:
+            try:
+                st = os.lstat(os.path.join(self.repo.path, path))
+            except OSError:
+                continue
+            if stat.S_ISREG(st.st_mode):
+                sizes[path] = st.st_size
+        return sizes
+
+    def _batches(self, paths: list[str]) -> Iterable[list[str]]:
+        if self._pathspec_from_file():
+            for i in range(0, len(paths), self.batch_size):
+                yield paths[i : i + self.batch_size]
+            return
+        batch: list[str] = []
+        length = 0
+        for path in paths:
+            if batch and (
+                len(batch) >= self.batch_size or length + len(path) + 1 > ARGS_LIMIT
+            ):
+                yield batch
+                batch, length = [], 0
+            batch.append(path)
+            length += len(path) + 1
+        if batch:
+            yield batch
+
+    def _add(self, paths: list[str]) -> None:
+        # literal: asset names may contain *, ? or [
+        if self._pathspec_from_file():
+            self.repo.run(
+                "--literal-pathspecs",
+                "add",
+                "--all",
+                "--pathspec-from-file=-",
+                "--pathspec-file-nul",
+                input="\0".join(paths).encode("utf-8", "surrogateescape"),
+            )
+        else:
+            self.repo.run("--literal-pathspecs", "add", "--all", "--", *paths)
+
+    def stage(
+        self,
+        entries: Iterable[StatusEntry],
+        on_progress: Callable[[StageProgress], None] | None = None,
+        cancel: threading.Event | None = None,
+    ) -> StageReport:
+        """
+        Stage the entries (new, changed, deleted) that are not staged yet.
+        on_progress is called after every batch. A cancel stops after the
+        running batch and raises JobCancelled; the finished batches stay staged.
+        """
+        start = time.perf_counter()
+        paths = entry_paths(entry for entry in entries if _needs_add(entry))
+        if not paths:
+            return StageReport(0, 0, 0, 0.0)
+
+        sizes = self._sizes(paths)
+        total_bytes = sum(sizes.values())
+        files_done = bytes_done = batches = 0
+        for batch in self._batches(paths):
+            if cancel is not None and cancel.is_set():
+                raise JobCancelled(f"Staging cancelled after {files_done} files")
+            try:
+                self._add(batch)
+            except GitError as e:
+                raise GitError(
+                    f"Staging stopped after {files_done}/{len(paths)} files: {e}"
+                ) from e
+            batches += 1
+            files_done += len(batch)
+            bytes_done += sum(sizes.get(path, 0) for path in batch)
+            if on_progress is not None:
+                on_progress(
+                    StageProgress(ADD, files_done, len(paths), bytes_done, total_bytes)
+                )
+
+        elapsed = time.perf_counter() - start
+        LOGGER.info(
+            f"Staged {files_done} files ({total_bytes / 2**20:.1f} MiB) in"
+            f" {batches} batches, {elapsed:.2f}s"
+        )
+        return StageReport(files_done, total_bytes, batches, elapsed)
+
+    # ==== commit ==== #
+    def commit(self, message: str, paths: list[str] | None = None) -> str:
+        """
+        Commit the index, or only `paths` (staged first); other staged changes
+        stay staged. Returns the new HEAD.
+        """
+        if paths is None:
+            self.repo.run("commit", "-m", message)
+        elif self._pathspec_from_file():
+            self.repo.run(
+                "--literal-pathspecs",
+                "commit",
+                "-m",
+                message,
+                "--pathspec-from-file=-",
+                "--pathspec-file-nul",
+                input="\0".join(paths).encode("utf-8", "surrogateescape"),
+            )
+        else:
+            self.repo.run("--literal-pathspecs", "commit", "-m", message, "--", *paths)
+        return self.repo.run("rev-parse", "HEAD").stdout.decode("ascii").strip()
@@ -0,0 +1,273 @@
+"""
+Unreal Editor supervisor.
+
+Starts the editor with `Popen` and returns immediately. A long-running job of
+the application's `JobScheduler` blocks in `wait()` on the process and then
+runs the post-close hooks. Closing the application abandons that daemon
+thread: the supervisor reports the editor as no longer running and the editor
+itself keeps going. A periodic job samples CPU and RSS every `sample_interval`
+seconds through psutil (/proc on Linux as a fallback) and is cancelled when
+the editor exits.
+"""
+
+import os
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import Callable, NamedTuple
+
+from main._template import LOGGER
+from main.core.jobs import (
+    LOW,
+    Job,
+    JobContext,
+    JobScheduler,
+    PeriodicJob,
+    get_scheduler,
+)
+from main.errors import UnrealLaunchError
+
+try:
+    import psutil
+except ImportError:  # a declared dependency; /proc still works on Linux without it
+    psutil = None
+
+MAX_SAMPLES = 10000
+
+
+class ResourceSample(NamedTuple):
+    # seconds since launch
+    t: float
+    cpu_percent: float
+    rss: int
+
+
+class EditorSession(NamedTuple):
+    pid: int
+    returncode: int
+    duration: float
+    peak_rss: int
+    samples: list[ResourceSample]
+
+
+class _ProcSampler:
+    """CPU/RSS of one pid from /proc (Linux)."""
+
+    def __init__(self, pid: int):
+        self.pid = pid
+        self._ticks = os.sysconf("SC_CLK_TCK")
+        self._page = os.sysconf("SC_PAGE_SIZE")
+        self._last: tuple[float, int] | None = None
+
+    def sample(self) -> tuple[float, int] | None:
+        try:
+            with open(f"/proc/{self.pid}/stat", "rb") as f:
+                stat = f.read()
+            with open(f"/proc/{self.pid}/statm", "rb") as f:
+                rss_pages = int(f.read().split()[1])
+        except (OSError, IndexError, ValueError):
+            return None
+        # fields after the "(comm)" part; utime and stime are fields 14 and 15
+        fields = stat[stat.rfind(b")") + 2 :].split()
+        cpu_ticks = int(fields[11]) + int(fields[12])
+        now = time.monotonic()
+
+        cpu = 0.0
+        if self._last is not None:
+            last_time, last_ticks = self._last
+            if now > last_time:
+                cpu = (cpu_ticks - last_ticks) / self._ticks / (now - last_time) * 100
+        self._last = (now, cpu_ticks)
+        return cpu, rss_pages * self._page
+
+
+class _PsutilSampler:
+    def __init__(self, pid: int):
+        self._proc = psutil.Process(pid)
+        # the first cpu_percent() call only sets the baseline
+        self._proc.cpu_percent(None)
+
+    def sample(self) -> tuple[float, int] | None:
+        try:
+            return self._proc.cpu_percent(None), self._proc.memory_info().rss
+        except psutil.Error:
+            return None
+
+
+def _make_sampler(pid: int):
+    if psutil is not None:
+        try:
+            return _PsutilSampler(pid)
+        except psutil.Error:
+            return None
+    if os.path.exists(f"/proc/{pid}/stat"):
+        return _ProcSampler(pid)
+    return None
+
+
+class EditorSupervisor:
+    def __init__(
+        self,
+        editor: str,
+        project: str,
+        args: list[str] | tuple[str, ...] = (),
+        sample_interval: float = 5.0,
+        on_exit: Callable[[EditorSession], None] | None = None,
+        on_sample: Callable[[ResourceSample], None] | None = None,
+        scheduler: JobScheduler | None = None,
+    ):
+        """
+        on_exit / on_sample and the post-close hooks are called from worker
+        threads; UI code has to hand them over to Tk itself.
+        """
+        self.editor = editor
+        self.project = project
+        self.args = list(args)
+        self.sample_interval = sample_interval
+        self._on_exit = on_exit
+        self._on_sample = on_sample
+        self._hooks: list[Callable[[EditorSession], None]] = []
+        self._lock = threading.Lock()
+        self._proc: subprocess.Popen | None = None
+        # set when the process is gone / when the post-close hooks are done
+        self._proc_done = threading.Event()
+        self._exited = threading.Event()
+        self._exited.set()
+        self._samples: deque[ResourceSample] = deque(maxlen=MAX_SAMPLES)
+        self._started_at = 0.0
+        self._scheduler = scheduler or get_scheduler()
+        self._wait_job: Job | None = None
+        self._sampler_job: PeriodicJob | None = None
+        self.last_session: EditorSession | None = None
+
+    @property
+    def running(self) -> bool:
+        return not self._exited.is_set()
+
+    @property
+    def pid(self) -> int | None:
+        return self._proc.pid if self._proc is not None else None
+
+    @property
+    def samples(self) -> list[ResourceSample]:
+        with self._lock:
+            return list(self._samples)
+
+    def add_post_close_hook(self, hook: Callable[[EditorSession], None]) -> None:
+        """Run `hook(session)` after every editor exit, in registration order."""
+        self._hooks.append(hook)
+
+    def launch(self) -> int:
+        """Start the editor and return its pid; may be called again after it exited."""
+        with self._lock:
+            if self.running:
+                raise UnrealLaunchError("Unreal Editor is already running")
+            try:
+                self._proc = subprocess.Popen(
+                    [self.editor, self.project, *self.args],
+                    cwd=os.path.dirname(self.project) or None,
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                )
+            except OSError as e:
+                raise UnrealLaunchError(f"Could not start {self.editor}: {e}") from e
+            self._started_at = time.monotonic()
+            self._samples.clear()
+            self._proc_done.clear()
+            self._exited.clear()
+            proc = self._proc
+
+        LOGGER.info(f"Unreal Editor started (pid {proc.pid}): {self.project}")
+        sampler = _make_sampler(proc.pid) if self.sample_interval > 0 else None
+        if self.sample_interval > 0 and sampler is None:
+            LOGGER.info("No CPU/RSS sampling available (install psutil)")
+        if sampler is not None:
+            self._sampler_job = self._scheduler.every(
+                self.sample_interval,
+                self._sample,
+                sampler,
+                name="unreal-sampler",
+                priority=LOW,
+            )
+        self._wait_job = self._scheduler.submit(
+            self._wait, proc, name="unreal-wait", long_running=True, daemon=True
+        )
+        return proc.pid
+
+    def wait(self, timeout: float | None = None) -> EditorSession | None:
+        """Block until the editor exited and the hooks ran, for headless use."""
+        if not self._exited.wait(timeout):
+            return None
+        return self.last_session
+
+    def terminate(self) -> None:
+        with self._lock:
+            proc = self._proc
+        if proc is not None and proc.poll() is None:
+            proc.terminate()
+
+    def _sample(self, ctx: JobContext, sampler) -> None:
+        if self._proc_done.is_set():
+            return
+        values = sampler.sample()
+        if values is None:
+            return
+        sample = ResourceSample(
+            time.monotonic() - self._started_at, values[0], values[1]
+        )
+        with self._lock:
+            self._samples.append(sample)
+        if self._on_sample is not None:
+            self._on_sample(sample)
+
+    def _stop_sampling(self) -> None:
+        sampler_job, self._sampler_job = self._sampler_job, None
+        if sampler_job is not None:
+            sampler_job.cancel()
+
+    def _abandon(self, proc: subprocess.Popen) -> None:
+        """The application closes: stop supervising, the editor keeps running."""
+        with self._lock:
+            if self._proc is not proc or self._proc_done.is_set():
+                return
+            self._proc_done.set()
+        self._stop_sampling()
+        LOGGER.info(f"Stopped supervising Unreal Editor (pid {proc.pid})")
+        # nothing reports this exit any more
+        self._exited.set()
+
+    def _wait(self, ctx: JobContext, proc: subprocess.Popen) -> None:
+        ctx.on_cancel(lambda: self._abandon(proc))
+        returncode = proc.wait()
+        with self._lock:
+            if self._proc is not proc or self._proc_done.is_set():
+                # abandoned, maybe relaunched since
+                return
+            self._proc_done.set()
+        self._stop_sampling()
+        duration = time.monotonic() - self._started_at
+        samples = self.samples
+        session = EditorSession(
+            proc.pid,
+            returncode,
+            duration,
+            max((s.rss for s in samples), default=0),
+            samples,
+        )
+        self.last_session = session
+        LOGGER.info(
+            f"Unreal Editor exited with code {returncode} after {duration:.0f}s"
+            f" (peak RSS {session.peak_rss / 2**20:.0f} MiB)"
+        )
+
+        for hook in list(self._hooks):
+            try:
+                hook(session)
+            except Exception as e:
+                LOGGER.error(f"Post-close hook {getattr(hook, '__name__', hook)}: {e}")
+        # set last: wait() callers see the hooks as done
+        self._exited.set()
+        if self._on_exit is not None:
+            self._on_exit(session)
@@ -0,0 +1,789 @@
+"""
+Workflow engine: pull → launch UE → status → add → commit → push → PR.
+
+Steps run in order on one thread (a scheduler job in the GUI, the caller's
+thread headless). After every step a checkpoint is written to
+`<git dir>/unrealgitui/workflow.json`: the finished steps and the data they
+produced (new HEAD, commit, PR link, …). If a step fails, is cancelled or the
+process dies, the next `run()` resumes at that step, so a failed push does not
+repeat a multi-GB pull or add. The checkpoint also records HEAD and the
+branch; if either moved in the meantime it is discarded and the workflow
+starts over, and the push step always pushes the recorded commit, never
+whatever HEAD is now. Only the commit step moves HEAD itself: it marks the
+checkpoint before committing, so a crash between the commit and the next
+checkpoint still resumes at the commit step, with the new commit as HEAD. The checkpoint is removed once all steps are done.
+
+Step durations are kept per step as a histogram with fixed buckets plus the
+most recent durations for percentiles, in the user cache folder, so runs can
+be compared over time.
+
+Headless, e.g. from CI:
+
+    python -m main.core.workflow --repo . --steps status,add,commit,push
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Iterable, NamedTuple
+
+from main._template import LOGGER
+from main.appdirs import user_cache_dir
+from main.core.git import GitRepo
+from main.core.staging import ADD as STAGE_ADD
+from main.core.staging import StageProgress, StagingPipeline, entry_paths
+from main.errors import GitError, JobCancelled, WorkflowError
+
+PULL = "pull"
+LAUNCH = "launch"
+STATUS = "status"
+ADD = "add"
+COMMIT = "commit"
+PUSH = "push"
+PR = "pr"
+STEP_ORDER = (PULL, LAUNCH, STATUS, ADD, COMMIT, PUSH, PR)
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+CHECKPOINT_VERSION = 1
+# upper bounds in seconds, the last bucket takes everything above
+HISTOGRAM_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600)
+RECENT_DURATIONS = 100
+STEP_LOG_LINES = 200
+EDITOR_POLL = 0.5
+
+
+class Step(NamedTuple):
+    name: str
+    # returns data for the later steps (JSON-serializable), raises to fail
+    func: Callable[["StepContext"], dict | None]
+    label: str | None = None
+    # the step is skipped when this returns False for the data so far
+    when: Callable[[dict], bool] | None = None
+
+
+class StepState:
+    def __init__(self, step: Step):
+        self.name = step.name
+        self.label = step.label or step.name.capitalize()
+        self.status = PENDING
+        # monotonic start, for live timers
+        self.started: float | None = None
+        self.elapsed = 0.0
+        self.error = ""
+        # finished in an earlier run, taken from the checkpoint
+        self.resumed = False
+        self.log: deque[str] = deque(maxlen=STEP_LOG_LINES)
+
+
+class WorkflowResult(NamedTuple):
+    ok: bool
+    failed_step: str | None
+    error: str
+    data: dict
+    # first step that ran in this call, None if all came from the checkpoint
+    resumed_from: str | None
+    elapsed: float
+
+
+class StepSummary(NamedTuple):
+    count: int
+    failures: int
+    mean: float
+    p50: float
+    p90: float
+    max: float
+
+
+def _write_json_atomic(path: Path, data: Any) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def default_checkpoint_path(repo: GitRepo) -> Path:
+    git_dir = repo.run("rev-parse", "--absolute-git-dir").stdout
+    root = Path(git_dir.decode("utf-8", "surrogateescape").strip())
+    return root / "unrealgitui" / "workflow.json"
+
+
+class Checkpoint:
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+
+    def load(self) -> dict | None:
+        try:
+            data = json.loads(self.path.read_text("utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            LOGGER.warning(f"Ignoring unreadable workflow checkpoint {self.path}: {e}")
+            return None
+        if data.get("version") != CHECKPOINT_VERSION:
+            return None
+        return data
+
+    def save(self, data: dict) -> None:
+        _write_json_atomic(self.path, dict(data, version=CHECKPOINT_VERSION))
+
+    def clear(self) -> None:
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class StepMetrics:
+    """Duration histogram per step, persisted as JSON."""
+
+    def __init__(self, path: str | Path | None = None):
+        self.path = Path(path) if path else user_cache_dir() / "workflow_metrics.json"
+        self._lock = threading.Lock()
+        self._data: dict[str, dict] | None = None
+
+    def _load(self) -> dict[str, dict]:
+        if self._data is None:
+            try:
+                self._data = json.loads(self.path.read_text("utf-8"))
+            except (OSError, ValueError):
+                self._data = {}
+        return self._data
+
+    def record(self, step: str, seconds: float, ok: bool = True) -> None:
+        with self._lock:
+            entry = self._load().setdefault(
+                step,
+                {
+                    "buckets": [0] * (len(HISTOGRAM_BUCKETS) + 1),
+                    "count": 0,
+                    "failures": 0,
+                    "sum": 0.0,
+                    "max": 0.0,
+                    "recent": [],
+                },
+            )
+            index = next(
+                (i for i, bound in enumerate(HISTOGRAM_BUCKETS) if seconds <= bound),
+                len(HISTOGRAM_BUCKETS),
+            )
+            entry["buckets"][index] += 1
+            entry["count"] += 1
+            entry["failures"] += 0 if ok else 1
+            entry["sum"] += seconds
+            entry["max"] = max(entry["max"], seconds)
+            entry["recent"] = (entry["recent"] + [round(seconds, 3)])[
+                -RECENT_DURATIONS:
+            ]
+            try:
+                _write_json_atomic(self.path, self._data)
+            except OSError as e:
+                LOGGER.warning(f"Could not save workflow metrics: {e}")
+
+    def histogram(self, step: str) -> list[tuple[float, int]]:
+        """(upper bound in seconds, count) per bucket; the last bound is inf."""
+        with self._lock:
+            entry = self._load().get(step)
+        counts = entry["buckets"] if entry else [0] * (len(HISTOGRAM_BUCKETS) + 1)
+        return list(zip(HISTOGRAM_BUCKETS + (float("inf"),), counts))
+
+    def summary(self, step: str) -> StepSummary | None:
+        with self._lock:
+            entry = self._load().get(step)
+        if not entry or not entry["count"]:
+            return None
+        recent = sorted(entry["recent"])
+
+        def percentile(p: float) -> float:
+            return recent[min(len(recent) - 1, int(p * len(recent)))]
+
+        return StepSummary(
+            entry["count"],
+            entry["failures"],
+            entry["sum"] / entry["count"],
+            percentile(0.5),
+            percentile(0.9),
+            entry["max"],
+        )
+
+
+class StepContext:
+    def __init__(self, engine: "WorkflowEngine", state: StepState, job_ctx=None):
+        self._engine = engine
+        self._state = state
+        self._job_ctx = job_ctx
+
+    @property
+    def data(self) -> dict:
+        """What the earlier steps returned (also after a resume)."""
+        return self._engine.data
+
+    @property
+    def cancelled(self) -> bool:
+        return self._job_ctx is not None and self._job_ctx.cancelled
+
+    @property
+    def cancel_event(self) -> threading.Event | None:
+        """For code that takes a threading.Event; None when run headless."""
+        return None if self._job_ctx is None else self._job_ctx.cancel_event
+
+    def check(self) -> None:
+        if self._job_ctx is not None:
+            self._job_ctx.check()
+
+    def log(self, message: str) -> None:
+        for line in message.splitlines() or [""]:
+            self._state.log.append(line)
+        LOGGER.info(f"[{self._state.name}] {message}")
+        self._engine._notify(self._state)
+
+    def expect_commit(self) -> None:
+        """
+        Mark the checkpoint before this step commits: until the step is done,
+        a HEAD one commit ahead of the recorded one still resumes it.
+        """
+        self._engine._save(self._engine._run_id, pending=self._state.name)
+
+
+class WorkflowEngine:
+    def __init__(
+        self,
+        steps: list[Step],
+        checkpoint: Checkpoint,
+        metrics: StepMetrics | None = None,
+        on_update: Callable[[StepState], None] | None = None,
+        repo: GitRepo | None = None,
+    ):
+        """
+        on_update(state) is called from the thread running the workflow after
+        every change of a step (status, log line).
+        repo: HEAD and branch are kept in the checkpoint, a checkpoint whose
+              HEAD or branch no longer match is not resumed
+        """
+        self.steps = list(steps)
+        names = [step.name for step in self.steps]
+        if len(set(names)) != len(names):
+            raise ValueError("Duplicate step names")
+        self.checkpoint = checkpoint
+        self.metrics = metrics
+        self._on_update = on_update
+        self.repo = repo
+        self._running = threading.Lock()
+        self._job_ctx = None
+        self._run_id = ""
+        self.data: dict = {}
+        self.states: dict[str, StepState] = {}
+        self._reset_states()
+
+    def _reset_states(self) -> None:
+        self.states = {step.name: StepState(step) for step in self.steps}
+
+    @property
+    def step_names(self) -> list[str]:
+        return [step.name for step in self.steps]
+
+    def resumable(self) -> dict | None:
+        """The checkpoint of an unfinished run of the same steps, if any."""
+        data = self.checkpoint.load()
+        if data is None or data.get("steps") != self.step_names:
+            return None
+        if self.repo is not None:
+            head, branch = _head(self.repo), _branch(self.repo)
+            # the pending step committed, the process died before its checkpoint
+            committed = (
+                data.get("pending") is not None
+                and head is not None
+                and _parent(self.repo, head) == data.get("head")
+            )
+            moved = data.get("head") != head and not committed
+            if moved or data.get("branch") != branch:
+                LOGGER.warning(
+                    f"Discarding workflow checkpoint {data.get('run_id')}:"
+                    f" the repository is now at {(head or 'no commit')[:10]}"
+                    f" on {branch or 'a detached HEAD'}"
+                )
+                self.checkpoint.clear()
+                return None
+        return data
+
+    def _notify(self, state: StepState) -> None:
+        if self._job_ctx is not None:
+            finished = sum(
+                s.status in (DONE, SKIPPED, FAILED) for s in self.states.values()
+            )
+            self._job_ctx.progress(
+                finished, len(self.steps), f"{state.label}: {state.status}"
+            )
+        if self._on_update is not None:
+            try:
+                self._on_update(state)
+            except Exception as e:
+                LOGGER.error(f"Workflow update callback failed: {e}")
+
+    def _save(
+        self, run_id: str, failed: dict | None = None, pending: str | None = None
+    ) -> None:
+        head = branch = None
+        if self.repo is not None:
+            head, branch = _head(self.repo), _branch(self.repo)
+        self.checkpoint.save(
+            {
+                "run_id": run_id,
+                "head": head,
+                "branch": branch,
+                "steps": self.step_names,
+                "completed": [
+                    name for name, s in self.states.items() if s.status == DONE
+                ],
+                "skipped": [
+                    name for name, s in self.states.items() if s.status == SKIPPED
+                ],
+                "data": self.data,
+                "failed": failed,
+                # step that is about to commit on top of "head"
+                "pending": pending,
+                "updated": time.time(),
+            }
+        )
+
+    def run(self, resume: bool = True, job_ctx=None) -> WorkflowResult:
+        """
+        Run all steps that are not finished yet; blocks. With a JobContext
+        (scheduler job) the steps see its cancel and progress is reported.
+        """
+        if not self._running.acquire(blocking=False):
+            raise WorkflowError("The workflow is already running")
+        try:
+            self._job_ctx = job_ctx
+            return self._run(resume)
+        finally:
+            self._job_ctx = None
+            self._running.release()
+
+    def _run(self, resume: bool) -> WorkflowResult:
+        start = time.perf_counter()
+        checkpoint = self.resumable() if resume else None
+        if checkpoint is None:
+            self.checkpoint.clear()
+        self._reset_states()
+        self.data = dict(checkpoint["data"]) if checkpoint else {}
+        run_id = checkpoint["run_id"] if checkpoint else uuid.uuid4().hex[:12]
+        self._run_id = run_id
+        if checkpoint:
+            for name in checkpoint["completed"] + checkpoint["skipped"]:
+                state = self.states[name]
+                state.status = DONE if name in checkpoint["completed"] else SKIPPED
+                state.resumed = True
+                self._notify(state)
+        resumed_from = None
+
+        for step in self.steps:
+            state = self.states[step.name]
+            if state.resumed:
+                continue
+            if resumed_from is None:
+                resumed_from = step.name
+                if checkpoint:
+                    LOGGER.info(f"Resuming workflow {run_id} at '{step.name}'")
+            if self._job_ctx is not None:
+                self._job_ctx.check()
+
+            if step.when is not None and not step.when(self.data):
+                state.status = SKIPPED
+                self._save(run_id)
+                self._notify(state)
+                continue
+
+            state.status = RUNNING
+            state.started = time.monotonic()
+            self._notify(state)
+            step_start = time.perf_counter()
+            try:
+                output = step.func(StepContext(self, state, self._job_ctx))
+            except JobCancelled:
+                # not a failure: the step runs again on resume
+                state.status = PENDING
+                state.started = None
+                self._save(run_id)
+                self._notify(state)
+                raise
+            except Exception as e:
+                state.elapsed = time.perf_counter() - step_start
+                state.status = FAILED
+                state.error = str(e) or type(e).__name__
+                if self.metrics is not None:
+                    self.metrics.record(step.name, state.elapsed, ok=False)
+                self._save(run_id, {"step": step.name, "error": state.error})
+                self._notify(state)
+                LOGGER.error(f"Workflow step '{step.name}' failed: {state.error}")
+                return WorkflowResult(
+                    False,
+                    step.name,
+                    state.error,
+                    self.data,
+                    resumed_from,
+                    time.perf_counter() - start,
+                )
+
+            state.elapsed = time.perf_counter() - step_start
+            self.data.update(output or {})
+            state.status = DONE
+            if self.metrics is not None:
+                self.metrics.record(step.name, state.elapsed)
+            self._save(run_id)
+            self._notify(state)
+            LOGGER.info(f"Workflow step '{step.name}' done in {state.elapsed:.2f}s")
+
+        self.checkpoint.clear()
+        elapsed = time.perf_counter() - start
+        LOGGER.info(f"Workflow {run_id} finished in {elapsed:.1f}s")
+        return WorkflowResult(True, None, "", self.data, resumed_from, elapsed)
+
+    def start(self, scheduler, resume: bool = True, **callbacks):
+        """Run as a high-priority scheduler job; callbacks go to `submit()`."""
+        from main.core.jobs import HIGH
+
+        return scheduler.submit(
+            lambda ctx: self.run(resume, ctx),
+            name="workflow",
+            priority=HIGH,
+            **callbacks,
+        )
+
+
+# ==== the Unreal workflow ==== #
+def _log_output(ctx: StepContext, proc) -> None:
+    for stream in (proc.stdout, proc.stderr):
+        text = stream.decode("utf-8", "replace").strip()
+        if text:
+            ctx.log(text)
+
+
+def _head(repo: GitRepo) -> str | None:
+    # through the repository's cat-file process, no git start per lookup
+    obj = repo.read_object("HEAD")
+    return obj[0] if obj is not None and obj[1] == "commit" else None
+
+
+def _parent(repo: GitRepo, rev: str) -> str | None:
+    """First parent of a commit, None for a root commit."""
+    obj = repo.read_object(rev)
+    if obj is None or obj[1] != "commit":
+        return None
+    for line in obj[2].split(b"\n"):
+        if line.startswith(b"parent "):
+            return line[len(b"parent ") :].decode("ascii")
+        if not line:
+            # end of the header
+            break
+    return None
+
+
+def _branch(repo: GitRepo) -> str | None:
+    """Short name of the checked out branch, None on a detached HEAD."""
+    proc = repo.run("symbolic-ref", "--quiet", "--short", "HEAD", check=False)
+    return proc.stdout.decode("utf-8", "replace").strip() or None
+
+
+def _subject(repo: GitRepo, rev: str) -> str:
+    """First paragraph of the commit message on one line, like `--format=%s`."""
+    obj = repo.read_object(rev)
+    if obj is None or obj[1] != "commit":
+        raise WorkflowError(f"No commit {rev}")
+    _, _, message = obj[2].decode("utf-8", "replace").partition("\n\n")
+    return " ".join(message.strip().split("\n\n")[0].split("\n"))
+
+
+def build_unreal_steps(
+    repo: GitRepo,
+    editor=None,
+    github_repo: str | None = None,
+    message: str | Callable[[dict], str] | None = None,
+    remote: str = "origin",
+    base: str | None = None,
+    snapshot: bool = True,
+    steps: tuple[str, ...] = STEP_ORDER,
+    categories: Iterable[str] | Callable[[], Iterable[str] | None] | None = None,
+    staging: StagingPipeline | None = None,
+    large_file_size: int | None = None,
+) -> list[Step]:
+    """
+    editor: EditorSupervisor for the launch step (left out without one)
+    github_repo: "user/repo" for the PR step (left out without one)
+    message: commit message, or message(data) built from the step data
+    base: PR target branch, the repository's default branch if None
+    categories: change inspector categories to add and commit, all if None;
+                a callable is asked when the status step runs, and the choice
+                is kept in the checkpoint for a resumed run
+    large_file_size: the status step warns about binaries of at least this
+                     many bytes that no LFS pattern covers; off if None
+    """
+    staging = staging or StagingPipeline(repo)
+    detector = None
+
+    def pull(ctx: StepContext) -> dict:
+        status = repo.status()
+        snapshot_id = None
+        if snapshot and not status.clean:
+            from main.core.snapshot import SnapshotStore
+
+            info = SnapshotStore(repo).create("before workflow pull", status)
+            snapshot_id = info.id
+            ctx.log(f"Snapshot {info.id}: {len(info.untracked)} untracked files")
+        before = _head(repo)
+        _log_output(ctx, repo.run("pull", "--ff-only"))
+        return {"snapshot": snapshot_id, "head_before": before, "head": _head(repo)}
+
+    def launch(ctx: StepContext) -> dict:
+        if not editor.running:
+            editor.launch()
+            ctx.log(f"Unreal Editor started (pid {editor.pid})")
+        # wait for the user to close the editor; a cancel leaves it open
+        session = None
+        while session is None:
+            ctx.check()
+            session = editor.wait(EDITOR_POLL)
+        ctx.log(f"Unreal Editor closed after {session.duration:.0f}s")
+        return {"editor_exit": session.returncode}
+
+    def status(ctx: StepContext) -> dict:
+        status = repo.status()
+        chosen = categories() if callable(categories) else categories
+        chosen = None if chosen is None else sorted(chosen)
+        selected = staging.select(status.entries, chosen)
+        if chosen is None:
+            ctx.log(f"{len(selected)} changed files on {status.branch}")
+        else:
+            ctx.log(
+                f"{len(selected)} of {len(status.entries)} changed files on"
+                f" {status.branch} in {', '.join(chosen) or 'no category'}"
+            )
+        if large_file_size is not None:
+            warn_large_assets(ctx, selected)
+        return {"changes": len(selected), "branch": status.branch, "categories": chosen}
+
+    def warn_large_assets(ctx: StepContext, entries: list) -> None:
+        nonlocal detector
+        if detector is None:
+            from main.core.lfs import LargeAssetDetector
+
+            # same .gitattributes rules the add step stages with
+            detector = LargeAssetDetector(
+                repo.path, large_file_size, matcher=staging.lfs
+            )
+        report = detector.scan(entries)
+        for asset in report.untracked_large:
+            ctx.log(
+                f"Warning: {asset.path} ({asset.size / 2**20:.0f} MiB) is not"
+                " tracked by Git LFS"
+            )
+        if report.lfs_bytes:
+            ctx.log(
+                f"Upload estimate: {report.push_bytes / 2**20:.0f} MiB"
+                f" ({report.lfs_bytes / 2**20:.0f} MiB LFS)"
+            )
+
+    def add(ctx: StepContext) -> dict:
+        entries = staging.select(repo.status().entries, ctx.data.get("categories"))
+
+        def on_progress(progress: StageProgress) -> None:
+            if progress.phase == STAGE_ADD:
+                ctx.log(
+                    f"Staged {progress.files_done}/{progress.files_total} files"
+                    f" ({progress.bytes_done / 2**20:.0f} MiB)"
+                )
+
+        report = staging.stage(entries, on_progress, ctx.cancel_event)
+        return {"staged": report.files}
+
+    def commit(ctx: StepContext) -> dict:
+        chosen = ctx.data.get("categories")
+        paths = None
+        if chosen is None:
+            nothing = (
+                repo.run("diff", "--cached", "--quiet", check=False).returncode == 0
+            )
+        else:
+            # only the chosen categories, other staged changes stay staged
+            paths = entry_paths(staging.select(repo.status().entries, chosen))
+            nothing = not paths
+        if nothing:
+            # e.g. resumed after the commit was made but before the checkpoint
+            ctx.log("Nothing to commit, keeping HEAD")
+            return {"commit": _head(repo)}
+        text = message(ctx.data) if callable(message) else message
+        text = text or f"Unreal changes ({ctx.data.get('changes', 0)} files)"
+        ctx.expect_commit()
+        commit_id = staging.commit(text, paths)
+        ctx.log(f"Committed {commit_id[:10]}: {text}")
+        return {"commit": commit_id}
+
+    def push(ctx: StepContext) -> dict:
+        branch = ctx.data.get("branch")
+        if not branch:
+            raise WorkflowError("Cannot push a detached HEAD")
+        # the recorded commit, not HEAD: a resumed push sends what was committed
+        commit = ctx.data.get("commit") or _head(repo)
+        if commit is None:
+            raise WorkflowError("Nothing to push, the branch has no commit")
+        _log_output(
+            ctx, repo.run("push", "-u", remote, f"{commit}:refs/heads/{branch}")
+        )
+        # -u only tracks branches named as the source, not a commit id
+        repo.run("branch", f"--set-upstream-to={remote}/{branch}", branch, check=False)
+        return {"pushed": branch}
+
+    def pull_request(ctx: StepContext) -> dict:
+        from main.github_tools.pulls import create_pull_request
+
+        branch = ctx.data["pushed"]
+        url = create_pull_request(
+            github_repo,
+            head=branch,
+            base=base,
+            title=_subject(repo, ctx.data.get("commit") or "HEAD"),
+        )
+        if url is None:
+            ctx.log(f"'{branch}' is the base branch, no pull request needed")
+            return {}
+        ctx.log(f"Pull request: {url}")
+        return {"pr_url": url}
+
+    def has_changes(data: dict) -> bool:
+        return data.get("changes", 0) > 0
+
+    available = {
+        PULL: Step(PULL, pull, "Pull"),
+        LAUNCH: Step(LAUNCH, launch, "Unreal Editor"),
+        STATUS: Step(STATUS, status, "Status"),
+        ADD: Step(ADD, add, "Add", when=has_changes),
+        COMMIT: Step(COMMIT, commit, "Commit", when=has_changes),
+        PUSH: Step(PUSH, push, "Push", when=has_changes),
+        PR: Step(PR, pull_request, "Pull Request", when=lambda d: "pushed" in d),
+    }
+    if editor is None:
+        available.pop(LAUNCH)
+    if not github_repo:
+        available.pop(PR)
+    unknown = set(steps) - set(STEP_ORDER)
+    if unknown:
+        raise ValueError(f"Unknown workflow steps: {', '.join(sorted(unknown))}")
+    return [
+        available[name] for name in STEP_ORDER if name in steps and name in available
+    ]
+
+
+# ==== headless ==== #
+def main(argv: list[str] | None = None) -> int:
+    import argparse
+    import logging
+
+    parser = argparse.ArgumentParser(
+        prog="python -m main.core.workflow", description=__doc__.split("\n\n")[0]
+    )
+    parser.add_argument("--repo", default=".", help="local repository")
+    parser.add_argument("--git", default="git", help="git executable")
+    parser.add_argument(
+        "--steps",
+        default=",".join(s for s in STEP_ORDER if s != LAUNCH),
+        help="comma separated subset of " + ",".join(STEP_ORDER),
+    )
+    parser.add_argument("--message", help="commit message")
+    parser.add_argument("--github", help='"user/repo" for the pull request step')
+    parser.add_argument("--base", help="pull request target branch")
+    parser.add_argument("--remote", default="origin")
+    parser.add_argument("--no-snapshot", action="store_true")
+    parser.add_argument(
+        "--categories", help="comma separated change categories to commit, e.g. Maps"
+    )
+    parser.add_argument(
+        "--large-file-mb",
+        type=int,
+        default=50,
+        help="warn about larger binaries without LFS, 0 = off",
+    )
+    parser.add_argument("--fresh", action="store_true", help="ignore an unfinished run")
+    parser.add_argument(
+        "--metrics", action="store_true", help="print step durations and exit"
+    )
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+    metrics = StepMetrics()
+    if args.metrics:
+        for name in STEP_ORDER:
+            summary = metrics.summary(name)
+            if summary is not None:
+                print(
+                    f"{name:<8} n={summary.count} failed={summary.failures}"
+                    f" mean={summary.mean:.1f}s p50={summary.p50:.1f}s"
+                    f" p90={summary.p90:.1f}s max={summary.max:.1f}s"
+                )
+        return 0
+
+    editor = None
+    steps = tuple(filter(None, args.steps.split(",")))
+    if LAUNCH in steps:
+        from main.config import get_config_service
+        from main.core.unreal import EditorSupervisor
+
+        paths = get_config_service().get("paths", {})
+        editor = EditorSupervisor(
+            paths.get("unreal", ""), paths.get("unreal_project_file", "")
+        )
+    repo = GitRepo(args.repo, args.git)
+    try:
+        engine = WorkflowEngine(
+            build_unreal_steps(
+                repo,
+                editor=editor,
+                github_repo=args.github,
+                message=args.message,
+                remote=args.remote,
+                base=args.base,
+                snapshot=not args.no_snapshot,
+                steps=steps,
+                categories=(
+                    args.categories.split(",") if args.categories is not None else None
+                ),
+                large_file_size=args.large_file_mb * 2**20 or None,
+            ),
+            Checkpoint(default_checkpoint_path(repo)),
+            metrics,
+            repo=repo,
+        )
+        result = engine.run(resume=not args.fresh)
+    except (GitError, WorkflowError, ValueError) as e:
+        print(f"error: {e}")
+        return 2
+    finally:
+        repo.close()
+
+    for state in engine.states.values():
+        resumed = " (checkpoint)" if state.resumed else ""
+        print(f"{state.name:<8} {state.status:<8} {state.elapsed:7.2f}s{resumed}")
+    if not result.ok:
+        print(f"failed at '{result.failed_step}': {result.error}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -15,3 +15,23 @@ class MissingDotEnvFile(Exception):
 class MissingGithubToken(Exception):
     """Exception if Github Token is Missing"""
     pass
+
+class GitError(Exception):
+    """Exception if a git command fails"""
+    pass
+
+class UnrealLaunchError(Exception):
+    """Exception if the Unreal Editor cannot be started"""
+    pass
+
+class SnapshotError(Exception):
+    """Exception if a snapshot cannot be created or restored"""
+    pass
+
+class JobCancelled(Exception):
+    """Exception raised inside a background job that was cancelled"""
+    pass
+
+class WorkflowError(Exception):
+    """Exception if a workflow cannot run or a step cannot continue"""
+    pass
@@ -0,0 +1,71 @@
+"""
+Thread-safe connection classes for PyGithub.
+
+PyGithub keeps one connection object per client and stores the verb/url of the
+current request on it, so two threads using the same client overwrite each
+other. The classes below are created per request (PyGithub does this once
+connection classes are injected) and share a single pooled requests.Session,
+which keeps keep-alive connections without sharing request state.
+"""
+
+import threading
+
+import requests
+from github.Requester import (
+    HTTPRequestsConnectionClass,
+    HTTPSRequestsConnectionClass,
+    Requester,
+)
+
+POOL_SIZE = 16
+
+_SESSION_LOCK = threading.Lock()
+_SESSION: requests.Session | None = None
+
+
+def get_session() -> requests.Session:
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            session = requests.Session()
+            # see PyGithub: Session.auth != None disables the .netrc fallback
+            session.auth = Requester.noopAuth
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _SESSION = session
+        return _SESSION
+
+
+def _init_connection(cnx, host: str, port: int | None, protocol: str, **kwargs):
+    cnx.host = host
+    cnx.port = port if port else (443 if protocol == "https" else 80)
+    cnx.protocol = protocol
+    cnx.timeout = kwargs.get("timeout")
+    cnx.verify = kwargs.get("verify", True)
+    cnx.retry = kwargs.get("retry")
+    cnx.pool_size = POOL_SIZE
+    cnx.session = get_session()
+
+
+class PooledHTTPSConnection(HTTPSRequestsConnectionClass):
+    def __init__(self, host: str, port: int | None = None, **kwargs) -> None:
+        _init_connection(self, host, port, "https", **kwargs)
+
+    def close(self) -> None:
+        # the session is shared by all connections
+        pass
+
+
+class PooledHTTPConnection(HTTPRequestsConnectionClass):
+    def __init__(self, host: str, port: int | None = None, **kwargs) -> None:
+        _init_connection(self, host, port, "http", **kwargs)
+
+    def close(self) -> None:
+        pass
+
+
+def install_pooled_connections() -> None:
+    Requester.injectConnectionClasses(PooledHTTPConnection, PooledHTTPSConnection)
@@ -0,0 +1,150 @@
+"""
+Cheap commit and pull request totals.
+
+`PaginatedList.totalCount` may walk pages on big repositories. The counters
+here ask GraphQL for `totalCount`, fall back to requesting a single item per
+page and reading the last page number from the Link header, and prefer a local
+`git rev-list --count` when the repository is cloned. Local counts are cached
+per HEAD, so a refresh only counts the commits added since the last known SHA.
+"""
+
+import json
+import os
+import re
+import subprocess
+import threading
+from pathlib import Path
+from typing import Callable
+
+from github import Github, GithubException
+
+from main._template import LOGGER
+from main.appdirs import user_cache_dir
+
+COUNTS_QUERY = """
+query($owner: String!, $name: String!) {
+  repository(owner: $owner, name: $name) {
+    defaultBranchRef { target { ... on Commit { history { totalCount } } } }
+    pullRequests { totalCount }
+  }
+}
+"""
+
+LAST_PAGE_RE = re.compile(r'<[^>]*[?&]page=(\d+)[^>]*>;\s*rel="last"')
+
+# keep git from flashing a console window on Windows
+_NO_WINDOW = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+
+
+class CommitCountCache:
+    """Remembers the last counted HEAD per repository, stored as JSON."""
+
+    def __init__(self, path: Path | None = None):
+        self.path = Path(path) if path else user_cache_dir() / "commit-counts.json"
+        self._lock = threading.Lock()
+        try:
+            self._counts: dict[str, dict] = json.loads(
+                self.path.read_text(encoding="utf-8")
+            )
+        except (OSError, ValueError):
+            self._counts = {}
+
+    def count(
+        self,
+        key: str,
+        head: str,
+        full: Callable[[], int],
+        since: Callable[[str], int | None],
+    ) -> int:
+        with self._lock:
+            known = self._counts.get(key)
+
+        if known and known["sha"] == head:
+            return known["count"]
+
+        count = None
+        if known:
+            delta = since(known["sha"])
+            if delta is not None:
+                count = known["count"] + delta
+        if count is None:
+            count = full()
+
+        with self._lock:
+            self._counts[key] = {"sha": head, "count": count}
+            try:
+                self.path.write_text(json.dumps(self._counts), encoding="utf-8")
+            except OSError as e:
+                LOGGER.warning(f"Could not store commit counts: {e}")
+        return count
+
+
+def _git(git: str, repo_path: str, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [git, "-C", repo_path, *args],
+        capture_output=True,
+        text=True,
+        creationflags=_NO_WINDOW,
+    )
+
+
+def count_local_commits(
+    repo_path: str, git: str = "git", cache: CommitCountCache | None = None
+) -> int:
+    head = _git(git, repo_path, "rev-parse", "HEAD")
+    if head.returncode != 0:
+        raise RuntimeError(head.stderr.strip())
+    head_sha = head.stdout.strip()
+
+    def rev_list_count(rev: str) -> int:
+        return int(_git(git, repo_path, "rev-list", "--count", rev).stdout)
+
+    def since(known_sha: str) -> int | None:
+        # only valid while the old HEAD is still part of the history
+        ancestor = _git(
+            git, repo_path, "merge-base", "--is-ancestor", known_sha, head_sha
+        )
+        if ancestor.returncode != 0:
+            return None
+        return rev_list_count(f"{known_sha}..{head_sha}")
+
+    if cache is None:
+        return rev_list_count(head_sha)
+    key = os.path.normcase(os.path.abspath(repo_path))
+    return cache.count(key, head_sha, lambda: rev_list_count(head_sha), since)
+
+
+def count_via_link_header(client: Github, url: str, parameters: dict) -> int:
+    """Count items by requesting one per page and reading the last page number."""
+    headers, data = client.requester.requestJsonAndCheck(
+        "GET", url, parameters=dict(parameters, per_page=1)
+    )
+    match = LAST_PAGE_RE.search(headers.get("link", ""))
+    if match:
+        return int(match.group(1))
+    return len(data) if isinstance(data, list) else 0
+
+
+def count_remote(client: Github, repo_name: str) -> dict[str, int]:
+    """Commit count of the default branch and PR count (all states)."""
+    owner, name = repo_name.split("/", 1)
+    try:
+        _, data = client.requester.graphql_query(
+            COUNTS_QUERY, {"owner": owner, "name": name}
+        )
+        repository = data["data"]["repository"]
+        return {
+            "commits": repository["defaultBranchRef"]["target"]["history"][
+                "totalCount"
+            ],
+            "prs": repository["pullRequests"]["totalCount"],
+        }
+    except (GithubException, KeyError, TypeError) as e:
+        LOGGER.warning(f"GraphQL counts failed, falling back to REST: {e}")
+
+    return {
+        "commits": count_via_link_header(client, f"/repos/{repo_name}/commits", {}),
+        "prs": count_via_link_header(
+            client, f"/repos/{repo_name}/pulls", {"state": "all"}
+        ),
+    }
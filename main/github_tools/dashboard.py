@@ -1,18 +1,72 @@
-from github import Github
-from github.Commit import Commit
+import os
+import threading
+from typing import TYPE_CHECKING
 
-from main.github_tools.token import GIT_AUTH_TOKEN
+from main._template import LOGGER
+from main.github_tools.cache import CoalescingCache
+from main.github_tools.token import get_token
+
+if TYPE_CHECKING:
+    from github import Github
+    from github.Commit import Commit
+
+# PyGithub, the pooled connections and the HTTP cache are set up on the first
+# fetch (a dashboard worker thread), not when the UI imports this module
+_CLIENT_LOCK = threading.Lock()
+_CLIENT: "Github | None" = None
+_HTTP_CACHE = None
+_LOCAL_COMMIT_COUNTS = None
+
+# Repository handles are shared by all dashboard fetches and across projects
+REPO_CACHE = CoalescingCache(ttl=300.0, max_entries=16)
+# commit and PR totals come from one query, both widgets share it
+REMOTE_COUNTS = CoalescingCache(ttl=60.0, max_entries=16)
+
+
+def get_client() -> "Github":
+    global _CLIENT, _HTTP_CACHE
+    with _CLIENT_LOCK:
+        if _CLIENT is None:
+            from github import Github
+
+            from main.github_tools.connection import install_pooled_connections
+            from main.github_tools.http_cache import install_http_cache
+
+            # the dashboard fetches from several worker threads at once
+            install_pooled_connections()
+            # conditional requests against the on-disk cache, 304s are free
+            _HTTP_CACHE = install_http_cache()
+            _CLIENT = Github(get_token())
+        return _CLIENT
+
+
+def get_http_cache():
+    """The installed HTTP cache, None before the first fetch or if disabled."""
+    return _HTTP_CACHE
+
+
+def _local_commit_counts():
+    global _LOCAL_COMMIT_COUNTS
+    from main.github_tools.counts import CommitCountCache
+
+    with _CLIENT_LOCK:
+        if _LOCAL_COMMIT_COUNTS is None:
+            _LOCAL_COMMIT_COUNTS = CommitCountCache()
+        return _LOCAL_COMMIT_COUNTS
+
+
+def get_repo(repo_name: str):
+    return REPO_CACHE.get(repo_name, lambda: get_client().get_repo(repo_name))
 
-GIT_CLIENT = Github(GIT_AUTH_TOKEN)
 
 def get_last_commit(repo_name: str, branch: str = "master"):
-    repo = GIT_CLIENT.get_repo(repo_name)
+    repo = get_repo(repo_name)
     branch_ref = repo.get_branch(branch)
     return branch_ref.commit
 
 
 def get_repo_info(repo_name: str):
-    repo = GIT_CLIENT.get_repo(repo_name)
+    repo = get_repo(repo_name)
     return {
         "name": repo.name,
         "description": repo.description,
@@ -24,7 +78,7 @@ def get_repo_info(repo_name: str):
 
 
 def get_commits_since(repo_name: str, since_datetime):
-    repo = GIT_CLIENT.get_repo(repo_name)
+    repo = get_repo(repo_name)
     if since_datetime is None:
         commits = repo.get_commits()
     else:
@@ -32,29 +86,69 @@ def get_commits_since(repo_name: str, since_datetime):
     return commits
 
 
+def get_counts(repo_name: str) -> dict[str, int]:
+    from main.github_tools.counts import count_remote
+
+    return REMOTE_COUNTS.get(repo_name, lambda: count_remote(get_client(), repo_name))
+
+
+def get_commit_count(
+    repo_name: str, local_path: str | None = None, git: str = "git"
+) -> int:
+    # a local clone answers without touching the API
+    if local_path and os.path.exists(os.path.join(local_path, ".git")):
+        from main.github_tools.counts import count_local_commits
+
+        try:
+            return count_local_commits(local_path, git, _local_commit_counts())
+        except (OSError, RuntimeError, ValueError) as e:
+            LOGGER.warning(f"Local commit count failed, asking GitHub: {e}")
+    return get_counts(repo_name)["commits"]
+
+
+def get_pr_count(repo_name: str) -> int:
+    return get_counts(repo_name)["prs"]
+
+
 def get_prs(repo_name: str):
-    repo = GIT_CLIENT.get_repo(repo_name)
+    repo = get_repo(repo_name)
     prs = repo.get_pulls(state="all", sort="created", direction="desc")
     return prs.totalCount
 
 
 def get_last_release(repo_name: str):
-    repo = GIT_CLIENT.get_repo(repo_name)
+    repo = get_repo(repo_name)
     releases = repo.get_releases()
     if releases.totalCount == 0:
         return None
     return releases[0]
 
 
-def get_last_x_commits(repo_name: str, x: int = 5) -> list[Commit]:
-    repo = GIT_CLIENT.get_repo(repo_name)
+def get_last_x_commits(repo_name: str, x: int = 5) -> list["Commit"]:
+    repo = get_repo(repo_name)
     commits = repo.get_commits()
 
     # PyGithub gibt die neuesten Commits zuerst zurück!
-    commit_list: list[Commit] = []
+    commit_list: list["Commit"] = []
     for i, commit in enumerate(commits):
         if i >= x:
             break
         commit_list.append(commit)
 
     return commit_list
+
+
+def get_last_x_commit_stats(
+    repo_name: str, x: int = 5, rev: str = "HEAD"
+) -> list[dict]:
+    if x <= 0:
+        return []
+    from github import GithubException
+
+    from main.github_tools.commits import commit_stats_graphql, commit_stats_rest
+
+    try:
+        return commit_stats_graphql(get_client(), repo_name, x, rev)
+    except (GithubException, KeyError, TypeError) as e:
+        LOGGER.warning(f"GraphQL commit history failed, falling back to REST: {e}")
+        return commit_stats_rest(get_repo(repo_name), x, rev)
@@ -0,0 +1,212 @@
+"""
+Persistent HTTP response cache for the GitHub API.
+
+Successful GET responses carrying an ETag or Last-Modified header are stored in
+a SQLite file under the user cache directory. Later requests for the same URL
+are sent as conditional requests (If-None-Match / If-Modified-Since); a 304
+answer is served from disk and does not count against the GitHub rate limit.
+The store is capped in size and evicts the least recently used responses.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from main._template import LOGGER
+from main.appdirs import user_cache_dir
+from main.github_tools.connection import POOL_SIZE, get_session
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# the body is stored decoded, so transport headers must not be replayed
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+class CachedResponse:
+    def __init__(
+        self, etag: str | None, last_modified: str | None, headers: dict, body: bytes
+    ):
+        self.etag = etag
+        self.last_modified = last_modified
+        self.headers = headers
+        self.body = body
+
+
+class ResponseCache:
+    def __init__(self, path: Path | None = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = Path(path) if path else user_cache_dir() / "http-cache.sqlite3"
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, headers TEXT, "
+            "body BLOB, size INTEGER, accessed REAL)"
+        )
+        self._db.commit()
+
+    @staticmethod
+    def key_for(request: requests.PreparedRequest) -> str:
+        # Responses differ per token and media type; the token itself is never stored
+        vary = "|".join(
+            [
+                request.method or "",
+                request.url or "",
+                request.headers.get("Authorization", ""),
+                request.headers.get("Accept", ""),
+            ]
+        )
+        return hashlib.sha256(vary.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> CachedResponse | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, last_modified, headers, body FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        return CachedResponse(row[0], row[1], json.loads(row[2]), row[3])
+
+    def touch(self, key: str) -> None:
+        with self._lock:
+            self._db.execute(
+                "UPDATE responses SET accessed = ? WHERE key = ?", (time.time(), key)
+            )
+            self._db.commit()
+
+    def put(self, key: str, entry: CachedResponse) -> None:
+        size = len(entry.body)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    entry.etag,
+                    entry.last_modified,
+                    json.dumps(entry.headers),
+                    entry.body,
+                    size,
+                    time.time(),
+                ),
+            )
+            self._evict()
+            self._db.commit()
+
+    def _evict(self) -> None:
+        total = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._db.execute(
+            "SELECT key, size FROM responses ORDER BY accessed ASC"
+        ).fetchall():
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._db.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class CachingAdapter(HTTPAdapter):
+    def __init__(self, cache: ResponseCache, **kwargs):
+        super().__init__(**kwargs)
+        self.cache = cache
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        if request.method != "GET" or kwargs.get("stream"):
+            return super().send(request, **kwargs)
+
+        key = self.cache.key_for(request)
+        entry = self.cache.get(key)
+        if entry is not None:
+            if entry.etag:
+                request.headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                request.headers["If-Modified-Since"] = entry.last_modified
+
+        response = super().send(request, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            self.cache.hits += 1
+            self.cache.touch(key)
+            # keep fresh rate limit headers from the 304 on top of the stored ones
+            headers = dict(entry.headers)
+            headers.update(
+                (k, v)
+                for k, v in response.headers.items()
+                if k.lower() not in _DROPPED_HEADERS
+            )
+            response.close()
+            return self._from_cache(request, headers, entry.body)
+
+        self.cache.misses += 1
+        if response.status_code == 200:
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if etag or last_modified:
+                headers = {
+                    k: v
+                    for k, v in response.headers.items()
+                    if k.lower() not in _DROPPED_HEADERS
+                }
+                self.cache.put(
+                    key, CachedResponse(etag, last_modified, headers, response.content)
+                )
+        return response
+
+    @staticmethod
+    def _from_cache(
+        request: requests.PreparedRequest, headers: dict, body: bytes
+    ) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.headers = CaseInsensitiveDict(headers)
+        response._content = body
+        response.url = request.url or ""
+        response.request = request
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        return response
+
+
+def install_http_cache(cache: ResponseCache | None = None) -> ResponseCache | None:
+    """Mount the response cache on the shared GitHub session."""
+    try:
+        cache = cache or ResponseCache()
+    except (OSError, sqlite3.Error) as e:
+        LOGGER.warning(f"HTTP cache disabled: {e}")
+        return None
+
+    adapter = CachingAdapter(cache, pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+    session = get_session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    LOGGER.debug(f'HTTP cache at "{cache.path}" ({cache.total_bytes()} bytes)')
+    return cache
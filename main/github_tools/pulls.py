@@ -0,0 +1,35 @@
+"""
+Pull requests for the workflow's last step.
+"""
+
+from main._template import LOGGER
+from main.github_tools.dashboard import REMOTE_COUNTS, get_repo
+
+
+def create_pull_request(
+    repo_name: str,
+    head: str,
+    base: str | None = None,
+    title: str = "",
+    body: str = "",
+) -> str | None:
+    """
+    Open a PR from `head` into `base` (default branch if None) and return its
+    link. An open PR for the same branches is reused, so a resumed workflow
+    does not fail on it; None if head is the base branch.
+    """
+    repo = get_repo(repo_name)
+    base = base or repo.default_branch
+    if head == base:
+        return None
+
+    owner = repo_name.split("/")[0]
+    for pull in repo.get_pulls(state="open", head=f"{owner}:{head}", base=base):
+        LOGGER.info(f"Pull request for {head} already open: {pull.html_url}")
+        return pull.html_url
+
+    pull = repo.create_pull(base=base, head=head, title=title or head, body=body)
+    # the dashboard PR count is stale now
+    REMOTE_COUNTS.invalidate(repo_name)
+    LOGGER.info(f"Pull request created: {pull.html_url}")
+    return pull.html_url
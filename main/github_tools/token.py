@@ -1,20 +1,22 @@
-from tkinter import simpledialog
-
 from main._template import LOGGER
-from main.config import load_config, save_config
+from main.config import get_config_service
+
+
+def get_token() -> str:
+    """GitHub token from main/.env; asks for it if it is missing. Tk thread only."""
+    config_service = get_config_service()
+    token = config_service.token
+    if token:
+        return token
 
-CONFIG = load_config("main/config.json")
+    from tkinter import simpledialog
 
-GIT_AUTH_TOKEN = CONFIG.get("git", {}).get("token", None)
-if GIT_AUTH_TOKEN is None or GIT_AUTH_TOKEN == "":
     LOGGER.warning("Git authentication token is missing in configuration.")
     while True:
-        GIT_AUTH_TOKEN = simpledialog.askstring(
+        token = simpledialog.askstring(
             "Git Authentication Token", "Please enter your Git authentication token:"
         )
-        if GIT_AUTH_TOKEN:
-            CONFIG["git"]["token"] = GIT_AUTH_TOKEN
-            save_config("main/config.json", CONFIG)
-            CONFIG = load_config("main/config.json")
-            LOGGER.info("Git authentication token saved to configuration.")
-            break
+        if token:
+            # in main/.env, config.json stays free of secrets
+            config_service.set_token(token)
+            return token
@@ -1,69 +1,164 @@
-from main._template import LOGGER, TMPDIR, TMPFILE
+"""
+Application entry point.
 
-LOGGER.info("Starting UnrealGitUI application.")
+Importing this module does nothing but define functions: the Tk root, the
+config and the tabs are created by `run()`. Only the visible tab is built at
+start; every other tab imports its module and builds its content the first
+time it is selected (the terminal starts its shell only then).
+"""
 
-from tkinter import simpledialog
+import os
 
-# ==== IMPORTS ==== #
-import customtkinter as ctk
-
-from main.config import check_config, load_config, save_config
+from main._template import LOGGER, init_app
+from main.config import check_config, get_config_service
 from main.errors import ConfigError
-from main.ui.tabs.dashboard import DashboardUI
-
-# ==== IMPORT UI TABS ==== #
-from main.ui.tabs.terminal import TerminalUI
-
-# ==== CONFIGURATION ==== #
-if not check_config(["app_title", "git"]):
-    raise ConfigError("Missing required configuration keys.")
 
-CONFIG = load_config("main/config.json")
+CONFIG_WATCH_MS = 2000
+# running jobs get this long to react to the cancel when the window closes
+SHUTDOWN_TIMEOUT = 5.0
+TAB_NAMES = (
+    "Dashboard",
+    "Workflow",
+    "Git Tools",
+    "Unreal Tools",
+    "Terminal",
+    "Settings",
+)
 
 
 # ==== Global Functions ====#
 def toggle_mode(event=None):
-    if CONFIG.get("mode", "dark") == "dark":
-        ctk.set_appearance_mode("light")
-        CONFIG["mode"] = "light"
-        save_config("main/config.json", CONFIG)
-    elif CONFIG.get("mode", "dark") == "light":
-        ctk.set_appearance_mode("dark")
-        CONFIG["mode"] = "dark"
-        save_config("main/config.json", CONFIG)
-    else:
-        ctk.set_appearance_mode("light")
-        CONFIG["mode"] = "light"
-        save_config("main/config.json", CONFIG)
+    # the subscriber below switches the appearance
+    config_service = get_config_service()
+    config_service.set_value(
+        "mode", "dark" if config_service.get("mode") == "light" else "light"
+    )
 
 
-# ==== MAIN WINDOW ==== #
-rootwin = ctk.CTk()
-rootwin.title(CONFIG.get("app_title", "ERROR LOADING TITLE"))
-rootwin.geometry("800x930")
-rootwin.resizable(False, False)
-ctk.set_appearance_mode(CONFIG.get("mode", "dark"))
+def apply_mode(changed: set[str]) -> None:
+    import customtkinter as ctk
+
+    ctk.set_appearance_mode(get_config_service().get("mode", "dark"))
+
+
+def watch_config(rootwin) -> None:
+    # picks up edits of config.json on disk (one stat per call)
+    get_config_service().load()
+    rootwin.after(CONFIG_WATCH_MS, watch_config, rootwin)
+
+
+def close_app(rootwin) -> None:
+    from main.core.jobs import get_scheduler
+
+    LOGGER.info("Closing UnrealGitUI application.")
+    # all background work runs there: refreshes, checks, editor wait, pty reader
+    get_scheduler().shutdown(timeout=SHUTDOWN_TIMEOUT)
+    rootwin.destroy()
+
+
+# ==== TABS CONTENT ==== #
+def build_dashboard(master, config: dict):
+    from main.ui.tabs.dashboard import DashboardUI
+
+    return DashboardUI(master)
+
+
+def build_workflow(master, config: dict):
+    from main.ui.tabs.workflow import WorkflowUI
+
+    return WorkflowUI(master, config)
+
 
-tabs = ctk.CTkTabview(rootwin)
-tabs.pack(expand=True, fill="both", padx=20, pady=20)
+def build_unreal_tools(master, config: dict):
+    from main.ui.tabs.unreal_tools import UnrealToolsUI
 
-dashboard_tab: ctk.CTkFrame = tabs.add("Dashboard")
-workflow_tab: ctk.CTkFrame = tabs.add("Workflow")
-git_tools_tab: ctk.CTkFrame = tabs.add("Git Tools")
-unreal_tools_tab: ctk.CTkFrame = tabs.add("Unreal Tools")
-terminal_tab: ctk.CTkFrame = tabs.add("Terminal")
-settings_tab: ctk.CTkFrame = tabs.add("Settings")
+    return UnrealToolsUI(
+        master,
+        project_dir=os.path.dirname(
+            config.get("paths", {}).get("unreal_project_file", "")
+        ),
+        clean_config=config.get("clean", {}),
+    )
 
-# ==== ADD TABS CONTENT ==== #
-dashboard_ui: DashboardUI = DashboardUI(dashboard_tab)
-dashboard_ui.pack(expand=True, fill="both")
 
-terminal_ui: TerminalUI = TerminalUI(terminal_tab)
-terminal_ui.pack(expand=True, fill="both")
+def build_terminal(master, config: dict):
+    from main.ui.tabs.terminal import TerminalUI
 
-# ==== Keybinds ====#
-rootwin.bind_all("<Control-Shift-Alt-m>", lambda event: toggle_mode())
+    return TerminalUI(
+        master,
+        scrollback_lines=config.get("terminal", {}).get("scrollback_lines", 10000),
+        overflow=config.get("terminal", {}).get("overflow", "drop"),
+    )
 
 
+TAB_BUILDERS = {
+    "Dashboard": build_dashboard,
+    "Workflow": build_workflow,
+    "Unreal Tools": build_unreal_tools,
+    "Terminal": build_terminal,
+}
+
+
+class LazyTabs:
+    """Builds the content of a tab the first time it is shown."""
+
+    def __init__(self, tabview, config: dict, builders: dict = TAB_BUILDERS):
+        self.tabview = tabview
+        self.config = config
+        self.builders = builders
+        self.built: dict[str, object] = {}
+
+    def on_select(self) -> None:
+        self.build(self.tabview.get())
+
+    def build(self, name: str):
+        if name in self.built or name not in self.builders:
+            return self.built.get(name)
+        LOGGER.info(f"Building tab '{name}'")
+        content = self.builders[name](self.tabview.tab(name), self.config)
+        content.pack(expand=True, fill="both")
+        self.built[name] = content
+        return content
+
+
+# ==== MAIN WINDOW ==== #
 def run() -> None:
+    init_app()
+    LOGGER.info("Starting UnrealGitUI application.")
+
+    import customtkinter as ctk
+
+    from main.core.jobs import get_scheduler
+
+    if not check_config(["app_title", "git"]):
+        raise ConfigError("Missing required configuration keys.")
+    config_service = get_config_service()
+    config = config_service.load()
+
+    rootwin = ctk.CTk()
+    rootwin.title(config.get("app_title", "ERROR LOADING TITLE"))
+    rootwin.geometry("800x930")
+    rootwin.resizable(False, False)
+    ctk.set_appearance_mode(config.get("mode", "dark"))
+
+    tabs = ctk.CTkTabview(rootwin)
+    tabs.pack(expand=True, fill="both", padx=20, pady=20)
+    lazy_tabs = LazyTabs(tabs, config)
+    tabs.configure(command=lazy_tabs.on_select)
+    for name in TAB_NAMES:
+        tabs.add(name)
+    lazy_tabs.on_select()
+
+    # ==== Keybinds ====#
+    rootwin.bind_all("<Control-Shift-Alt-m>", lambda event: toggle_mode())
+
+    # ==== Config changes ====#
+    config_service.subscribe(apply_mode, "mode")
+    rootwin.after(CONFIG_WATCH_MS, watch_config, rootwin)
+
+    # ==== Background jobs ====#
+    # one dispatcher delivers progress/results of all jobs on the Tk thread
+    get_scheduler().attach(rootwin)
+    rootwin.protocol("WM_DELETE_WINDOW", lambda: close_app(rootwin))
+
     rootwin.mainloop()
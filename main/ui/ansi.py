@@ -0,0 +1,349 @@
+# ui/ansi.py
+"""
+Streaming ANSI parser for terminal output.
+
+Single pass over each chunk: one compiled pattern finds every escape sequence,
+the text between them is copied in slices. A sequence cut off at the end of a
+chunk is kept until the next `feed()` call, so a sequence split across two PTY
+reads is never shown as text. SGR sequences update the current tags; OSC and other CSI
+sequences are dropped. Adjacent text with the same tags is returned as one run.
+"""
+
+import re
+
+# Map common SGR color codes to tkinter tag names / colors (basic)
+SGR_COLOR_MAP = {
+    30: ("fg_black", "#000000"),
+    31: ("fg_red", "#ff5555"),
+    32: ("fg_green", "#50fa7b"),
+    33: ("fg_yellow", "#f1fa8c"),
+    34: ("fg_blue", "#6272a4"),
+    35: ("fg_magenta", "#ff79c6"),
+    36: ("fg_cyan", "#8be9fd"),
+    37: ("fg_white", "#f8f8f2"),
+    90: ("fg_bright_black", "#44475a"),
+    91: ("fg_bright_red", "#ff6e6e"),
+    92: ("fg_bright_green", "#69ff94"),
+    93: ("fg_bright_yellow", "#ffffa5"),
+    94: ("fg_bright_blue", "#caa9ff"),
+    95: ("fg_bright_magenta", "#ff92df"),
+    96: ("fg_bright_cyan", "#9aedfe"),
+    97: ("fg_bright_white", "#ffffff"),
+}
+
+# Background codes are the foreground codes + 10 and share the palette
+SGR_BG_COLOR_MAP = {
+    code + 10: ("bg" + tagname[2:], hexcol)
+    for code, (tagname, hexcol) in SGR_COLOR_MAP.items()
+}
+
+# Basic attributes
+ATTR_RESET = 0
+ATTR_BOLD = 1
+ATTR_ITALIC = 3  # rarely supported in terminals
+ATTR_UNDERLINE = 4
+ATTR_NORMAL_INTENSITY = 22
+ATTR_NO_ITALIC = 23
+ATTR_NO_UNDERLINE = 24
+
+_BASIC_PALETTE = [hexcol for _, hexcol in SGR_COLOR_MAP.values()]
+_CUBE_STEPS = (0, 95, 135, 175, 215, 255)
+
+
+def xterm_256_color(index: int) -> str:
+    """Hex color of an xterm 256-color palette entry."""
+    if index < 16:
+        return _BASIC_PALETTE[index]
+    if index < 232:
+        index -= 16
+        r, g, b = index // 36, (index // 6) % 6, index % 6
+        return "#{:02x}{:02x}{:02x}".format(
+            _CUBE_STEPS[r], _CUBE_STEPS[g], _CUBE_STEPS[b]
+        )
+    level = 8 + (index - 232) * 10
+    return "#{0:02x}{0:02x}{0:02x}".format(level)
+
+
+_TAG_COLORS = {
+    tagname: hexcol
+    for tagname, hexcol in list(SGR_COLOR_MAP.values())
+    + list(SGR_BG_COLOR_MAP.values())
+}
+
+
+def tag_options(tag: str) -> dict:
+    """tkinter tag_config options for a tag produced by AnsiTextParser."""
+    if tag == "attr_underline":
+        return {"underline": True}
+    if tag.startswith("attr_"):
+        return {}
+
+    option = "foreground" if tag.startswith("fg_") else "background"
+    color = _TAG_COLORS.get(tag)
+    if color is None:
+        value = tag[3:]
+        if value.startswith("#"):
+            color = value
+        elif value.startswith("256_"):
+            color = xterm_256_color(int(value[4:]))
+        else:
+            return {}
+    return {option: color}
+
+
+# One pass over the chunk: every escape sequence we understand, group 1 holds
+# the SGR parameters when the sequence is a color/attribute change.
+ESCAPE_RE = re.compile(
+    r"\x1b(?:"
+    r"\[([0-9;:]*)m"  # SGR
+    r"|\[[0-?]*[ -/]*[@-~]"  # other CSI: cursor moves, erase, ...
+    r"|[\]P_^X][^\x07\x1b]*(?:\x07|\x1b\\)"  # OSC / DCS / APC strings
+    r"|[()*+]."  # charset designation
+    r"|[ -~]"  # two-byte sequences like ESC = or ESC 7
+    r")"
+)
+# What a sequence cut off at the end of a chunk can look like
+PARTIAL_ESCAPE_RE = re.compile(
+    r"\x1b(?:\[[0-?]*[ -/]*|[\]P_^X][^\x07\x1b]*\x1b?|[()*+])?"
+)
+# unterminated OSC strings longer than this are dropped instead of buffered
+MAX_PARTIAL = 4096
+
+_ESC_CHAR = "\x1b"
+
+
+def _to_int(value: str) -> int:
+    try:
+        return int(value) if value else 0
+    except ValueError:
+        return 0
+
+
+# (fg, bg, bold, italic, underline) -> tags
+Attrs = tuple[str | None, str | None, bool, bool, bool]
+_DEFAULT_ATTRS: Attrs = (None, None, False, False, False)
+
+
+def _tags_for(attrs: Attrs) -> tuple[str, ...]:
+    fg, bg, bold, italic, underline = attrs
+    tags = []
+    if fg:
+        tags.append(fg)
+    if bg:
+        tags.append(bg)
+    if bold:
+        tags.append("attr_bold")
+    if italic:
+        tags.append("attr_italic")
+    if underline:
+        tags.append("attr_underline")
+    return tuple(tags)
+
+
+# at most this many attribute combinations are cached per parser (truecolor
+# output could otherwise grow it without bound)
+MAX_STATES = 4096
+
+
+class _SgrState:
+    """One attribute combination, its tags and the SGR transitions seen from it."""
+
+    __slots__ = ("attrs", "tags", "transitions")
+
+    def __init__(self, attrs: Attrs):
+        self.attrs = attrs
+        self.tags = _tags_for(attrs)
+        # SGR params -> next state; build logs repeat the same few
+        self.transitions: dict[str, "_SgrState"] = {}
+
+
+def _rgb_value(rgb: list[str]) -> str:
+    r, g, b = (min(_to_int(c), 255) for c in rgb)
+    return "#{:02x}{:02x}{:02x}".format(r, g, b)
+
+
+def apply_sgr(attrs: Attrs, params: str) -> Attrs:
+    """Return the attributes after applying one SGR parameter string."""
+    fg, bg, bold, italic, underline = attrs
+    groups = params.split(";") if params else ["0"]
+    i = 0
+    n = len(groups)
+    while i < n:
+        group = groups[i]
+        i += 1
+
+        if ":" in group:
+            # colon form: 38:5:n / 38:2::r:g:b / 4:0
+            sub = group.split(":")
+            code = _to_int(sub[0])
+            value = None
+            if len(sub) >= 3 and sub[1] == "5":
+                value = f"256_{_to_int(sub[2]) & 0xFF}"
+            elif len(sub) >= 5 and sub[1] == "2":
+                value = _rgb_value(sub[-3:])
+            if code == 38 and value:
+                fg = "fg_" + value
+            elif code == 48 and value:
+                bg = "bg_" + value
+            elif code == ATTR_UNDERLINE:
+                underline = sub[1:2] != ["0"]
+            continue
+
+        code = _to_int(group)
+        if code == ATTR_RESET:
+            fg, bg, bold, italic, underline = _DEFAULT_ATTRS
+        elif code in SGR_COLOR_MAP:
+            fg = SGR_COLOR_MAP[code][0]
+        elif code in SGR_BG_COLOR_MAP:
+            bg = SGR_BG_COLOR_MAP[code][0]
+        elif code == ATTR_BOLD:
+            bold = True
+        elif code == ATTR_ITALIC:
+            italic = True
+        elif code == ATTR_UNDERLINE:
+            underline = True
+        elif code == ATTR_NORMAL_INTENSITY:
+            bold = False
+        elif code == ATTR_NO_ITALIC:
+            italic = False
+        elif code == ATTR_NO_UNDERLINE:
+            underline = False
+        elif code == 39:
+            fg = None
+        elif code == 49:
+            bg = None
+        elif code in (38, 48) and i < n:
+            mode = groups[i]
+            value = None
+            if mode == "5" and i + 1 < n:
+                value = f"256_{_to_int(groups[i + 1]) & 0xFF}"
+                i += 2
+            elif mode == "2" and i + 3 < n:
+                value = _rgb_value(groups[i + 1 : i + 4])
+                i += 4
+            else:
+                i += 1
+            if value and code == 38:
+                fg = "fg_" + value
+            elif value:
+                bg = "bg_" + value
+
+    return (fg, bg, bold, italic, underline)
+
+
+class AnsiTextParser:
+    """
+    Incremental ANSI parser that returns [(text, tags), ...] per chunk.
+    Not a full terminal emulator — enough for colored prompts and build output.
+    """
+
+    def __init__(self):
+        self._partial = ""
+        self._states: dict[Attrs, _SgrState] = {}
+        self.reset_state()
+
+    def reset_state(self):
+        self._state = self._state_for(_DEFAULT_ATTRS)
+
+    @property
+    def attrs(self) -> Attrs:
+        return self._state.attrs
+
+    @property
+    def tags(self) -> tuple[str, ...]:
+        return self._state.tags
+
+    def _state_for(self, attrs: Attrs) -> _SgrState:
+        state = self._states.get(attrs)
+        if state is None:
+            state = _SgrState(attrs)
+            if len(self._states) < MAX_STATES:
+                self._states[attrs] = state
+        return state
+
+    def _apply(self, state: _SgrState, params: str) -> _SgrState:
+        new_state = self._state_for(apply_sgr(state.attrs, params))
+        if len(state.transitions) < MAX_STATES:
+            state.transitions[params] = new_state
+        return new_state
+
+    def _split_partial(self, text: str) -> str:
+        """Cut off and keep an escape sequence that continues in the next chunk."""
+        tail = text.rfind(_ESC_CHAR)
+        if tail < 0 or len(text) - tail > MAX_PARTIAL:
+            return text
+        # the usual case: the last sequence is complete
+        if not PARTIAL_ESCAPE_RE.fullmatch(text, tail):
+            return text
+        # ESC inside an unterminated OSC string: keep from the OSC start
+        # (only possible when that ESC is the last character)
+        prev = text.rfind(_ESC_CHAR, 0, tail)
+        if prev >= 0 and PARTIAL_ESCAPE_RE.fullmatch(text, prev):
+            tail = prev
+        self._partial = text[tail:]
+        return text[:tail]
+
+    def feed(self, text: str) -> list[tuple[str, tuple[str, ...]]]:
+        if self._partial:
+            text = self._partial + text
+            self._partial = ""
+
+        runs: list[tuple[str, tuple[str, ...]]] = []
+        state = self._state
+        if _ESC_CHAR not in text:
+            # plain text: no regex at all
+            if text:
+                runs.append((text, state.tags))
+            return runs
+
+        # parts = [text, sgr params or None, text, sgr params or None, text, ...]
+        parts = iter(ESCAPE_RE.split(self._split_partial(text)))
+        append = runs.append
+        pending_tags = state.tags
+        pending = next(parts)
+
+        for params, piece in zip(parts, parts):
+            if params is not None:
+                # one str-keyed dict lookup per SGR once the transition is known
+                state = state.transitions.get(params) or self._apply(state, params)
+
+            if piece:
+                # states are cached, so are their tag tuples: identity is enough
+                if state.tags is pending_tags:
+                    pending += piece
+                else:
+                    if pending:
+                        append((pending, pending_tags))
+                    pending = piece
+                    pending_tags = state.tags
+
+        if pending:
+            append((pending, pending_tags))
+        self._state = state
+        return runs
+
+        # parts = [text, sgr params or None, text, sgr params or None, text, ...]
+        parts = iter(ESCAPE_RE.split(self._split_partial(text)))
+        state = self._state
+        pending_tags = state.tags
+        first = next(parts)
+        pending: list[str] = [first] if first else []
+
+        for params, piece in zip(parts, parts):
+            if params is not None:
+                # one str-keyed dict lookup per SGR once the transition is known
+                state = state.transitions.get(params) or self._apply(state, params)
+
+            if piece:
+                # states are cached, so are their tag tuples: identity is enough
+                if state.tags is not pending_tags:
+                    if pending:
+                        runs.append(("".join(pending), pending_tags))
+                        pending = []
+                    pending_tags = state.tags
+                pending.append(piece)
+
+        if pending:
+            runs.append(("".join(pending), pending_tags))
+        self._state = state
+        return runs
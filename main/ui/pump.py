@@ -0,0 +1,190 @@
+# ui/pump.py
+"""
+Output pump between a reader thread and the Tk loop.
+
+The reader `post()`s chunks from its thread. The pump only schedules itself
+when there is something to do, handles chunks in the Tk thread until the frame
+budget (time or characters) is spent, and picks up the rest on the next frame.
+When more than `max_pending` characters pile up, either the oldest chunks are
+dropped and reported once as "N lines skipped" (overflow="drop"), or `full`
+tells the producer to stop reading until `on_drain` (overflow="block"). `post()`
+itself never waits: the producer is the reader thread shared by all terminal
+sessions. A producer that keeps posting past twice the limit loses the oldest
+chunks like in "drop".
+
+A paused pump (hidden terminal tab) keeps collecting chunks under the same
+limit but renders nothing until `resume()`.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable
+
+OVERFLOW_MODES = ("drop", "block")
+# "block": hard limit, as a multiple of max_pending, for producers that do not stop
+BLOCK_HARD_LIMIT = 2
+
+
+class OutputPump:
+    def __init__(
+        self,
+        schedule: Callable[[int, Callable[[], None]], Any],
+        handler: Callable[[str], None],
+        on_skipped: Callable[[int], None] | None = None,
+        on_frame: Callable[[], None] | None = None,
+        on_drain: Callable[[], None] | None = None,
+        budget_ms: float = 8.0,
+        frame_ms: int = 16,
+        max_frame_chars: int = 64 * 1024,
+        max_pending: int = 4 * 1024 * 1024,
+        overflow: str = "drop",
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        """
+        schedule(delay_ms, callback): Tk's `after`
+        handler(chunk): consumes one chunk in the Tk thread
+        on_skipped(lines): called in the Tk thread after chunks were dropped
+        on_frame(): called at the end of every pump run, e.g. to flush a widget
+        on_drain(): called in the Tk thread when a full pump got back below half
+        """
+        if overflow not in OVERFLOW_MODES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_MODES}")
+        self._schedule = schedule
+        self._handler = handler
+        self._on_skipped = on_skipped
+        self._on_frame = on_frame
+        self._on_drain = on_drain
+        self.budget = budget_ms / 1000.0
+        self.frame_ms = frame_ms
+        # the widget insert after the handlers is not timed, so cap its size too
+        self.max_frame_chars = max_frame_chars
+        self.max_pending = max_pending
+        self.overflow = overflow
+        self._clock = clock
+
+        self._chunks: deque[str] = deque()
+        self._pending_chars = 0
+        self._skipped_lines = 0
+        self._scheduled = False
+        self._paused = False
+        self._was_full = False
+        self._closed = False
+        self._lock = threading.Lock()
+        self.stats = {"posted": 0, "handled": 0, "frames": 0, "skipped_lines": 0}
+
+    @property
+    def pending(self) -> int:
+        """Characters waiting to be handled."""
+        with self._lock:
+            return self._pending_chars
+
+    @property
+    def full(self) -> bool:
+        with self._lock:
+            return self._pending_chars >= self.max_pending
+
+    @property
+    def paused(self) -> bool:
+        return self._paused
+
+    def pause(self) -> None:
+        """Keep queueing but stop rendering, e.g. while the tab is hidden."""
+        with self._lock:
+            self._paused = True
+
+    def resume(self) -> None:
+        with self._lock:
+            self._paused = False
+            if self._scheduled or not (self._chunks or self._skipped_lines):
+                return
+            self._scheduled = True
+        self._schedule(0, self.run)
+
+    def post(self, chunk: str) -> None:
+        """Queue a chunk. Safe to call from any thread."""
+        if not chunk:
+            return
+        with self._lock:
+            if self._closed:
+                return
+
+            self._chunks.append(chunk)
+            self._pending_chars += len(chunk)
+            self.stats["posted"] += 1
+            limit = self.max_pending
+            if self.overflow == "block":
+                # backpressure is the producer's job (it checks `full`), waiting
+                # here would stall every session on the shared reader thread
+                limit *= BLOCK_HARD_LIMIT
+            if self._pending_chars > limit:
+                self._drop_oldest()
+            if self._pending_chars >= self.max_pending:
+                self._was_full = True
+
+            if self._scheduled or self._paused:
+                return
+            self._scheduled = True
+        self._schedule(0, self.run)
+
+    def _drop_oldest(self) -> None:
+        # keep the newest half, the tail of a build log is what matters
+        keep = self.max_pending // 2
+        while self._chunks and self._pending_chars > keep:
+            chunk = self._chunks.popleft()
+            self._pending_chars -= len(chunk)
+            self._skipped_lines += chunk.count("\n")
+
+    def run(self) -> None:
+        """Handle queued chunks for at most one frame budget. Runs in the Tk thread."""
+        deadline = self._clock() + self.budget
+        handled = 0
+        chars = 0
+        with self._lock:
+            if self._paused:
+                self._scheduled = False
+                return
+            skipped, self._skipped_lines = self._skipped_lines, 0
+        if skipped:
+            self.stats["skipped_lines"] += skipped
+            if self._on_skipped is not None:
+                self._on_skipped(skipped)
+
+        while True:
+            with self._lock:
+                if not self._chunks or self._closed or self._paused:
+                    self._scheduled = False
+                    more = False
+                    break
+                chunk = self._chunks.popleft()
+                self._pending_chars -= len(chunk)
+
+            self._handler(chunk)
+            handled += 1
+            chars += len(chunk)
+            if chars >= self.max_frame_chars or self._clock() >= deadline:
+                with self._lock:
+                    more = bool(self._chunks) and not (self._closed or self._paused)
+                    self._scheduled = more
+                break
+
+        self.stats["handled"] += handled
+        self.stats["frames"] += 1
+        if self._on_frame is not None:
+            self._on_frame()
+        with self._lock:
+            drained = self._was_full and self._pending_chars < self.max_pending // 2
+            if drained:
+                self._was_full = False
+        if drained and self._on_drain is not None:
+            self._on_drain()
+        if more:
+            # leftovers go to the next frame so Tk can redraw and handle input
+            self._schedule(self.frame_ms, self.run)
+
+    def close(self) -> None:
+        """Drop everything queued; later posts are ignored."""
+        with self._lock:
+            self._closed = True
+            self._chunks.clear()
+            self._pending_chars = 0
@@ -1,30 +1,109 @@
+import logging
 import os
-import threading
 import time
+from typing import TYPE_CHECKING
 
 import customtkinter as ctk
 from CTkTable import CTkTable
-from github.GitRelease import GitRelease
 
-from main._template import LOGGER
-from main.config import load_config
+from main._template import LOGGER, log_buffer
+from main.config import get_config_service
+from main.core.changes import ChangeIndex, touched_paths
+from main.core.git import GitRepo, GitStatus, StatusWorker
+from main.core.jobs import get_scheduler
+from main.core.lfs import LargeAssetDetector
+from main.core.prelaunch import (
+    FAILED,
+    FETCH_INTERVAL,
+    OK,
+    PENDING,
+    RUNNING,
+    SKIPPED,
+    CheckPipeline,
+    build_prelaunch_checks,
+)
+from main.core.projects import (
+    Project,
+    ProjectRegistry,
+    WidgetResult,
+    projects_from_config,
+)
+from main.core.unreal import EditorSession, EditorSupervisor
 from main.ctk_external_modules.CTkCollapsibleFrame import CTkCollapsiblePanel
+from main.errors import UnrealLaunchError
+from main.github_tools.commits import changed_files_text
 from main.github_tools.dashboard import (
-    get_commits_since,
-    get_last_commit,
+    REPO_CACHE,
+    get_commit_count,
+    get_http_cache,
     get_last_release,
-    get_last_x_commits,
-    get_prs,
+    get_last_x_commit_stats,
+    get_pr_count,
     get_repo_info,
 )
+from main.github_tools.token import get_token
+from main.ui.widgets.scrollback import ScrollbackTextbox
+
+if TYPE_CHECKING:
+    from github.GitRelease import GitRelease
+
+SKELETON = "…"
+ERROR_TEXT = "Error"
+
+REPO_INFO_KEYS = [
+    "name",
+    "description",
+    "stars",
+    "forks",
+    "open_issues",
+    "default_branch",
+]
+# row key -> label, in display order
+STATUS_ROWS: dict[str, str] = {
+    key: key.replace("_", " ").capitalize()
+    for key in REPO_INFO_KEYS + ["commits", "prs", "last_release", "local_status"]
+}
+STATUS_INDEX: dict[str, int] = {key: i for i, key in enumerate(STATUS_ROWS)}
+
+COMMIT_TABLE_HEADER = ["SHA", "Add", "Del", "Total"]
+
+PRELAUNCH_HEADER = ["Check", "Status", "Dauer"]
+PRELAUNCH_STATUS_TEXT = {
+    PENDING: SKELETON,
+    RUNNING: "Running…",
+    OK: "OK",
+    FAILED: "Failed",
+    SKIPPED: "Skipped",
+}
+
+DETAILS_ROWS = [
+    "SHA",
+    "Kurze Nachricht",
+    "Ausführliche Nachricht",
+    "Autor",
+    "Autor Email",
+    "Datum",
+    "Dateien geändert",
+]
+
 
-CONFIG = load_config("main/config.json")
+def _release_name(last_release: "GitRelease | None") -> str:
+    return str(last_release) if last_release else "N/A"
+
+
+def _local_status(status: GitStatus) -> str:
+    changes = sum(1 for e in status.entries if e.kind != "ignored")
+    text = f"{status.branch or 'detached'}, {changes} changes"
+    if status.upstream:
+        text += f", {status.ahead} ahead / {status.behind} behind"
+    return text
 
 
 class DashboardUI(ctk.CTkFrame):
     def __init__(self, master, **kwargs):
         super().__init__(master, **kwargs)
         LOGGER.info("Initializing Dashboard UI components.")
+        self._config = get_config_service().load()
 
         # Obere Frames nebeneinander
         self.status_frame = ctk.CTkFrame(self)
@@ -62,14 +141,14 @@ class DashboardUI(ctk.CTkFrame):
         )
 
         # Scrollbar + Textbox (schwarzer Hintergrund)
-        self.log_textbox = ctk.CTkTextbox(
+        self.log_textbox = ScrollbackTextbox(
             logs_collapsible._content_frame,
+            max_lines=self._config.get("dashboard", {}).get("log_lines", 2000),
             width=700,
             height=300,
             corner_radius=5,
             fg_color="#1e1e1e",  # dunkelgrau/schwarz
             text_color="white",
-            state="disabled",
         )
         self.log_textbox.pack(
             side="left", fill="both", expand=True, padx=(0, 0), pady=(0, 0)
@@ -91,148 +170,414 @@ class DashboardUI(ctk.CTkFrame):
         self.grid_columnconfigure(0, weight=1)
         self.grid_columnconfigure(1, weight=1)
 
-        self._stop_log_thread = False
-        threading.Thread(target=self.update_logs_loop, daemon=True).start()
+        # records come straight from the in-memory log handler
+        log_level: str = self._config.get("dashboard", {}).get("log_level", "DEBUG")
+        level = logging.getLevelName(str(log_level).upper())
+        if not isinstance(level, int):
+            # getLevelName() answers unknown names with "Level X"
+            LOGGER.warning(f"Unknown dashboard log_level '{log_level}', using INFO")
+            level = logging.INFO
+        self._unsubscribe_logs = log_buffer.subscribe(
+            lambda line: self.insert_log(line + "\n"), level=level
+        )
         LOGGER.info("Dashboard UI components initialized successfully.")
 
+        # set in load_data(), which may fail (e.g. no token); destroy() runs anyway
+        self._projects: ProjectRegistry | None = None
+        self._status_workers: dict[str, StatusWorker] = {}
+        self._prelaunch: CheckPipeline | None = None
         self.load_data()
 
     def insert_log(self, message: str) -> None:
-        self.log_textbox.after(0, self._insert_log_ui, message)
-
-    def _insert_log_ui(self, message: str):
-        self.log_textbox.configure(state="normal")
-        self.log_textbox.insert("end", message + "\n")
-        self.log_textbox.configure(state="disabled")
-        self.log_textbox.see("end")
-
-    def find_latest_log(self):
-        files: list[str] = os.listdir("logs/")
-        files: list[str] = [
-            os.path.join("logs/", f) for f in files if f.endswith(".log")
-        ]
-        if not files:
-            return None
-        files.sort(key=os.path.getmtime, reverse=True)
-        return files[0]
-
-    # ========== Log-Update-Loop ==========
-    def update_logs_loop(self):
-        last_size = 0
-        latest_file = None
-        while not self._stop_log_thread:
-            try:
-                file_path = self.find_latest_log()
-                if file_path != latest_file:
-                    latest_file = file_path
-                    last_size = 0
-                    self.log_textbox.delete("1.0", "end")
-                if latest_file:
-                    with open(latest_file, "r", encoding="utf-8") as f:
-                        f.seek(last_size)
-                        new_content = f.read()
-                        if new_content:
-                            self.insert_log(new_content)
-                        last_size = f.tell()
-            except Exception as e:
-                LOGGER.error(f"Error reading log: {e}")
-            time.sleep(1)
+        self.log_textbox.append(message)
+
+    def destroy(self):
+        self._unsubscribe_logs()
+        if self._projects is not None:
+            self._projects.stop()
+        if self._prelaunch is not None:
+            self._prelaunch.cancel()
+        for worker in self._status_workers.values():
+            worker.stop()
+            worker.repo.close()
+        super().destroy()
 
     def load_data(self):
         LOGGER.info("Loading dashboard data...")
+        # may ask for the token, which has to happen on the Tk thread
+        get_token()
 
-        REPO = "{}/{}".format(CONFIG["git"]["user"], CONFIG["git"]["repo"])
+        self._last_commits: int = self._config.get("dashboard", {}).get(
+            "last_commits", 5
+        )
+        self._paths: dict = self._config.get("paths", {})
+        self._git_exe: str = (
+            self._paths.get("git")
+            if os.path.exists(self._paths.get("git", ""))
+            else "git"
+        )
+        last_commits = self._last_commits
+
+        # ========== Projects ==========
+        # every project keeps its last results; a switch shows them at once
+        # one change index per project, updated from its status worker only
+        self._change_indexes: dict[str, ChangeIndex] = {}
+        # mtime per changed path at the last status, to re-size files saved again
+        self._change_mtimes: dict[str, dict[str, int]] = {}
+        self._log_changes_of: set[str] = set()
+        self._projects = ProjectRegistry(
+            projects_from_config(self._config),
+            self._project_tasks,
+            interval=self._config.get("dashboard", {}).get("refresh_interval", 300),
+        )
+        self.project_menu = ctk.CTkOptionMenu(
+            self.status_frame,
+            values=self._projects.names,
+            command=self.switch_project,
+        )
+        self.project_menu.pack(fill="x", padx=5, pady=(5, 0))
 
-        # Status Frame
-        status_data: dict[str, str | int] = get_repo_info(REPO)
-        status_data['commits'] = get_commits_since(REPO, since_datetime=None).totalCount
-        status_data['prs'] = get_prs(REPO)
-        last_release: None | GitRelease = get_last_release(REPO)
-        status_data["last_release"] = str(last_release) if last_release else "N/A"
-        LOGGER.debug("Status Data: {}".format(status_data))
-        
         # ========== Status Table ==========
-        status_data_values: list[list[str]] = []
-        for key, value in status_data.items():
-            status_data_values.append([key.replace("_", " ").capitalize(), str(value)])
-        
-        status_table = CTkTable(
-            self.status_frame, 
-            values=status_data_values, 
-            row= len(status_data_values), 
+        # Skeletons first, every table gets filled once its own data arrives
+        self.status_table = CTkTable(
+            self.status_frame,
+            values=[[label, SKELETON] for label in STATUS_ROWS.values()],
+            row=len(STATUS_ROWS),
             column=2,  # 2 Spalten: Name und Wert
-            width=400
+            width=400,
         )
-        status_table.pack(fill="both", padx=5, pady=5, expand=True)
-        
+        self.status_table.pack(fill="both", padx=5, pady=5, expand=True)
+
         # ========== Last 5 Commits Table ==========
-        last_five_commits = get_last_x_commits(REPO, CONFIG.get("dashboard", {}).get("last_commits", 5))
-        table_data: list[list[str]] = [["SHA", "Add", "Del", "Total"]]
-        for c in last_five_commits:
-            table_data.append([str(c.sha[:10]) + "...", str(c.stats.additions), str(c.stats.deletions), str(c.stats.total)])
-        
-        commit_table_label = ctk.CTkLabel(self.commit_table_frame, text=f"Last {len(last_five_commits)} Commits", font=("", 14))
-        commit_table_label.pack(pady=10)
-        
-        commit_table = CTkTable(
-            self.commit_table_frame, 
-            values=table_data, 
-            row=len(table_data), 
-            column=len(table_data[0]), 
-            width=300
-        )
-        commit_table.pack(fill="both", padx=5, pady=5, expand=True)
-        
+        self.commit_table_label = ctk.CTkLabel(
+            self.commit_table_frame, text=f"Last {last_commits} Commits", font=("", 14)
+        )
+        self.commit_table_label.pack(pady=10)
+
+        self.commit_table = CTkTable(
+            self.commit_table_frame,
+            values=self._commit_skeleton(),
+            row=last_commits + 1,
+            column=len(COMMIT_TABLE_HEADER),
+            width=300,
+        )
+        self.commit_table.pack(fill="both", padx=5, pady=5, expand=True)
+
         # ========== Last Commit Details ==========
-        last_commit = get_last_commit(REPO)
-        if last_commit:
-            details_data = [
-                ["SHA", last_commit.sha],
-                ["Kurze Nachricht", last_commit.commit.message.splitlines()[0]],
-                ["Ausführliche Nachricht", last_commit.commit.message],
-                ["Autor", last_commit.commit.author.name],
-                ["Autor Email", last_commit.commit.author.email],
-                ["Datum", str(last_commit.commit.author.date)],
-                ["Dateien geändert", len([f.filename for f in last_commit.files])]
-            ]
-            commit_details_label = ctk.CTkLabel(self.commit_details_frame, text="Last Commit Details", font=("", 14))
-            commit_details_label.pack(pady=10)
-            
-            details_table = CTkTable(
-                self.commit_details_frame,
-                values=details_data,
-                row=len(details_data),
-                column=2,
-                width=600
+        commit_details_label = ctk.CTkLabel(
+            self.commit_details_frame, text="Last Commit Details", font=("", 14)
+        )
+        commit_details_label.pack(pady=10)
+
+        self.details_table = CTkTable(
+            self.commit_details_frame,
+            values=[[label, SKELETON] for label in DETAILS_ROWS],
+            row=len(DETAILS_ROWS),
+            column=2,
+            width=600,
+        )
+        self.details_table.pack(fill="both", padx=5, pady=5, expand=True)
+
+        # ========== Unreal Editor ==========
+        self._editor = EditorSupervisor(
+            self._paths.get("unreal", ""),
+            "",
+            sample_interval=self._config.get("unreal", {}).get("sample_interval", 5),
+            # exit arrives on the wait thread, the dispatcher hands it to Tk
+            on_exit=lambda session: get_scheduler().post(
+                lambda: self._on_editor_closed(session)
+            ),
+        )
+        # project the editor was started for
+        self._editor_project: Project | None = None
+        self._editor.add_post_close_hook(self._after_editor_exit)
+
+        self.start_button = ctk.CTkButton(
+            self.start_frame,
+            text="Start Workflow",
+            command=self._start_workflow,
+        )
+        self.workflow_table: CTkTable | None = None
+        self._prelaunch: CheckPipeline | None = None
+
+        self._dashboard_loading = False
+        self.switch_project(self._projects.active)
+        self.after(50, self._poll_dashboard_data)
+        self._projects.start()
+
+    # ========== Projects ==========
+    def _project_tasks(self, project: Project) -> dict:
+        repo, local_repo, git_exe = project.repo, project.path, self._git_exe
+        last_commits = self._last_commits
+        return {
+            "repo_info": lambda: get_repo_info(repo),
+            "commits": lambda: get_commit_count(repo, local_repo, git_exe),
+            "prs": lambda: get_pr_count(repo),
+            "last_release": lambda: _release_name(get_last_release(repo)),
+            # the newest commit also fills the details table
+            "last_commits": lambda: get_last_x_commit_stats(repo, max(last_commits, 1)),
+        }
+
+    def _refresh_local_status(self, project: Project) -> None:
+        """Local git status through the project's own status worker."""
+        name = project.name
+        if not project.path:
+            self._projects.post(name, WidgetResult("local_status", "N/A", None, 0.0))
+            return
+        worker = self._status_workers.get(name)
+        if worker is None:
+            # one worker and repository per project, kept across refreshes
+            worker = self._status_workers[name] = StatusWorker(
+                GitRepo(project.path, self._git_exe),
+                on_status=lambda status: self._on_local_status(project, status),
+                on_error=lambda e: self._on_local_status_error(project, e),
+                untracked="normal",
+            )
+        worker.refresh()
+
+    def _on_local_status(self, project: Project, status: GitStatus) -> None:
+        # status worker thread of this project
+        index = self._change_indexes.get(project.name)
+        if index is None:
+            # sizes from the large asset detector's cached, threaded stat
+            repo = self._status_workers[project.name].repo
+            detector = LargeAssetDetector(project.path, repo=repo)
+            index = self._change_indexes[project.name] = ChangeIndex(
+                project.path, sizer=detector.sizes
             )
-            details_table.pack(fill="both", padx=5, pady=5, expand=True)
-        
-        PATHS: dict = CONFIG.get('paths', {})
-        unreal_check = os.path.exists(PATHS.get('unreal', None)) and str(PATHS.get('unreal', "")).endswith('.exe')  # type: ignore
-        unreal_project_check = os.path.exists(PATHS.get('unreal_project_file', None)) and str(PATHS.get('unreal_project_file', "")).endswith('.uproject')  # type: ignore
-        git_check = os.path.exists(PATHS.get('git', None)) and str(PATHS.get('git', "")).endswith('.exe') # type: ignore
-        
-        LOGGER.info(f"Unreal ({unreal_check}): {PATHS.get('unreal', None)}")
-        LOGGER.info(f"Unreal Project File ({unreal_project_check}): {PATHS.get('unreal_project_file', None)}")
-        LOGGER.info(f"Git ({git_check}): {PATHS.get('git', None)}")
-        
-        workflow_table = CTkTable(
-            self.start_frame, 
-            values=[
-                ["Unreal", "Found" if unreal_check else "Not Found"], 
-                ["Unreal Project File", "Found" if unreal_project_check else "Not Found"], 
-                ["Git", "Found" if git_check else "Not Found"]
-            ]
-        )
-        workflow_table.pack(fill="both", padx=5, pady=5, expand=True)
-        
-        self.start_button = ctk.CTkButton(self.start_frame, text="Start Workflow", command=lambda: LOGGER.info("Start Workflow button clicked"))
-        self.start_button.pack(padx=20, pady=20)
-        
-        if unreal_check and unreal_project_check and git_check:
-            self.start_button.configure(state="normal", fg_color="#187e18")  # aktiv & grün
+        mtimes = self._change_mtimes.setdefault(project.name, {})
+        # same status line, saved again: the size in the index is stale
+        index.update(
+            status.entries, touched_paths(project.path, status.entries, mtimes)
+        )
+        if project.name in self._log_changes_of:
+            self._log_changes_of.discard(project.name)
+            counts = ", ".join(
+                f"{category}: {count}"
+                for category, (count, _) in index.summary().items()
+                if count
+            )
+            LOGGER.info(f"Changes after editor exit: {counts or 'none'}")
+        self._projects.post(
+            project.name,
+            WidgetResult("local_status", _local_status(status), None, status.elapsed),
+        )
+
+    def _on_local_status_error(self, project: Project, error: Exception) -> None:
+        if project.name in self._log_changes_of:
+            self._log_changes_of.discard(project.name)
+            LOGGER.warning(f"Could not read changes after editor exit: {error}")
+        self._projects.post(
+            project.name, WidgetResult("local_status", None, error, 0.0)
+        )
+
+    def switch_project(self, name: str) -> None:
+        started = time.perf_counter()
+        state = self._projects.switch(name)
+        self.project_menu.set(name)
+
+        # cached results first, skeletons for everything not loaded yet
+        for row in STATUS_INDEX.values():
+            self.status_table.insert(row, 1, SKELETON)
+        self.commit_table.configure(
+            rows=self._last_commits + 1, values=self._commit_skeleton()
+        )
+        for row in range(len(DETAILS_ROWS)):
+            self.details_table.insert(row, 1, SKELETON)
+        for result in list(state.results.values()):
+            self._fill_widget(result)
+        self._refresh_local_status(state.project)
+        self._dashboard_loading = True
+        LOGGER.info(
+            f"Switched to project '{name}' ({len(state.results)} cached widgets"
+            f" shown in {time.perf_counter() - started:.3f}s)"
+        )
+
+        self._start_prelaunch(state.project)
+
+    def _commit_skeleton(self) -> list[list[str]]:
+        return [COMMIT_TABLE_HEADER] + [
+            [SKELETON] * len(COMMIT_TABLE_HEADER) for _ in range(self._last_commits)
+        ]
+
+    # ========== Pre-Launch Checks ==========
+    def _start_prelaunch(self, project: Project) -> None:
+        paths = dict(
+            self._paths,
+            repo=project.path,
+            unreal_project_file=project.unreal_project_file
+            or self._paths.get("unreal_project_file", ""),
+        )
+        if self._prelaunch is not None:
+            # the previous project's fetch is of no use anymore
+            self._prelaunch.cancel()
+        prelaunch = CheckPipeline(
+            build_prelaunch_checks(
+                paths,
+                self._git_exe,
+                project.path or None,
+                fetch_interval=self._config.get("dashboard", {}).get(
+                    "fetch_interval", FETCH_INTERVAL
+                ),
+            )
+        )
+        self._prelaunch = prelaunch
+        self._prelaunch_project = project
+        self._prelaunch_rows: dict[str, int] = {
+            name: row + 1 for row, name in enumerate(prelaunch.order)
+        }
+        # one row per check: name, status, duration; filled as the graph runs
+        values = [PRELAUNCH_HEADER] + [
+            [prelaunch.checks[name].label or name, SKELETON, ""]
+            for name in prelaunch.order
+        ]
+        if self.workflow_table is None:
+            self.workflow_table = CTkTable(
+                self.start_frame,
+                values=values,
+                row=len(values),
+                column=len(PRELAUNCH_HEADER),
+            )
+            self.workflow_table.pack(fill="both", padx=5, pady=5, expand=True)
+            self.start_button.pack(padx=20, pady=20)
         else:
-            self.start_button.configure(state="disabled", fg_color="#8a0000")  # deaktiviert & rot
+            self.workflow_table.configure(rows=len(values), values=values)
 
-        
-        LOGGER.info("Dashboard data loaded.")
+        if not self._editor.running:
+            # deaktiviert, bis alle Pflicht-Checks durch sind
+            self.start_button.configure(state="disabled")
+        prelaunch.start()
+        self.after(50, self._poll_prelaunch, prelaunch)
+
+    def _poll_prelaunch(self, prelaunch: CheckPipeline):
+        if prelaunch is not self._prelaunch:
+            # project switched, a newer pipeline owns the table
+            return
+        # read before polling: once finished, every result is already queued
+        finished = prelaunch.finished
+        for result in prelaunch.poll():
+            row = self._prelaunch_rows[result.name]
+            status = PRELAUNCH_STATUS_TEXT[result.status]
+            if result.detail:
+                status = f"{status}: {result.detail}"
+            duration = f"{result.elapsed:.2f}s" if result.status in (OK, FAILED) else ""
+            self.workflow_table.insert(row, 1, status)
+            self.workflow_table.insert(row, 2, duration)
+
+        if not finished:
+            self.after(50, self._poll_prelaunch, prelaunch)
+        elif not self._editor.running:
+            self._update_start_button()
+
+    def _update_start_button(self) -> None:
+        if self._prelaunch.finished and self._prelaunch.passed:
+            # aktiv & grün
+            self.start_button.configure(
+                state="normal", text="Start Workflow", fg_color="#187e18"
+            )
+        else:
+            # deaktiviert & rot
+            self.start_button.configure(
+                state="disabled", text="Start Workflow", fg_color="#8a0000"
+            )
+
+    # ========== Unreal Editor ==========
+    def _start_workflow(self):
+        LOGGER.info("Start Workflow button clicked")
+        project = self._prelaunch_project
+        self._editor.project = project.unreal_project_file or self._paths.get(
+            "unreal_project_file", ""
+        )
+        try:
+            self._editor.launch()
+        except UnrealLaunchError as e:
+            LOGGER.error(str(e))
+            return
+        self._editor_project = project
+        # gesperrt, solange der Editor offen ist
+        self.start_button.configure(
+            state="disabled", text="Unreal läuft…", fg_color="#1f538d"
+        )
+
+    def _on_editor_closed(self, session: EditorSession):
+        self._update_start_button()
+
+    def _after_editor_exit(self, session: EditorSession) -> None:
+        # post-close hook, runs on the editor wait thread
+        project = self._editor_project
+        worker = self._status_workers.get(project.name)
+        if worker is not None:
+            # the next status of the project logs its changes
+            self._log_changes_of.add(project.name)
+            worker.refresh()
+
+    # ========== Dashboard Data ==========
+    def _poll_dashboard_data(self):
+        active = self._projects.active
+        for project, result in self._projects.poll():
+            # results of other projects only go into their cache
+            if project == active:
+                self._fill_widget(result)
+
+        loading = self._projects.is_refreshing(active)
+        if self._dashboard_loading and not loading:
+            self._dashboard_loading = False
+            LOGGER.debug(f"Repository cache: {REPO_CACHE.stats()}")
+            http_cache = get_http_cache()
+            if http_cache is not None:
+                LOGGER.debug(
+                    f"HTTP cache: {http_cache.hits} not modified, {http_cache.misses} downloaded"
+                )
+        # background refreshes of other projects need no fast polling
+        self.after(50 if loading else 500, self._poll_dashboard_data)
+
+    def _fill_widget(self, result: WidgetResult):
+        name, value, error = result.name, result.value, result.error
+
+        if name == "repo_info":
+            for key in REPO_INFO_KEYS:
+                cell = ERROR_TEXT if error else str(value.get(key))
+                self.status_table.insert(STATUS_INDEX[key], 1, cell)
+        elif name in STATUS_ROWS:
+            self.status_table.insert(
+                STATUS_INDEX[name], 1, ERROR_TEXT if error else str(value)
+            )
+        elif name == "last_commits":
+            if error:
+                self.commit_table.update_values(
+                    [COMMIT_TABLE_HEADER, [ERROR_TEXT] * len(COMMIT_TABLE_HEADER)]
+                )
+                for row in range(len(DETAILS_ROWS)):
+                    self.details_table.insert(row, 1, ERROR_TEXT)
+                return
+            commits = value[: self._last_commits]
+            table_data: list[list[str]] = [COMMIT_TABLE_HEADER]
+            for c in commits:
+                table_data.append(
+                    [
+                        str(c["sha"][:10]) + "...",
+                        str(c["additions"]),
+                        str(c["deletions"]),
+                        str(c["total"]),
+                    ]
+                )
+            self.commit_table_label.configure(text=f"Last {len(commits)} Commits")
+            self.commit_table.configure(rows=len(table_data), values=table_data)
+            self._fill_details(value[0] if value else None)
+
+    def _fill_details(self, commit: dict | None) -> None:
+        if commit is None:
+            for row in range(len(DETAILS_ROWS)):
+                self.details_table.insert(row, 1, "N/A")
+            return
+        details_values = [
+            commit["sha"],
+            commit["message"].splitlines()[0],
+            commit["message"],
+            commit["author"],
+            commit["email"],
+            str(commit["date"]),
+            changed_files_text(commit),
+        ]
+        for row, cell in enumerate(details_values):
+            self.details_table.insert(row, 1, cell)
@@ -1,229 +1,143 @@
 # ui/tabs/terminal.py
 """
-Terminal tab with non-blocking reader and basic ANSI SGR color handling.
-Works with pywinpty output that contains escape sequences (Clink, prompts, etc.)
+Terminal tab with one sub-tab per shell session and basic ANSI SGR color handling.
+Runs each shell in a pseudo-terminal: pywinpty on Windows (Clink, prompts, etc.),
+os.openpty() on Linux/macOS. All sessions share one reader thread; hidden
+sessions keep buffering their output and render it when they are selected.
 """
 
-import os
-import queue
-import re
-import threading
+import codecs
+from datetime import datetime
+from pathlib import Path
 
 import customtkinter as ctk
-import winpty
-
-# ANSI SGR regex (matches sequences like \x1b[31m or \x1b[1;32m)
-SGR_RE = re.compile(r"\x1b\[((?:\d{1,3};?)+)m")
-# OSC (Operating System Command) sequences like ESC ] 0;title BEL or ESC ] 0;title ESC \
-OSC_RE = re.compile(r"\x1b\].*?(?:\x07|\x1b\\)")
-# Other CSI / control sequences (cursor moves, erase, etc.) - remove conservative set
-CSI_RE = re.compile(r"\x1b\[[:<>?=\d;]*[A-Za-z]")
-
-# Map common SGR color codes to tkinter tag names / colors (basic)
-SGR_COLOR_MAP = {
-    30: ("fg_black", "#000000"),
-    31: ("fg_red", "#ff5555"),
-    32: ("fg_green", "#50fa7b"),
-    33: ("fg_yellow", "#f1fa8c"),
-    34: ("fg_blue", "#6272a4"),
-    35: ("fg_magenta", "#ff79c6"),
-    36: ("fg_cyan", "#8be9fd"),
-    37: ("fg_white", "#f8f8f2"),
-    90: ("fg_bright_black", "#44475a"),
-    91: ("fg_bright_red", "#ff6e6e"),
-    92: ("fg_bright_green", "#69ff94"),
-    93: ("fg_bright_yellow", "#ffffa5"),
-    94: ("fg_bright_blue", "#caa9ff"),
-    95: ("fg_bright_magenta", "#ff92df"),
-    96: ("fg_bright_cyan", "#9aedfe"),
-    97: ("fg_bright_white", "#ffffff"),
-}
-
-# Basic attributes
-ATTR_BOLD = 1
-ATTR_ITALIC = 3  # rarely supported in terminals
-ATTR_UNDERLINE = 4
-ATTR_RESET = 0
-
-
-def parse_sgr_parts(sgr_code_str):
-    """Return list of int codes from SGR parameter string like '1;31' -> [1,31]"""
-    parts = []
-    for p in sgr_code_str.split(";"):
-        try:
-            parts.append(int(p))
-        except ValueError:
-            pass
-    return parts
-
-
-class AnsiTextParser:
-    """
-    Simple ANSI SGR parser that yields (text, taglist)
-    It strips OSC and many CSI sequences, and processes SGR color/bold/reset.
-    Not a full terminal emulator — enough for colored prompts and outputs.
-    """
-
-    def __init__(self):
-        self.reset_state()
-
-    def reset_state(self):
-        self.current_fg = None
-        self.bold = False
-        self.underline = False
-
-    def _make_tags(self):
-        tags = []
-        if self.current_fg:
-            tags.append(self.current_fg)
-        if self.bold:
-            tags.append("attr_bold")
-        if self.underline:
-            tags.append("attr_underline")
-        return tags
-
-    def feed(self, text):
-        # First remove OSC and many cursor-control CSI sequences
-        text = OSC_RE.sub("", text)
-        text = CSI_RE.sub("", text)
-
-        # Now iterate over SGR sequences
-        pos = 0
-        for match in SGR_RE.finditer(text):
-            start, end = match.span()
-            if start > pos:
-                yield text[pos:start], self._make_tags()
-
-            codes = parse_sgr_parts(match.group(1))
-            # Apply codes
-            if not codes:
-                codes = [0]
-
-            for code in codes:
-                if code == ATTR_RESET:
-                    self.reset_state()
-                elif code == ATTR_BOLD:
-                    self.bold = True
-                elif code == ATTR_UNDERLINE:
-                    self.underline = True
-                elif 30 <= code <= 37 or 90 <= code <= 97:
-                    # Set foreground
-                    mapping = SGR_COLOR_MAP.get(code)
-                    if mapping:
-                        self.current_fg = mapping[0]
-                elif code == 39:
-                    # default fg
-                    self.current_fg = None
-                # NOTE: bg colors, 256-color, truecolor not implemented here
-            pos = end
-
-        # Remainder
-        if pos < len(text):
-            yield text[pos:], self._make_tags()
-
 
-class TerminalUI(ctk.CTkFrame):
-    def __init__(self, master, shell_cmd="cmd.exe /Q", **kwargs):
+from main._template import LOGGER
+from main.core.ptyprocess import PtyProcess, spawn_pty
+from main.core.ptyreader import PtyReader, get_pty_reader
+from main.ui.ansi import AnsiTextParser, tag_options
+from main.ui.pump import OutputPump
+from main.ui.widgets.scrollback import ScrollbackTextbox
+
+
+class TerminalSession(ctk.CTkFrame):
+    def __init__(
+        self,
+        master,
+        shell_cmd=None,
+        scrollback_lines=10000,
+        overflow="drop",
+        log_dir="logs",
+        name="terminal",
+        reader: PtyReader | None = None,
+        **kwargs,
+    ):
         super().__init__(master, **kwargs)
+        self.name = name
+        self.alive = True
 
         # Text widget (CTkTextbox wraps tkinter.Text and supports tags)
-        self.textbox = ctk.CTkTextbox(self, wrap="none")
+        # Read-only, capped to `scrollback_lines`, one insert per frame
+        self.textbox = ScrollbackTextbox(self, max_lines=scrollback_lines, wrap="none")
         self.textbox.pack(fill="both", expand=True, padx=8, pady=8)
 
-        # --- ÄNDERUNG 1: Initial sperren ---
-        self.textbox.configure(state="disabled")
-        # -----------------------------------
-
-        # Configure tags for colors / attributes
-        self._configure_tags()
+        # Tags for colors / attributes, configured lazily
+        self._known_tags: set[str] = set()
 
         # Entry for user input
         self.entry = ctk.CTkEntry(self, placeholder_text="Befehl eingeben...")
         self.entry.pack(fill="x", padx=8, pady=(0, 8))
         self.entry.bind("<Return>", self._on_enter)
 
-        # ... (Rest von __init__ bleibt gleich) ...
-        self._q = queue.Queue()
-        self._pty = winpty.PtyProcess
-        self._proc = self._pty.spawn(shell_cmd)
+        # Output of the reader thread is handled within a per-frame budget;
+        # under overload old chunks are dropped (overflow="drop") or reading
+        # this PTY pauses until the backlog is rendered (overflow="block")
+        self._pump = OutputPump(
+            self.after,
+            self._render_chunk,
+            on_skipped=self._on_skipped,
+            on_frame=self.textbox.flush,
+            on_drain=self._on_drain,
+            overflow=overflow,
+        )
+        # full, unthrottled copy of the session output
+        safe_name = "".join(c if c.isalnum() else "-" for c in name).lower()
+        self.log_path = Path(log_dir) / (
+            f"{safe_name}-{datetime.now().strftime('%d%m%Y%H%M%S')}.log"
+        )
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        self._log_file = open(self.log_path, "ab", buffering=64 * 1024)
+
+        # shell_cmd=None: cmd.exe on Windows, $SHELL elsewhere
+        self._proc: PtyProcess = spawn_pty(shell_cmd)
         self._parser = AnsiTextParser()
-        self._running = True
-        self._reader_thread = threading.Thread(target=self._reader_loop, daemon=True)
-        self._reader_thread.start()
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._reader = reader or get_pty_reader()
+        self._reader.register(self._proc, self._on_data, self._on_eof)
 
         font_name = "Consolas"
         self.textbox.configure(font=(font_name, 12))
         self.entry.configure(font=(font_name, 12))
 
-        self.after(50, self._poll_output)
+    def show(self):
+        """Render buffered output and keep rendering while visible."""
+        self._pump.resume()
         self.entry.focus_set()
 
-    def _configure_tags(self):
-        # Attribute tags
-        self.textbox.tag_config("attr_bold")
-        self.textbox.tag_config("attr_underline", underline=True)
-        # Color tags
-        for code, (tagname, hexcol) in SGR_COLOR_MAP.items():
+    def hide(self):
+        """Keep buffering output without touching the textbox."""
+        self._pump.pause()
+
+    def _configure_tags(self, tags):
+        # Tags are configured on first use, 256-color / truecolor tags are open-ended
+        for tagname in tags:
+            if tagname in self._known_tags:
+                continue
+            self._known_tags.add(tagname)
             # CTkTextbox.tag_config accepts foreground as "fg" or "foreground"
             # Under the hood CTk uses tkinter.Text tag_config, so use foreground
             try:
-                self.textbox.tag_config(tagname, foreground=hexcol)
+                self.textbox.tag_config(tagname, **tag_options(tagname))
             except Exception:
                 # If CTkTextbox blocks direct tag_config, fallback to no colors
                 pass
 
-    def _reader_loop(self):
-        """Background thread that reads from the PTY and pushes to queue."""
-        while self._running:
-            try:
-                data = self._proc.read()
-                if data:
-                    # Ensure it's a python string
-                    if isinstance(data, bytes):
-                        try:
-                            data = data.decode("utf-8", errors="replace")
-                        except Exception:
-                            data = data.decode("latin1", errors="replace")
-                    self._q.put(data)
-                else:
-                    # small sleep to avoid busy loop if read() returns empty
-                    threading.Event().wait(0.01)
-            except Exception:
-                threading.Event().wait(0.05)
-
-    def _poll_output(self):
-        """Called in main thread periodically to flush output queue into textbox."""
+    def _on_data(self, data):
+        """Called by the shared reader thread with raw PTY output."""
         try:
-            while True:
-                chunk = self._q.get_nowait()
-
-                # --- ÄNDERUNG 2: Kurzzeitig entsperren (Unlock) ---
-                self.textbox.configure(state="normal")
-                # --------------------------------------------------
-
-                # Parse ANSI and insert with tags
-                for txt, tags in self._parser.feed(chunk):
-                    if txt:
-                        # Replace carriage returns that attempt to move cursor; keep newlines
-                        txt = txt.replace("\r", "")
-                        # Insert preserving tags
-                        if tags:
-                            # Insert with multiple tags
-                            self.textbox.insert("end", txt, tuple(tags))
-                        else:
-                            self.textbox.insert("end", txt)
-                        self.textbox.see("end")
-
-                # --- ÄNDERUNG 3: Sofort wieder sperren (Lock) ---
-                self.textbox.configure(state="disabled")
-                # ------------------------------------------------
-
-        except queue.Empty:
-            pass
-
-        # schedule next poll
-        if self._running:
-            self.after(50, self._poll_output)
+            self._log_file.write(data)
+        except ValueError:
+            # log file closed by destroy()
+            return
+        # multi-byte characters may be split between reads
+        self._pump.post(self._decoder.decode(data))
+        if self._pump.overflow == "block" and self._pump.full:
+            self._reader.pause(self._proc)
+
+    def _on_eof(self):
+        self.alive = False
+        self._pump.post(self._decoder.decode(b"", final=True))
+        self._pump.post("\n[Prozess beendet]\n")
+
+    def _on_drain(self):
+        self._reader.resume(self._proc)
+
+    def _render_chunk(self, chunk):
+        """Called by the pump in the main thread, within the frame budget."""
+        # Parse ANSI and queue with tags, the pump flushes the textbox once per frame
+        for txt, tags in self._parser.feed(chunk):
+            # Replace carriage returns that attempt to move cursor; keep newlines
+            txt = txt.replace("\r", "")
+            if txt:
+                self._configure_tags(tags)
+                self.textbox.append(txt, tags)
+
+    def _on_skipped(self, lines):
+        self._configure_tags(("attr_underline",))
+        self.textbox.append(
+            f"\n[{lines} lines skipped, see full log: {self.log_path}]\n",
+            ("attr_underline",),
+        )
 
     def _on_enter(self, event=None):
         cmd = self.entry.get()
@@ -231,27 +145,104 @@ class TerminalUI(ctk.CTkFrame):
             return
         # Send the command to the PTY (append newline)
         try:
-            to_send = cmd + "\r\n"
-            # write expects bytes or str depending on API
-            try:
-                self._proc.write(to_send)
-            except TypeError:
-                # maybe expects bytes
-                self._proc.write(to_send.encode("utf-8"))
-        except Exception:
-            pass
+            self._proc.write(cmd + self._proc.newline)
+        except Exception as e:
+            LOGGER.error(f"Terminal write failed: {e}")
         # echo command optionally to the textbox (some shells already echo)
         # self.textbox.insert("end", f"> {cmd}\n")
         self.entry.delete(0, "end")
 
     def destroy(self):
-        # stop reader
-        self._running = False
+        # stop reading, then close the process
+        self._reader.unregister(self._proc)
+        self._pump.close()
         try:
             # try to close spawned process cleanly
             try:
                 self._proc.close()
             except Exception:
                 pass
+            self._log_file.close()
         finally:
             super().destroy()
+
+
+class TerminalUI(ctk.CTkFrame):
+    """Tabs with several terminal sessions, e.g. git, a UBT build and a cook."""
+
+    def __init__(
+        self,
+        master,
+        shell_cmd=None,
+        scrollback_lines=10000,
+        overflow="drop",
+        log_dir="logs",
+        **kwargs,
+    ):
+        super().__init__(master, **kwargs)
+        self._session_options = {
+            "shell_cmd": shell_cmd,
+            "scrollback_lines": scrollback_lines,
+            "overflow": overflow,
+            "log_dir": log_dir,
+        }
+        self.sessions: dict[str, TerminalSession] = {}
+        self._counter = 0
+
+        toolbar = ctk.CTkFrame(self, fg_color="transparent")
+        toolbar.pack(fill="x", padx=8, pady=(8, 0))
+        ctk.CTkButton(
+            toolbar, text="+ Neues Terminal", width=140, command=self.new_session
+        ).pack(side="left")
+        ctk.CTkButton(
+            toolbar,
+            text="Terminal schließen",
+            width=140,
+            command=lambda: self.close_session(self.tabs.get()),
+        ).pack(side="left", padx=(8, 0))
+
+        self.tabs = ctk.CTkTabview(self, command=self._on_tab_change)
+        self.tabs.pack(fill="both", expand=True)
+
+        self.new_session()
+
+    def new_session(self, shell_cmd=None, title=None) -> TerminalSession:
+        self._counter += 1
+        title = title or f"Terminal {self._counter}"
+        options = dict(self._session_options)
+        if shell_cmd is not None:
+            options["shell_cmd"] = shell_cmd
+
+        tab = self.tabs.add(title)
+        session = TerminalSession(tab, name=title, **options)
+        session.pack(fill="both", expand=True)
+        self.sessions[title] = session
+        LOGGER.info(f"Terminal session '{title}' started.")
+
+        self.tabs.set(title)
+        self._on_tab_change()
+        return session
+
+    def close_session(self, title):
+        session = self.sessions.pop(title, None)
+        if session is None:
+            return
+        session.destroy()
+        self.tabs.delete(title)
+        LOGGER.info(f"Terminal session '{title}' closed.")
+        if self.sessions:
+            self._on_tab_change()
+
+    def _on_tab_change(self):
+        # only the visible session renders, the others just buffer
+        current = self.tabs.get()
+        for title, session in self.sessions.items():
+            if title == current:
+                session.show()
+            else:
+                session.hide()
+
+    def destroy(self):
+        for title in list(self.sessions):
+            self.sessions.pop(title).destroy()
+        super().destroy()
@@ -0,0 +1,191 @@
+# ui/tabs/unreal_tools.py
+"""
+Unreal Tools tab: auto clean of Intermediate/, Saved/, DerivedDataCache/ and
+Binaries/. The dry run and the delete run as jobs on the shared scheduler,
+whose dispatcher delivers their progress and results on the Tk thread.
+"""
+
+import customtkinter as ctk
+from CTkTable import CTkTable
+
+from main.core.cleaner import (
+    DEFAULT_EXCLUDE,
+    DEFAULT_FOLDERS,
+    CleanPlan,
+    CleanProgress,
+    CleanReport,
+    ProjectCleaner,
+)
+from main.core.jobs import (
+    CANCELLED,
+    DONE,
+    FAILED,
+    Job,
+    JobContext,
+    JobProgress,
+    JobScheduler,
+    get_scheduler,
+)
+
+CLEAN_HEADER = ["Ordner", "Dateien", "Größe"]
+
+
+def format_bytes(size: int) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024 or unit == "GiB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+class UnrealToolsUI(ctk.CTkFrame):
+    def __init__(
+        self,
+        master,
+        project_dir: str,
+        clean_config: dict,
+        scheduler: JobScheduler | None = None,
+        **kwargs,
+    ):
+        super().__init__(master, **kwargs)
+        self.scheduler = scheduler or get_scheduler()
+        self.cleaner = ProjectCleaner(
+            project_dir,
+            folders=clean_config.get("folders", DEFAULT_FOLDERS),
+            exclude=clean_config.get("exclude", DEFAULT_EXCLUDE),
+        )
+        self._plan: CleanPlan | None = None
+        self._job: Job | None = None
+
+        ctk.CTkLabel(self, text="Auto Clean", font=("", 14)).pack(pady=10)
+        self.clean_table = CTkTable(
+            self, values=[CLEAN_HEADER], row=1, column=len(CLEAN_HEADER)
+        )
+        self.clean_table.pack(fill="x", padx=10, pady=5)
+
+        self.progress_bar = ctk.CTkProgressBar(self)
+        self.progress_bar.set(0)
+        self.progress_bar.pack(fill="x", padx=10, pady=5)
+        self.status_label = ctk.CTkLabel(self, text="")
+        self.status_label.pack(pady=5)
+
+        buttons = ctk.CTkFrame(self, fg_color="transparent")
+        buttons.pack(pady=10)
+        self.dry_run_button = ctk.CTkButton(
+            buttons, text="Dry Run", command=self.start_dry_run
+        )
+        self.dry_run_button.pack(side="left", padx=5)
+        # erst nach einem Dry Run aktiv: gelöscht wird genau, was angezeigt wurde
+        self.clean_button = ctk.CTkButton(
+            buttons,
+            text="Aufräumen",
+            command=self.start_clean,
+            state="disabled",
+            fg_color="#8a0000",
+        )
+        self.clean_button.pack(side="left", padx=5)
+
+        if not project_dir:
+            # abspath("") wäre das Arbeitsverzeichnis
+            self.dry_run_button.configure(state="disabled")
+            self.status_label.configure(text="Kein Unreal-Projekt konfiguriert")
+
+    # ==== jobs ==== #
+    def _set_busy(self) -> None:
+        self.dry_run_button.configure(state="disabled")
+        self.clean_button.configure(state="disabled")
+
+    def start_dry_run(self) -> None:
+        self._set_busy()
+        self.status_label.configure(text="Scanne…")
+        self.progress_bar.set(0)
+        self._job = self.scheduler.submit(
+            lambda ctx: self.cleaner.plan(),
+            name="auto-clean-plan",
+            on_done=self._on_plan_done,
+        )
+
+    def start_clean(self) -> None:
+        plan = self._plan
+        if plan is None:
+            return
+        self._plan = None
+        self._set_busy()
+        self.status_label.configure(text="Lösche…")
+        self._job = self.scheduler.submit(
+            self._clean,
+            plan,
+            name="auto-clean",
+            on_progress=self._on_clean_progress,
+            on_done=self._on_clean_done,
+        )
+        # während des Löschens wird der Button zum Abbrechen
+        self.clean_button.configure(
+            state="normal", text="Abbrechen", command=self.cancel_clean
+        )
+
+    def cancel_clean(self) -> None:
+        if self._job is not None:
+            self._job.cancel()
+        self.clean_button.configure(state="disabled")
+
+    def _clean(self, ctx: JobContext, plan: CleanPlan) -> CleanReport:
+        # worker thread
+        def on_progress(progress: CleanProgress) -> None:
+            ctx.progress(
+                progress.files_done,
+                progress.files_total,
+                f"Lösche… {progress.files_done}/{progress.files_total} Dateien,"
+                f" {format_bytes(progress.bytes_done)}",
+            )
+
+        return self.cleaner.clean(
+            plan, on_progress=on_progress, cancel=ctx.cancel_event
+        )
+
+    # ==== Tk thread (job callbacks) ==== #
+    def _on_clean_progress(self, job: Job, progress: JobProgress) -> None:
+        if progress.fraction is not None:
+            self.progress_bar.set(progress.fraction)
+        self.status_label.configure(text=progress.message)
+
+    def _on_plan_done(self, job: Job) -> None:
+        self.dry_run_button.configure(state="normal")
+        if job.state == DONE:
+            self._show_plan(job.result)
+        elif job.state == FAILED:
+            self.status_label.configure(text=f"Fehler: {job.error}")
+
+    def _on_clean_done(self, job: Job) -> None:
+        self._job = None
+        self.dry_run_button.configure(state="normal")
+        self.clean_button.configure(
+            state="disabled", text="Aufräumen", command=self.start_clean
+        )
+        if job.state == DONE:
+            report: CleanReport = job.result
+            self.progress_bar.set(1)
+            errors = f", {len(report.errors)} Fehler" if report.errors else ""
+            cancelled = " (abgebrochen)" if job.cancelled else ""
+            self.status_label.configure(
+                text=f"{format_bytes(report.freed_bytes)} freigegeben{cancelled}"
+                f" ({report.files} Dateien, {report.elapsed:.1f}s{errors})"
+            )
+        elif job.state == CANCELLED:
+            self.status_label.configure(text="Abgebrochen")
+        elif job.state == FAILED:
+            self.status_label.configure(text=f"Fehler: {job.error}")
+
+    def _show_plan(self, plan: CleanPlan) -> None:
+        values = [CLEAN_HEADER] + [
+            [folder.folder, str(len(folder.files)), format_bytes(folder.bytes)]
+            for folder in plan.folders
+        ]
+        values.append(["Gesamt", str(plan.files), format_bytes(plan.bytes)])
+        self.clean_table.configure(rows=len(values), values=values)
+        self.status_label.configure(
+            text=f"{format_bytes(plan.bytes)} können freigegeben werden"
+            f" ({plan.elapsed:.2f}s)"
+        )
+        if plan.files:
+            self._plan = plan
+            self.clean_button.configure(state="normal")
@@ -0,0 +1,315 @@
+# ui/tabs/workflow.py
+"""
+Workflow tab: one card per step (pull → Unreal → status → add → commit → push
+→ PR) with its state, a live duration timer, the usual duration from earlier
+runs and the last log lines of the step. The workflow runs as a scheduler
+job; its progress events refresh the cards on the Tk thread.
+"""
+
+import os
+import time
+
+import customtkinter as ctk
+
+from main._template import LOGGER
+from main.core.changes import CATEGORIES
+from main.core.git import GitRepo
+from main.core.jobs import CANCELLED, DONE, FAILED, Job, JobScheduler, get_scheduler
+from main.core.projects import Project, projects_from_config
+from main.core.unreal import EditorSupervisor
+from main.core.workflow import DONE as STEP_DONE
+from main.core.workflow import FAILED as STEP_FAILED
+from main.core.workflow import (
+    PENDING,
+    PR,
+    RUNNING,
+    SKIPPED,
+    Checkpoint,
+    StepMetrics,
+    StepState,
+    WorkflowEngine,
+    WorkflowResult,
+    build_unreal_steps,
+    default_checkpoint_path,
+)
+from main.errors import GitError
+
+STATUS_TEXT = {
+    PENDING: "Pending",
+    RUNNING: "Running…",
+    STEP_DONE: "Done",
+    STEP_FAILED: "Failed",
+    SKIPPED: "Skipped",
+}
+STATUS_COLOR = {
+    PENDING: "gray60",
+    RUNNING: "#1f538d",
+    STEP_DONE: "#187e18",
+    STEP_FAILED: "#8a0000",
+    SKIPPED: "gray40",
+}
+CARD_LOG_LINES = 3
+TIMER_MS = 500
+
+
+class StepCard(ctk.CTkFrame):
+    def __init__(self, master, state: StepState, usual: str, **kwargs):
+        super().__init__(master, **kwargs)
+        self.grid_columnconfigure(1, weight=1)
+        ctk.CTkLabel(self, text=state.label, font=("", 14), width=120, anchor="w").grid(
+            row=0, column=0, padx=10, pady=(5, 0), sticky="w"
+        )
+        self.status_label = ctk.CTkLabel(self, text="", anchor="w")
+        self.status_label.grid(row=0, column=1, padx=10, pady=(5, 0), sticky="w")
+        self.timer_label = ctk.CTkLabel(self, text="", width=120, anchor="e")
+        self.timer_label.grid(row=0, column=2, padx=10, pady=(5, 0), sticky="e")
+        # Dauer früherer Läufe
+        ctk.CTkLabel(self, text=usual, text_color="gray60", anchor="e").grid(
+            row=1, column=2, padx=10, sticky="e"
+        )
+        self.log_label = ctk.CTkLabel(
+            self, text="", justify="left", anchor="w", text_color="gray70"
+        )
+        self.log_label.grid(
+            row=1, column=0, columnspan=2, padx=10, pady=(0, 5), sticky="w"
+        )
+        self.update_state(state)
+
+    def update_state(self, state: StepState) -> None:
+        text = STATUS_TEXT[state.status]
+        if state.resumed:
+            text += " (Checkpoint)"
+        if state.error:
+            text += f": {state.error}"
+        self.status_label.configure(text=text, text_color=STATUS_COLOR[state.status])
+        self.log_label.configure(text="\n".join(list(state.log)[-CARD_LOG_LINES:]))
+        self.update_timer(state)
+
+    def update_timer(self, state: StepState) -> None:
+        if state.status == RUNNING and state.started is not None:
+            self.timer_label.configure(text=f"{time.monotonic() - state.started:.0f}s")
+        elif state.status in (STEP_DONE, STEP_FAILED) and not state.resumed:
+            self.timer_label.configure(text=f"{state.elapsed:.1f}s")
+        else:
+            self.timer_label.configure(text="")
+
+
+class WorkflowUI(ctk.CTkFrame):
+    def __init__(
+        self, master, config: dict, scheduler: JobScheduler | None = None, **kwargs
+    ):
+        super().__init__(master, **kwargs)
+        self.scheduler = scheduler or get_scheduler()
+        self._paths: dict = config.get("paths", {})
+        self._workflow_config: dict = config.get("workflow", {})
+        self._sample_interval = config.get("unreal", {}).get("sample_interval", 5)
+        self._git_exe: str = (
+            self._paths.get("git")
+            if os.path.exists(self._paths.get("git", ""))
+            else "git"
+        )
+        self._projects = {p.name: p for p in projects_from_config(config)}
+        self.metrics = StepMetrics()
+        self.engine: WorkflowEngine | None = None
+        self._repo: GitRepo | None = None
+        self._job: Job | None = None
+        self._message: str | None = None
+        self._categories: list[str] | None = None
+        self.cards: dict[str, StepCard] = {}
+
+        top = ctk.CTkFrame(self, fg_color="transparent")
+        top.pack(fill="x", padx=10, pady=10)
+        self.project_menu = ctk.CTkOptionMenu(
+            top, values=list(self._projects), command=self.select_project
+        )
+        self.project_menu.pack(side="left", padx=5)
+        self.message_entry = ctk.CTkEntry(
+            top, placeholder_text="Commit-Nachricht (optional)", width=300
+        )
+        self.message_entry.pack(side="left", padx=5, fill="x", expand=True)
+
+        # nur die gewählten Kategorien werden hinzugefügt und committet
+        categories = ctk.CTkFrame(self, fg_color="transparent")
+        categories.pack(fill="x", padx=10)
+        self.category_boxes: dict[str, ctk.CTkCheckBox] = {}
+        for category in CATEGORIES:
+            box = ctk.CTkCheckBox(categories, text=category, width=90)
+            box.select()
+            box.pack(side="left", padx=3)
+            self.category_boxes[category] = box
+
+        self.cards_frame = ctk.CTkScrollableFrame(self)
+        self.cards_frame.pack(fill="both", expand=True, padx=10, pady=5)
+
+        buttons = ctk.CTkFrame(self, fg_color="transparent")
+        buttons.pack(pady=10)
+        self.start_button = ctk.CTkButton(buttons, text="Start", command=self.start)
+        self.start_button.pack(side="left", padx=5)
+        self.restart_button = ctk.CTkButton(
+            buttons, text="Neu starten", command=lambda: self.start(resume=False)
+        )
+        self.restart_button.pack(side="left", padx=5)
+        self.cancel_button = ctk.CTkButton(
+            buttons,
+            text="Abbrechen",
+            command=self.cancel,
+            state="disabled",
+            fg_color="#8a0000",
+        )
+        self.cancel_button.pack(side="left", padx=5)
+        self.status_label = ctk.CTkLabel(self, text="")
+        self.status_label.pack(pady=(0, 10))
+
+        self.select_project(next(iter(self._projects)))
+
+    def destroy(self):
+        if self._repo is not None:
+            self._repo.close()
+        super().destroy()
+
+    # ==== engine ==== #
+    def select_project(self, name: str) -> None:
+        if self._job is not None:
+            # nicht während eines Laufs umschalten
+            self.project_menu.set(self._project.name)
+            return
+        self._project: Project = self._projects[name]
+        self.project_menu.set(name)
+        if self._repo is not None:
+            self._repo.close()
+            self._repo = None
+        self.engine = None
+        self.status_label.configure(text="")
+        if not self._project.path:
+            # GitRepo("") wäre das Arbeitsverzeichnis
+            self.status_label.configure(text="Kein lokales Repository konfiguriert")
+        else:
+            self._repo = GitRepo(self._project.path, self._git_exe)
+        try:
+            if self._repo is not None:
+                self.engine = self._build_engine()
+        except (GitError, ValueError) as e:
+            LOGGER.error(f"Workflow for '{name}' unavailable: {e}")
+            self.status_label.configure(text=f"Fehler: {e}")
+        self._build_cards()
+        self._update_buttons()
+
+    def _build_engine(self) -> WorkflowEngine:
+        editor = EditorSupervisor(
+            self._paths.get("unreal", ""),
+            self._project.unreal_project_file
+            or self._paths.get("unreal_project_file", ""),
+            sample_interval=self._sample_interval,
+        )
+        create_pr = self._workflow_config.get("pull_request", True)
+        steps = build_unreal_steps(
+            self._repo,
+            editor=editor,
+            github_repo=self._project.repo if create_pr else None,
+            # taken from the widgets when the run starts (Tk thread)
+            message=lambda data: self._message,
+            remote=self._workflow_config.get("remote", "origin"),
+            base=self._workflow_config.get("base") or None,
+            snapshot=self._workflow_config.get("snapshot_before_pull", True),
+            categories=lambda: self._categories,
+            large_file_size=self._workflow_config.get("large_file_mb", 50) * 2**20
+            or None,
+        )
+        return WorkflowEngine(
+            steps,
+            Checkpoint(default_checkpoint_path(self._repo)),
+            self.metrics,
+            repo=self._repo,
+        )
+
+    def _build_cards(self) -> None:
+        for card in self.cards.values():
+            card.destroy()
+        self.cards = {}
+        if self.engine is None:
+            return
+        for name, state in self.engine.states.items():
+            card = StepCard(self.cards_frame, state, self._usual_duration(name))
+            card.pack(fill="x", padx=5, pady=3)
+            self.cards[name] = card
+
+    def _usual_duration(self, step: str) -> str:
+        summary = self.metrics.summary(step)
+        if summary is None:
+            return ""
+        return f"Ø {summary.p50:.0f}s, p90 {summary.p90:.0f}s ({summary.count}x)"
+
+    def _update_buttons(self) -> None:
+        running = self._job is not None
+        idle = "disabled" if running or self.engine is None else "normal"
+        checkpoint = None if self.engine is None else self.engine.resumable()
+        self.start_button.configure(
+            state=idle, text="Fortsetzen" if checkpoint else "Start"
+        )
+        self.restart_button.configure(state=idle if checkpoint else "disabled")
+        self.cancel_button.configure(state="normal" if running else "disabled")
+        if checkpoint and not running:
+            failed = checkpoint.get("failed") or {}
+            where = failed.get("step") or "dem letzten Schritt"
+            self.status_label.configure(text=f"Unterbrochener Lauf, weiter ab {where}")
+
+    # ==== run ==== #
+    def start(self, resume: bool = True) -> None:
+        if self.engine is None or self._job is not None:
+            return
+        if PR in self.engine.step_names:
+            # fragt ggf. nach dem Token, das geht nur im Tk-Thread
+            from main.github_tools.token import get_token
+
+            get_token()
+        self._message = self.message_entry.get().strip() or None
+        chosen = [name for name, box in self.category_boxes.items() if box.get()]
+        # alle gewählt: einfach alles committen
+        self._categories = None if len(chosen) == len(CATEGORIES) else chosen
+        self._job = self.engine.start(
+            self.scheduler,
+            resume=resume,
+            on_progress=lambda job, progress: self._refresh_cards(),
+            on_done=self._on_done,
+        )
+        self.status_label.configure(text="Workflow läuft…")
+        self._update_buttons()
+        self.after(TIMER_MS, self._tick)
+
+    def cancel(self) -> None:
+        if self._job is None:
+            return
+        # ein offener Unreal Editor wird nicht beendet
+        self._job.cancel()
+        self.cancel_button.configure(state="disabled")
+
+    def _refresh_cards(self) -> None:
+        for name, state in self.engine.states.items():
+            self.cards[name].update_state(state)
+
+    def _tick(self) -> None:
+        if self._job is None:
+            return
+        for name, state in self.engine.states.items():
+            if state.status == RUNNING:
+                self.cards[name].update_timer(state)
+        self.after(TIMER_MS, self._tick)
+
+    def _on_done(self, job: Job) -> None:
+        self._job = None
+        self._refresh_cards()
+        if job.state == DONE:
+            result: WorkflowResult = job.result
+            if result.ok:
+                url = result.data.get("pr_url")
+                text = f"Fertig in {result.elapsed:.0f}s"
+                self.status_label.configure(text=f"{text}: {url}" if url else text)
+            else:
+                self.status_label.configure(
+                    text=f"Fehlgeschlagen bei {result.failed_step}: {result.error}"
+                )
+        elif job.state == CANCELLED:
+            self.status_label.configure(text="Abgebrochen, Checkpoint gespeichert")
+        elif job.state == FAILED:
+            self.status_label.configure(text=f"Fehler: {job.error}")
+        self._update_buttons()
@@ -0,0 +1,83 @@
+"""
+Read-only textbox for streaming output (logs, terminal).
+
+`append()` may be called from any thread. Chunks are queued and written by one
+flush per frame: adjacent chunks with the same tags are merged, everything is
+inserted in a single Text.insert call, old lines are dropped in bulk once the
+line cap is exceeded, and the view scrolls once.
+"""
+
+import threading
+
+import customtkinter as ctk
+
+Chunk = tuple[str, tuple[str, ...]]
+
+
+def coalesce_chunks(chunks: list[Chunk]) -> list[Chunk]:
+    """Merge neighbouring chunks that carry the same tags."""
+    merged: list[Chunk] = []
+    for text, tags in chunks:
+        if not text:
+            continue
+        if merged and merged[-1][1] == tags:
+            merged[-1] = (merged[-1][0] + text, tags)
+        else:
+            merged.append((text, tags))
+    return merged
+
+
+class ScrollbackTextbox(ctk.CTkTextbox):
+    def __init__(
+        self, master, max_lines: int = 5000, flush_interval: int = 16, **kwargs
+    ):
+        kwargs.setdefault("state", "disabled")
+        super().__init__(master, **kwargs)
+        self.max_lines = max_lines
+        self.flush_interval = flush_interval
+        # trim in steps of ~10% so we don't delete a line on every insert
+        self._trim_slack = max(1, max_lines // 10)
+        self._pending: list[Chunk] = []
+        self._pending_lock = threading.Lock()
+        self._flush_scheduled = False
+
+    def append(self, text: str, tags: tuple[str, ...] | list[str] = ()) -> None:
+        with self._pending_lock:
+            self._pending.append((text, tuple(tags)))
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        self.after(self.flush_interval, self._flush)
+
+    def clear(self) -> None:
+        with self._pending_lock:
+            self._pending.clear()
+        self.configure(state="normal")
+        self.delete("1.0", "end")
+        self.configure(state="disabled")
+
+    def flush(self) -> None:
+        """Write queued chunks now instead of on the next timer. Tk thread only."""
+        self._flush()
+
+    def _flush(self) -> None:
+        with self._pending_lock:
+            chunks, self._pending = self._pending, []
+            self._flush_scheduled = False
+
+        merged = coalesce_chunks(chunks)
+        if not merged:
+            return
+
+        args: list = []
+        for text, tags in merged:
+            args.extend((text, tags))
+
+        text_widget = self._textbox
+        text_widget.configure(state="normal")
+        text_widget.insert("end", *args)
+        lines = int(text_widget.index("end-1c").split(".")[0])
+        if lines > self.max_lines + self._trim_slack:
+            text_widget.delete("1.0", f"{lines - self.max_lines + 1}.0")
+        text_widget.configure(state="disabled")
+        text_widget.see("end")
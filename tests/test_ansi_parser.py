@@ -0,0 +1,84 @@
+# tests/test_ansi_parser.py
+from main.ui.ansi import AnsiTextParser, apply_sgr, tag_options, xterm_256_color
+
+
+def feed_all(parser: AnsiTextParser, chunks: list[str]) -> list[tuple[str, tuple]]:
+    runs = []
+    for chunk in chunks:
+        runs.extend(parser.feed(chunk))
+    # gleiche Tags hintereinander zusammenfassen, Chunk-Grenzen sind egal
+    merged: list[tuple[str, tuple]] = []
+    for text, tags in runs:
+        if merged and merged[-1][1] == tags:
+            merged[-1] = (merged[-1][0] + text, tags)
+        else:
+            merged.append((text, tags))
+    return merged
+
+
+def test_plain_text_passes_through() -> None:
+    assert AnsiTextParser().feed("hello\nworld") == [("hello\nworld", ())]
+
+
+def test_sgr_colors_and_reset() -> None:
+    runs = AnsiTextParser().feed("a\x1b[31mred\x1b[1mbold\x1b[0mplain")
+    assert runs == [
+        ("a", ()),
+        ("red", ("fg_red",)),
+        ("bold", ("fg_red", "attr_bold")),
+        ("plain", ()),
+    ]
+
+
+def test_sequence_split_across_chunks() -> None:
+    text = "x\x1b[31mred\x1b]0;title\x07\x1b[2Kdone\x1b[0m!"
+    expected = feed_all(AnsiTextParser(), [text])
+    # jede mögliche Trennstelle muss dasselbe Ergebnis liefern
+    for cut in range(1, len(text)):
+        parser = AnsiTextParser()
+        assert feed_all(parser, [text[:cut], text[cut:]]) == expected, cut
+    assert expected == [
+        ("x", ()),
+        ("reddone", ("fg_red",)),
+        ("!", ()),
+    ]
+
+
+def test_split_osc_with_st_terminator() -> None:
+    parser = AnsiTextParser()
+    runs = feed_all(parser, ["a\x1b]0;ti", "tle\x1b", "\\b"])
+    assert runs == [("ab", ())]
+
+
+def test_escape_never_leaks_as_text() -> None:
+    parser = AnsiTextParser()
+    runs = feed_all(parser, ["\x1b", "[", "3", "2", "m", "ok"])
+    assert runs == [("ok", ("fg_green",))]
+
+
+def test_extended_colors() -> None:
+    runs = AnsiTextParser().feed(
+        "\x1b[38;5;196ma\x1b[48;2;1;2;3mb\x1b[39;49;44mc\x1b[38:2::255:0:16md"
+    )
+    assert runs == [
+        ("a", ("fg_256_196",)),
+        ("b", ("fg_256_196", "bg_#010203")),
+        ("c", ("bg_blue",)),
+        ("d", ("fg_#ff0010", "bg_blue")),
+    ]
+
+
+def test_attribute_off_codes() -> None:
+    attrs = apply_sgr(apply_sgr((None, None, False, False, False), "1;3;4"), "22;24")
+    assert attrs == (None, None, False, True, False)
+
+
+def test_tag_options() -> None:
+    assert tag_options("fg_red") == {"foreground": "#ff5555"}
+    assert tag_options("bg_bright_white") == {"background": "#ffffff"}
+    assert tag_options("fg_#102030") == {"foreground": "#102030"}
+    assert tag_options("bg_256_21") == {"background": xterm_256_color(21)}
+    assert tag_options("attr_underline") == {"underline": True}
+    assert xterm_256_color(16) == "#000000"
+    assert xterm_256_color(231) == "#ffffff"
+    assert xterm_256_color(255) == "#eeeeee"
@@ -0,0 +1,133 @@
+# tests/test_changes.py
+import os
+from pathlib import Path
+
+import pytest
+
+from main.core.changes import (
+    BLUEPRINTS,
+    CONFIG,
+    CPP,
+    MAPS,
+    MATERIALS,
+    OTHER,
+    PLUGINS,
+    CategoryMatcher,
+    ChangeIndex,
+    touched_paths,
+)
+from main.core.git import StatusEntry
+
+
+@pytest.mark.parametrize(
+    "path, category",
+    [
+        ("Content/Characters/BP_Hero.uasset", BLUEPRINTS),
+        ("Content/UI/WBP_MainMenu.uasset", BLUEPRINTS),
+        ("Content/Blueprints/Door.uasset", BLUEPRINTS),
+        ("Content/Env/M_Rock.uasset", MATERIALS),
+        ("Content/Env/MI_Rock_Wet.uasset", MATERIALS),
+        ("Content/Materials/Rock.uasset", MATERIALS),
+        ("Content/Maps/Level01.umap", MAPS),
+        ("Content/Maps/Level01_BuiltData.uasset", MAPS),
+        ("Source/Game/Hero.cpp", CPP),
+        ("Source/Game/Game.Build.cs", CPP),
+        ("Config/DefaultEngine.ini", CONFIG),
+        ("Plugins/MyPlugin/Content/BP_Thing.uasset", PLUGINS),
+        ("Plugins/MyPlugin/Source/Plugin.cpp", PLUGINS),
+        ("content/blueprints/door.UASSET", BLUEPRINTS),
+        ("Content/Textures/T_Rock.uasset", OTHER),
+        ("README.md", OTHER),
+        ("Config", OTHER),
+    ],
+)
+def test_classify(path: str, category: str) -> None:
+    assert CategoryMatcher().classify(path) == category
+
+
+def _entry(path: str, worktree: str = "M") -> StatusEntry:
+    return StatusEntry("changed", ".", worktree, path)
+
+
+def test_index_only_sizes_changed_paths() -> None:
+    sized: list[list[str]] = []
+
+    def sizer(root: str, paths: list[str]) -> dict[str, int]:
+        sized.append(list(paths))
+        return {p: 100 for p in paths}
+
+    index = ChangeIndex("/unused", sizer=sizer)
+    entries = [_entry(f"Content/Props/BP_Prop{i}.uasset") for i in range(3000)]
+    entries.append(_entry("Content/Env/M_Rock.uasset"))
+    delta = index.update(entries)
+    assert len(delta.added) == 3001
+    assert index.summary()[BLUEPRINTS] == (3000, 300000)
+    assert index.summary()[MATERIALS] == (1, 100)
+
+    # unveränderter Status: kein stat, keine Änderung
+    sized.clear()
+    assert not index.update(entries)
+    assert sized == []
+
+    # eine Datei neu, eine weg, eine mit anderem Status
+    entries = entries[1:]
+    entries[0] = _entry(entries[0].path, "D")
+    entries.append(_entry("Config/DefaultGame.ini"))
+    delta = index.update(entries)
+    assert delta.added == ["Config/DefaultGame.ini"]
+    assert delta.removed == ["Content/Props/BP_Prop0.uasset"]
+    assert delta.changed == ["Content/Props/BP_Prop1.uasset"]
+    assert sorted(sized[0]) == [
+        "Config/DefaultGame.ini",
+        "Content/Props/BP_Prop1.uasset",
+    ]
+    assert index.summary()[BLUEPRINTS] == (2999, 299900)
+    assert index.summary()[CONFIG] == (1, 100)
+
+
+def test_restat_updates_bytes(tmp_path: Path) -> None:
+    asset = tmp_path / "Content" / "Maps" / "L.umap"
+    asset.parent.mkdir(parents=True)
+    asset.write_bytes(b"x" * 10)
+    index = ChangeIndex(str(tmp_path))
+    entries = [_entry("Content/Maps/L.umap"), _entry("Gone.txt", "D")]
+    index.update(entries)
+    assert index.summary()[MAPS] == (1, 10)
+    # gelöschte Dateien zählen mit 0 Bytes
+    assert index.summary()[OTHER] == (1, 0)
+
+    asset.write_bytes(b"x" * 25)
+    # gleicher Status: ohne restat bleibt der alte Wert
+    index.update(entries)
+    assert index.summary()[MAPS] == (1, 10)
+    delta = index.update(entries, restat=["Content/Maps/L.umap"])
+    assert delta.changed == ["Content/Maps/L.umap"]
+    assert index.summary()[MAPS] == (1, 25)
+    assert index.get("Content/Maps/L.umap").size == 25
+
+
+def test_touched_paths_finds_files_saved_again(tmp_path: Path) -> None:
+    asset = tmp_path / "Content" / "Maps" / "L.umap"
+    asset.parent.mkdir(parents=True)
+    asset.write_bytes(b"x" * 10)
+    entries = [_entry("Content/Maps/L.umap"), _entry("Gone.txt", "D")]
+    index = ChangeIndex(str(tmp_path))
+    mtimes: dict[str, int] = {}
+    index.update(entries, touched_paths(str(tmp_path), entries, mtimes))
+    # erster Lauf: nichts zu vergleichen
+    assert touched_paths(str(tmp_path), entries, mtimes) == []
+
+    asset.write_bytes(b"x" * 25)
+    mtime = mtimes["Content/Maps/L.umap"] + 10**9
+    os.utime(asset, ns=(mtime, mtime))
+    restat = touched_paths(str(tmp_path), entries, mtimes)
+    assert restat == ["Content/Maps/L.umap"]
+    index.update(entries, restat)
+    assert index.summary()[MAPS] == (1, 25)
+
+
+def test_ignored_entries_are_skipped() -> None:
+    index = ChangeIndex("/unused", sizer=lambda root, paths: {})
+    index.update([StatusEntry("ignored", "!", "!", "Saved/Logs/x.log")])
+    assert len(index) == 0
+    assert index.files() == []
@@ -0,0 +1,186 @@
+# tests/test_cleaner.py
+import os
+import stat
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+import main.core.cleaner as cleaner
+from main.core.cleaner import ProjectCleaner
+
+
+def _write(path: Path, size: int) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    # synthetischer Unreal-Projektbaum
+    root = tmp_path / "Game"
+    _write(root / "Game.uproject", 10)
+    _write(root / "Content" / "Hero.uasset", 100)
+    _write(root / "Source" / "Game" / "Game.cpp", 50)
+    for i in range(40):
+        _write(root / "Intermediate" / "Build" / f"d{i % 4}" / f"obj{i}.o", 1000)
+    _write(root / "Saved" / "Logs" / "Game.log", 300)
+    _write(root / "Saved" / "Config" / "Windows" / "Editor.ini", 20)
+    _write(root / "Saved" / "SaveGames" / "slot0.sav", 40)
+    _write(root / "DerivedDataCache" / "a" / "b" / "c.ddp", 5000)
+    _write(root / "Binaries" / "Win64" / "Game.dll", 2000)
+    _write(root / "Plugins" / "Foo" / "Intermediate" / "x.obj", 700)
+    _write(root / "Plugins" / "Foo" / "Source" / "Foo.cpp", 70)
+    return root
+
+
+def test_dry_run_reports_per_folder(project: Path) -> None:
+    plan = ProjectCleaner(str(project)).plan()
+    per_folder = {f.folder: (len(f.files), f.bytes) for f in plan.folders}
+
+    assert per_folder == {
+        "Intermediate": (40, 40000),
+        "Saved": (1, 300),
+        "DerivedDataCache": (1, 5000),
+        "Binaries": (1, 2000),
+        "Plugins/Foo/Intermediate": (1, 700),
+    }
+    assert plan.bytes == 48000
+    assert plan.excluded == ["Saved/Config", "Saved/SaveGames"]
+    # Dry Run löscht nichts
+    assert (project / "Intermediate" / "Build" / "d0" / "obj0.o").exists()
+
+
+def test_clean_deletes_planned_files_only(project: Path) -> None:
+    progress = []
+    cleaner = ProjectCleaner(str(project), workers=4)
+    report = cleaner.clean(on_progress=progress.append)
+
+    assert report.freed_bytes == 48000
+    assert report.files == 44
+    assert not report.errors
+    assert not (project / "Intermediate").exists()
+    assert not (project / "DerivedDataCache").exists()
+    assert not (project / "Plugins" / "Foo" / "Intermediate").exists()
+    # ausgeschlossene und fremde Dateien bleiben
+    assert (project / "Saved" / "Config" / "Windows" / "Editor.ini").exists()
+    assert (project / "Saved" / "SaveGames" / "slot0.sav").exists()
+    assert not (project / "Saved" / "Logs").exists()
+    assert (project / "Content" / "Hero.uasset").exists()
+    assert (project / "Plugins" / "Foo" / "Source" / "Foo.cpp").exists()
+
+    assert progress
+    last = progress[-1]
+    assert (last.files_done, last.files_total) == (44, 44)
+    assert last.bytes_done == last.bytes_total == 48000
+
+
+def test_include_exclude_rules(project: Path) -> None:
+    cleaner = ProjectCleaner(
+        str(project),
+        folders=["Intermediate", "Saved"],
+        exclude=["Intermediate/Build/d1", "*.log"],
+    )
+    plan = cleaner.plan()
+    files = [path for folder in plan.folders for path, _ in folder.files]
+
+    assert [f.folder for f in plan.folders] == ["Intermediate", "Saved"]
+    assert not any(path.startswith("Intermediate/Build/d1/") for path in files)
+    assert "Saved/Logs/Game.log" not in files
+    # ohne Standard-Excludes wird Saved/Config mitgelöscht
+    assert "Saved/Config/Windows/Editor.ini" in files
+
+    cleaner.clean(plan)
+    assert (project / "Intermediate" / "Build" / "d1").is_dir()
+    assert not (project / "Intermediate" / "Build" / "d0").exists()
+
+
+def test_symlinks_are_not_followed(project: Path, tmp_path: Path) -> None:
+    outside = tmp_path / "outside"
+    _write(outside / "keep.txt", 10)
+    try:
+        os.symlink(outside, project / "Intermediate" / "link", target_is_directory=True)
+    except (OSError, NotImplementedError):
+        pytest.skip("keine Symlinks auf diesem System")
+
+    ProjectCleaner(str(project)).clean()
+    assert (outside / "keep.txt").exists()
+    assert not (project / "Intermediate").exists()
+
+
+# lstat einer Junction unter Windows: Verzeichnis mit Reparse-Point
+JUNCTION_STAT = SimpleNamespace(
+    st_mode=stat.S_IFDIR | 0o777,
+    st_size=0,
+    st_file_attributes=stat.FILE_ATTRIBUTE_DIRECTORY
+    | stat.FILE_ATTRIBUTE_REPARSE_POINT,
+    # IO_REPARSE_TAG_MOUNT_POINT, nur unter Windows in stat
+    st_reparse_tag=0xA0000003,
+)
+
+
+class FakeEntry:
+    def __init__(self, entry: os.DirEntry) -> None:
+        self._entry = entry
+        self.name = entry.name
+        self.path = entry.path
+
+    def is_dir(self, follow_symlinks: bool = True) -> bool:
+        # wie DirEntry unter Windows: auch für Junctions True
+        return True
+
+    def stat(self, follow_symlinks: bool = True):
+        return JUNCTION_STAT
+
+
+def test_junctions_are_not_followed(
+    project: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # echte Ordner, die per Mock wie Junctions aussehen
+    _write(project / "Intermediate" / "Linked" / "keep.txt", 10)
+    junctions = {
+        str(project / "Intermediate" / "Linked"),
+        str(project / "Plugins" / "Foo"),
+    }
+    scandir, lstat = os.scandir, os.lstat
+
+    class FakeScandir:
+        def __init__(self, path: str) -> None:
+            self._it = scandir(path)
+
+        def __enter__(self):
+            entries = list(self._it)
+            return [FakeEntry(e) if e.path in junctions else e for e in entries]
+
+        def __exit__(self, *exc) -> None:
+            self._it.close()
+
+    monkeypatch.setattr(cleaner.os, "scandir", FakeScandir)
+    monkeypatch.setattr(
+        cleaner.os,
+        "lstat",
+        lambda path: JUNCTION_STAT if str(path) in junctions else lstat(path),
+    )
+    plan = ProjectCleaner(str(project)).plan()
+
+    # die Junction selbst wird als Link geplant, ihr Inhalt nie
+    files = [path for folder in plan.folders for path, _ in folder.files]
+    assert "Intermediate/Linked" in files
+    assert not any(path.startswith("Intermediate/Linked/") for path in files)
+    # Plugins/Foo ist eine Junction: Plugins/Foo/Intermediate ist kein Ziel
+    assert "Plugins/Foo/Intermediate" not in [f.folder for f in plan.folders]
+
+
+def test_cancel_stops_deleting(project: Path) -> None:
+    cancel = threading.Event()
+    cancel.set()
+    report = ProjectCleaner(str(project)).clean(cancel=cancel)
+    assert report.files == 0
+    assert (project / "Binaries" / "Win64" / "Game.dll").exists()
+
+
+def test_missing_folders(tmp_path: Path) -> None:
+    plan = ProjectCleaner(str(tmp_path)).plan()
+    assert plan.folders == []
+    assert plan.bytes == 0
@@ -0,0 +1,148 @@
+# tests/test_commit_stats.py
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterator
+
+import pytest
+from github import Github, GithubException
+
+from main.github_tools.commits import (
+    REST_FILES_CAP,
+    changed_files_text,
+    commit_stats_graphql,
+    commit_stats_rest,
+)
+
+COMMITS: int = 50
+
+
+def _commit(i: int, port: int) -> dict[str, Any]:
+    sha: str = f"{i:040x}"
+    return {
+        "sha": sha,
+        "url": f"http://127.0.0.1:{port}/repos/owner/repo/commits/{sha}",
+        "commit": {
+            "message": f"commit {i}",
+            "author": {
+                "name": "dev",
+                "email": "dev@example.com",
+                "date": "2025-01-01T00:00:00Z",
+            },
+        },
+    }
+
+
+class FakeGithub(BaseHTTPRequestHandler):
+    requests: list[str] = []
+    graphql_broken: bool = False
+    files: int = 2
+
+    def _json(self, payload: Any) -> None:
+        body: bytes = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self) -> None:
+        FakeGithub.requests.append("POST " + self.path)
+        payload: dict = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if FakeGithub.graphql_broken:
+            self._json({"errors": [{"message": "schema mismatch"}]})
+            return
+        count: int = payload["variables"]["count"]
+        nodes: list[dict] = [
+            {
+                "oid": f"{i:040x}",
+                "additions": i,
+                "deletions": 1,
+                # GitHub liefert für sehr große Commits null
+                "changedFilesIfAvailable": None if i == 1 else 2,
+                "message": f"commit {i}",
+                "author": {
+                    "name": "dev",
+                    "email": "dev@example.com",
+                    "date": "2025-01-01T00:00:00Z",
+                },
+            }
+            for i in range(count)
+        ]
+        self._json({"data": {"repository": {"object": {"history": {"nodes": nodes}}}}})
+
+    def do_GET(self) -> None:
+        FakeGithub.requests.append("GET " + self.path)
+        port: int = self.server.server_address[1]
+        path: str = self.path.split("?", 1)[0]
+        if path.startswith("/repos/owner/repo/commits/"):
+            commit: dict = _commit(int(path.rsplit("/", 1)[1], 16), port)
+            commit["stats"] = {"additions": 3, "deletions": 1, "total": 4}
+            commit["files"] = [
+                {"filename": f"f{n}.uasset"} for n in range(FakeGithub.files)
+            ]
+            self._json(commit)
+        elif path == "/repos/owner/repo/commits":
+            self._json([_commit(i, port) for i in range(COMMITS)])
+        else:
+            self._json(
+                {
+                    "name": "repo",
+                    "full_name": "owner/repo",
+                    "url": f"http://127.0.0.1:{port}/repos/owner/repo",
+                }
+            )
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def client() -> Iterator[Github]:
+    FakeGithub.requests = []
+    FakeGithub.graphql_broken = False
+    FakeGithub.files = 2
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), FakeGithub)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield Github(
+        base_url=f"http://127.0.0.1:{srv.server_address[1]}",
+        seconds_between_requests=None,
+    )
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_graphql_fetches_all_commits_in_one_round_trip(client: Github) -> None:
+    stats: list[dict] = commit_stats_graphql(client, "owner/repo", COMMITS)
+
+    assert len(stats) == COMMITS
+    assert FakeGithub.requests == ["POST /graphql"]
+    assert stats[5]["total"] == 6
+    assert stats[0]["changed_files"] == 2
+    assert changed_files_text(stats[0]) == "2"
+    assert changed_files_text(stats[1]) == "?"
+
+
+def test_graphql_errors_raise(client: Github) -> None:
+    FakeGithub.graphql_broken = True
+    with pytest.raises(GithubException):
+        commit_stats_graphql(client, "owner/repo", 5)
+
+
+def test_rest_fallback_completes_each_commit_once(client: Github) -> None:
+    repo = client.get_repo("owner/repo")
+    FakeGithub.requests = []
+    stats: list[dict] = commit_stats_rest(repo, 10)
+
+    assert [s["sha"] for s in stats] == [f"{i:040x}" for i in range(10)]
+    assert all(s["total"] == 4 and s["changed_files"] == 2 for s in stats)
+    # 1x Liste + 1x pro Commit, keine zusätzlichen Datei-Seiten
+    assert len(FakeGithub.requests) == 11
+
+
+def test_rest_marks_capped_file_lists(client: Github) -> None:
+    repo = client.get_repo("owner/repo")
+    # GitHub listet höchstens 300 Dateien pro Commit
+    FakeGithub.files = REST_FILES_CAP
+    stats: list[dict] = commit_stats_rest(repo, 1)
+    assert changed_files_text(stats[0]) == f"{REST_FILES_CAP}+"
@@ -0,0 +1,144 @@
+# tests/test_config_service.py
+import json
+import logging
+import os
+from pathlib import Path
+
+import pytest
+
+from main.config import ConfigService
+from main.errors import MissingDotEnvFile
+
+TOKEN = "ghp_secret123"
+
+
+@pytest.fixture
+def service(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> ConfigService:
+    monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+    config = tmp_path / "config.json"
+    config.write_text(
+        json.dumps(
+            {
+                "mode": "dark",
+                "git": {"user": "me", "repo": "Game"},
+                "terminal": {"overflow": "drop"},
+            }
+        )
+    )
+    env = tmp_path / ".env"
+    env.write_text(f"GITHUB_TOKEN={TOKEN}\n")
+    return ConfigService(str(config), str(env))
+
+
+def _touch_later(path: Path, text: str) -> None:
+    path.write_text(text)
+    # mtime-Auflösung mancher Dateisysteme: sicher in die Zukunft setzen
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 2_000_000_000))
+
+
+def test_loaded_once(service: ConfigService) -> None:
+    first = service.load()
+    assert service.load() is first
+    assert service.get("terminal.overflow") == "drop"
+    assert service.get("terminal.missing", 7) == 7
+    assert service.loads == 1
+
+
+def test_token_is_kept_out_of_data_and_logs(
+    service: ConfigService, caplog: pytest.LogCaptureFixture
+) -> None:
+    with caplog.at_level(logging.DEBUG):
+        data = service.load()
+        service.set_value("mode", "light")
+    assert service.token == TOKEN
+    assert "token" not in data["git"]
+    assert TOKEN not in caplog.text
+    assert TOKEN not in Path(service.path).read_text()
+
+
+def test_set_writes_atomically_and_notifies(service: ConfigService) -> None:
+    seen: list[set[str]] = []
+    service.subscribe(seen.append, "mode")
+    data = service.load()
+
+    service.set_value("mode", "light")
+    assert data["mode"] == "light"
+    assert json.loads(Path(service.path).read_text())["mode"] == "light"
+    # eigener Schreibvorgang löst kein erneutes Parsen aus
+    service.load()
+    assert service.loads == 1
+    assert seen == [{"mode"}]
+    # keine Temp-Dateien übrig
+    assert sorted(p.name for p in Path(service.path).parent.iterdir()) == [
+        ".env",
+        "config.json",
+    ]
+
+    # unveränderter Wert: kein Schreiben, keine Benachrichtigung
+    service.set_value("mode", "light")
+    assert seen == [{"mode"}]
+
+
+def test_reload_on_external_change(service: ConfigService) -> None:
+    changes: list[set[str]] = []
+    git_changes: list[set[str]] = []
+    data = service.load()
+    service.subscribe(changes.append)
+    service.subscribe(git_changes.append, "git")
+
+    new = dict(data, mode="light", terminal={"overflow": "block"})
+    _touch_later(Path(service.path), json.dumps(new))
+
+    assert service.load() is data
+    assert data["terminal"]["overflow"] == "block"
+    assert service.loads == 2
+    assert changes == [{"mode", "terminal.overflow"}]
+    # nur Abonnenten der geänderten Schlüssel werden benachrichtigt
+    assert git_changes == []
+
+
+def test_unsubscribe(service: ConfigService) -> None:
+    seen: list[set[str]] = []
+    unsubscribe = service.subscribe(seen.append)
+    unsubscribe()
+    service.set_value("git.branch", "main")
+    assert seen == []
+    assert service.get("git.branch") == "main"
+
+
+def test_set_token_goes_to_env_file(service: ConfigService) -> None:
+    service.load()
+    service.set_token("ghp_new")
+    assert service.token == "ghp_new"
+    env = Path(service.env_path).read_text()
+    assert env.count("GITHUB_TOKEN=") == 1
+    assert "ghp_new" in env
+    assert "ghp_new" not in Path(service.path).read_text()
+
+
+def test_missing_env_file(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+    config = tmp_path / "config.json"
+    config.write_text("{}")
+    with pytest.raises(MissingDotEnvFile):
+        ConfigService(str(config), str(tmp_path / ".env")).load()
+
+
+def test_missing_env_file_raises_on_every_load(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+    config = tmp_path / "config.json"
+    config.write_text("{}")
+    env = tmp_path / ".env"
+    service = ConfigService(str(config), str(env))
+    with pytest.raises(MissingDotEnvFile):
+        service.load()
+    # kein gecachter Stand ohne Token
+    with pytest.raises(MissingDotEnvFile):
+        service.load()
+
+    env.write_text(f"GITHUB_TOKEN={TOKEN}\n")
+    service.load()
+    assert service.token == TOKEN
@@ -0,0 +1,94 @@
+# tests/test_counts.py
+import json
+import subprocess
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from github import Github
+
+from main.github_tools.counts import (
+    CommitCountCache,
+    count_local_commits,
+    count_via_link_header,
+)
+
+
+def _git(repo: Path, *args: str) -> None:
+    subprocess.run(["git", "-C", str(repo), *args], check=True, capture_output=True)
+
+
+def _make_repo(path: Path, commits: int) -> Path:
+    path.mkdir()
+    _git(path, "init", "-q")
+    _git(path, "config", "user.email", "dev@example.com")
+    _git(path, "config", "user.name", "dev")
+    _add_commits(path, commits)
+    return path
+
+
+def _add_commits(repo: Path, commits: int) -> None:
+    for _ in range(commits):
+        _git(repo, "commit", "-q", "--allow-empty", "-m", "c")
+
+
+def test_local_count_is_incremental(tmp_path: Path) -> None:
+    repo: Path = _make_repo(tmp_path / "repo", 3)
+    cache = CommitCountCache(tmp_path / "counts.json")
+    assert count_local_commits(str(repo), cache=cache) == 3
+
+    _add_commits(repo, 2)
+    calls: list[str] = []
+    real_count = cache.count
+
+    def spy(key, head, full, since) -> int:
+        # der volle Zähler darf nicht mehr benutzt werden
+        return real_count(key, head, lambda: calls.append("full") or 0, since)
+
+    cache.count = spy  # type: ignore[method-assign]
+    assert count_local_commits(str(repo), cache=cache) == 5
+    assert calls == []
+
+    # Cache überlebt einen Neustart
+    assert CommitCountCache(tmp_path / "counts.json")._counts
+
+
+def test_rewritten_history_is_counted_again(tmp_path: Path) -> None:
+    repo: Path = _make_repo(tmp_path / "repo", 4)
+    cache = CommitCountCache(tmp_path / "counts.json")
+    assert count_local_commits(str(repo), cache=cache) == 4
+
+    _git(repo, "reset", "-q", "--hard", "HEAD~2")
+    _add_commits(repo, 1)
+    assert count_local_commits(str(repo), cache=cache) == 3
+
+
+class Paged(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        assert "per_page=1" in self.path
+        port: int = self.server.server_address[1]
+        body: bytes = json.dumps([{"sha": "abc"}]).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header(
+            "Link",
+            f'<http://127.0.0.1:{port}/repos/o/r/commits?per_page=1&page=2>; rel="next", '
+            f'<http://127.0.0.1:{port}/repos/o/r/commits?per_page=1&page=48211>; rel="last"',
+        )
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def test_link_header_count() -> None:
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), Paged)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    try:
+        client = Github(base_url=f"http://127.0.0.1:{srv.server_address[1]}")
+        assert count_via_link_header(client, "/repos/o/r/commits", {}) == 48211
+    finally:
+        srv.shutdown()
+        srv.server_close()
@@ -0,0 +1,226 @@
+# tests/test_git_engine.py
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+import main.core.git as git_module
+from main.core.git import CatFile, GitRepo, StatusEntry, StatusParser, StatusWorker
+from main.core.jobs import JobScheduler
+from main.errors import GitError, JobCancelled
+
+
+def _git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-C", str(repo), *args], check=True, capture_output=True, text=True
+    ).stdout
+
+
+def _make_repo(path: Path) -> Path:
+    path.mkdir()
+    _git(path, "init", "-q", "-b", "main")
+    _git(path, "config", "user.email", "dev@example.com")
+    _git(path, "config", "user.name", "dev")
+    (path / "Content").mkdir()
+    (path / "Content" / "Hero.uasset").write_bytes(b"\x00asset")
+    (path / "Config").mkdir()
+    (path / "Config" / "DefaultGame.ini").write_text("[Game]\n")
+    (path / "old name.txt").write_text("rename me\n" * 20)
+    _git(path, "add", ".")
+    _git(path, "commit", "-q", "-m", "init")
+    return path
+
+
+def test_status_entries(tmp_path: Path) -> None:
+    repo_path = _make_repo(tmp_path / "repo")
+    (repo_path / "Config" / "DefaultGame.ini").write_text("[Game]\nchanged=1\n")
+    (repo_path / "Content" / "New Map.umap").write_bytes(b"map")
+    _git(repo_path, "mv", "old name.txt", "new name.txt")
+    (repo_path / "Content" / "Hero.uasset").unlink()
+
+    repo = GitRepo(str(repo_path))
+    status = repo.status()
+    entries = {e.path: e for e in status.entries}
+
+    assert status.branch == "main"
+    assert status.head == _git(repo_path, "rev-parse", "HEAD").strip()
+    assert entries["Config/DefaultGame.ini"] == StatusEntry(
+        "changed", ".", "M", "Config/DefaultGame.ini"
+    )
+    assert entries["Content/Hero.uasset"].worktree == "D"
+    # Leerzeichen im Pfad, untracked-Dateien einzeln (-uall)
+    assert entries["Content/New Map.umap"].kind == "untracked"
+    assert entries["new name.txt"] == StatusEntry(
+        "renamed", "R", ".", "new name.txt", "old name.txt"
+    )
+    assert not status.clean
+
+
+def test_clean_repo(tmp_path: Path) -> None:
+    repo = GitRepo(str(_make_repo(tmp_path / "repo")))
+    status = repo.status()
+    assert status.clean
+    assert status.entries == []
+
+
+def test_parser_handles_arbitrary_chunking() -> None:
+    output = (
+        b"# branch.oid 1234\0# branch.head feature\0"
+        b"# branch.upstream origin/feature\0# branch.ab +2 -1\0"
+        b"1 .M N... 100644 100644 100644 aaaa bbbb a file.txt\0"
+        b"2 R. N... 100644 100644 100644 aaaa aaaa R100 to.txt\0from.txt\0"
+        b"u UU N... 100644 100644 100644 100644 a b c both.txt\0"
+        b"? new dir/x.uasset\0! ignored.log\0"
+    )
+    expected = None
+    for size in (1, 2, 3, 7, 64, len(output)):
+        parser = StatusParser()
+        entries = []
+        for i in range(0, len(output), size):
+            entries.extend(parser.feed(output[i : i + size]))
+        if expected is None:
+            expected = entries
+        assert entries == expected
+        assert (parser.branch, parser.upstream, parser.ahead, parser.behind) == (
+            "feature",
+            "origin/feature",
+            2,
+            1,
+        )
+    assert [e.kind for e in expected] == [
+        "changed",
+        "renamed",
+        "unmerged",
+        "untracked",
+        "ignored",
+    ]
+    assert expected[1].orig_path == "from.txt"
+    assert expected[3].path == "new dir/x.uasset"
+
+
+def test_cat_file_reuses_one_process(tmp_path: Path) -> None:
+    repo_path = _make_repo(tmp_path / "repo")
+    cat_file = CatFile(str(repo_path))
+    try:
+        sha, kind, content = cat_file.read("HEAD:Config/DefaultGame.ini")
+        assert kind == "blob"
+        assert content == b"[Game]\n"
+        proc = cat_file._proc
+
+        assert cat_file.read("HEAD")[1] == "commit"
+        assert cat_file.read("HEAD:does/not/exist") is None
+        assert cat_file.read("HEAD:Content/Hero.uasset")[2] == b"\x00asset"
+        # derselbe Prozess für alle Anfragen
+        assert cat_file._proc is proc
+
+        # paralleler Zugriff aus mehreren Threads
+        results: list[bytes] = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(cat_file.read("HEAD:old name.txt")[2])
+            )
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert results == [b"rename me\n" * 20] * 8
+    finally:
+        cat_file.close()
+
+
+def test_cat_file_restarts_after_crash(tmp_path: Path) -> None:
+    cat_file = CatFile(str(_make_repo(tmp_path / "repo")))
+    try:
+        assert cat_file.read("HEAD") is not None
+        cat_file._proc.kill()
+        cat_file._proc.wait()
+        assert cat_file.read("HEAD")[1] == "commit"
+    finally:
+        cat_file.close()
+
+
+def test_status_leaves_the_index_alone(tmp_path: Path) -> None:
+    repo_path = _make_repo(tmp_path / "repo")
+    repo = GitRepo(str(repo_path))
+    # der erste Lauf darf den Index schreiben (Caches), die folgenden nicht
+    repo.status()
+    index = repo_path / ".git" / "index"
+    before = index.stat().st_mtime_ns
+    # neue mtime, gleicher Inhalt: ohne --no-optional-locks schreibt status den Index
+    ini = repo_path / "Config" / "DefaultGame.ini"
+    ini.write_text(ini.read_text())
+    os.utime(ini, ns=(before + 5 * 10**9, before + 5 * 10**9))
+
+    assert repo.status().clean
+    assert index.stat().st_mtime_ns == before
+
+
+def test_untracked_cache_is_written_to_the_index(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    repo_path = _make_repo(tmp_path / "repo")
+    (repo_path / "Saved").mkdir()
+    (repo_path / "Saved" / "Log.txt").write_text("log")
+    index = repo_path / ".git" / "index"
+    assert b"UNTR" not in index.read_bytes()
+
+    repo = GitRepo(str(repo_path))
+    repo.status()
+    # die UNTR-Erweiterung steht im Index, der nächste Lauf nutzt sie
+    assert b"UNTR" in index.read_bytes()
+    # nach dem Intervall schreibt ein Refresh den Cache erneut
+    index.unlink()
+    _git(repo_path, "read-tree", "HEAD")
+    repo.status()
+    assert b"UNTR" not in index.read_bytes()
+    monkeypatch.setattr(git_module, "CACHE_WRITE_INTERVAL", 0.0)
+    repo.status()
+    assert b"UNTR" in index.read_bytes()
+
+
+def test_status_outside_repo_raises(tmp_path: Path) -> None:
+    with pytest.raises(GitError):
+        GitRepo(str(tmp_path)).status()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Alias nutzt sleep")
+def test_run_is_killed_on_cancel(tmp_path: Path) -> None:
+    repo = GitRepo(str(_make_repo(tmp_path / "repo")))
+    cancel = threading.Event()
+    threading.Timer(0.2, cancel.set).start()
+    start = time.monotonic()
+    with pytest.raises(JobCancelled):
+        repo.run("-c", "alias.hang=!sleep 30", "hang", cancel=cancel)
+    assert time.monotonic() - start < 5
+
+
+def test_status_worker_coalesces_refreshes(tmp_path: Path) -> None:
+    repo_path = _make_repo(tmp_path / "repo")
+    results = []
+    seen_new_file = threading.Event()
+
+    def on_status(status) -> None:
+        results.append(status)
+        if any(e.path == "Content/B.uasset" for e in status.entries):
+            seen_new_file.set()
+
+    scheduler = JobScheduler(max_workers=1)
+    worker = StatusWorker(GitRepo(str(repo_path)), on_status, scheduler=scheduler)
+    try:
+        for _ in range(20):
+            worker.refresh()
+        (repo_path / "Content" / "B.uasset").write_bytes(b"b")
+        worker.refresh()
+        assert seen_new_file.wait(10)
+        # 21 Anfragen, aber nur wenige git-Läufe
+        assert 1 <= len(results) <= 3
+        assert worker.last.entries[-1].path == "Content/B.uasset"
+    finally:
+        worker.stop()
+        assert scheduler.shutdown(timeout=5)
@@ -5,7 +5,6 @@ import types
 import pytest
 
 def test_no_real_gui_on_import(monkeypatch: pytest.MonkeyPatch) -> types.NoneType:
-    return
     # Mock Tkinter / customtkinter, falls importiert wird
     monkeypatch.setitem(sys.modules, "tkinter", types.SimpleNamespace(Tk=lambda *a, **k: (_ for _ in ()).throw(RuntimeError("GUI blocked"))))
     monkeypatch.setitem(sys.modules, "customtkinter", types.SimpleNamespace(CTk=lambda *a, **k: (_ for _ in ()).throw(RuntimeError("GUI blocked"))))
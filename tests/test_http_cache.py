@@ -0,0 +1,143 @@
+# tests/test_http_cache.py
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+import requests
+from github import Github
+
+from main.github_tools.connection import get_session, install_pooled_connections
+from main.github_tools.http_cache import (
+    CachingAdapter,
+    ResponseCache,
+    install_http_cache,
+)
+
+
+class FakeGithub(BaseHTTPRequestHandler):
+    """Minimaler GitHub-Server: liefert ETags und beantwortet If-None-Match mit 304."""
+
+    etag: str = '"v1"'
+    full_responses: int = 0
+    not_modified: int = 0
+
+    def do_GET(self) -> None:
+        if self.headers.get("If-None-Match") == FakeGithub.etag:
+            FakeGithub.not_modified += 1
+            self.send_response(304)
+            self.send_header("ETag", FakeGithub.etag)
+            self.send_header("X-RateLimit-Remaining", "4999")
+            self.end_headers()
+            return
+
+        FakeGithub.full_responses += 1
+        port: int = self.server.server_address[1]
+        body: bytes = json.dumps(
+            {
+                "name": "repo",
+                "full_name": "owner/repo",
+                "url": f"http://127.0.0.1:{port}/repos/owner/repo",
+                "stargazers_count": 7,
+            }
+        ).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", FakeGithub.etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def server() -> Iterator[str]:
+    FakeGithub.etag = '"v1"'
+    FakeGithub.full_responses = 0
+    FakeGithub.not_modified = 0
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), FakeGithub)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+    srv.server_close()
+
+
+@pytest.fixture
+def shared_session() -> Iterator[requests.Session]:
+    # die prozessweite Session nach dem Test wiederherstellen
+    session = get_session()
+    adapters = dict(session.adapters)
+    yield session
+    mounted = {session.adapters[p] for p in ("https://", "http://")}
+    session.adapters.clear()
+    session.adapters.update(adapters)
+    for adapter in mounted:
+        if isinstance(adapter, CachingAdapter):
+            adapter.close()
+            adapter.cache.close()
+
+
+def _session(cache: ResponseCache) -> requests.Session:
+    session = requests.Session()
+    session.mount("http://", CachingAdapter(cache))
+    return session
+
+
+def test_second_request_is_served_from_disk(server: str, tmp_path: Path) -> None:
+    cache = ResponseCache(tmp_path / "cache.sqlite3")
+    first = _session(cache).get(f"{server}/repos/owner/repo")
+    cache.close()
+
+    # neuer Prozess: Cache wird von der Platte gelesen
+    cache = ResponseCache(tmp_path / "cache.sqlite3")
+    second = _session(cache).get(f"{server}/repos/owner/repo")
+
+    assert second.status_code == 200
+    assert second.json() == first.json()
+    assert second.headers["X-RateLimit-Remaining"] == "4999"
+    assert FakeGithub.full_responses == 1
+    assert FakeGithub.not_modified == 1
+    assert cache.hits == 1
+
+
+def test_changed_resource_is_downloaded_again(server: str, tmp_path: Path) -> None:
+    cache = ResponseCache(tmp_path / "cache.sqlite3")
+    session: requests.Session = _session(cache)
+    session.get(f"{server}/repos/owner/repo")
+    FakeGithub.etag = '"v2"'
+    session.get(f"{server}/repos/owner/repo")
+    session.get(f"{server}/repos/owner/repo")
+
+    assert FakeGithub.full_responses == 2
+    assert FakeGithub.not_modified == 1
+
+
+def test_lru_eviction_respects_size_cap(server: str, tmp_path: Path) -> None:
+    cache = ResponseCache(tmp_path / "cache.sqlite3", max_bytes=250)
+    session: requests.Session = _session(cache)
+    for path in ("a", "b", "c"):
+        session.get(f"{server}/repos/owner/{path}")
+
+    assert 0 < cache.total_bytes() <= 250
+    # der älteste Eintrag wurde verdrängt
+    FakeGithub.full_responses = 0
+    session.get(f"{server}/repos/owner/a")
+    assert FakeGithub.full_responses == 1
+
+
+def test_pygithub_client_uses_the_cache(
+    server: str, tmp_path: Path, shared_session: requests.Session
+) -> None:
+    install_pooled_connections()
+    cache = install_http_cache(ResponseCache(tmp_path / "cache.sqlite3"))
+    assert cache is not None
+    assert shared_session.adapters["http://"].cache is cache
+
+    assert Github(base_url=server).get_repo("owner/repo").stargazers_count == 7
+    assert Github(base_url=server).get_repo("owner/repo").stargazers_count == 7
+    assert FakeGithub.full_responses == 1
+    assert FakeGithub.not_modified == 1
@@ -0,0 +1,76 @@
+# tests/test_import_time.py
+import os
+import subprocess
+import sys
+
+import pytest
+
+REPO_ROOT: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# erst beim Start der GUI bzw. beim ersten Öffnen eines Tabs benötigt
+HEAVY_MODULES: list[str] = [
+    "github",
+    "CTkTable",
+    "customtkinter",
+    "tkinter",
+    "winpty",
+    "rich.traceback",
+    "toml",
+]
+
+# großzügig, damit langsame CI-Maschinen nicht rot werden
+IMPORT_BUDGET_US: int = 1_000_000
+
+
+def _import_times(module: str) -> dict[str, int]:
+    # "import time: self [us] | cumulative | imported package"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert proc.returncode == 0, proc.stderr
+    times: dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize("module", ["main.main", "run"])
+def test_import_is_light(module: str) -> None:
+    times = _import_times(module)
+    assert module in times
+    # schwere Abhängigkeiten dürfen beim Import noch nicht geladen werden
+    loaded = [name for name in HEAVY_MODULES if name in times]
+    assert loaded == []
+    assert times[module] < IMPORT_BUDGET_US
+
+
+def test_import_has_no_side_effects() -> None:
+    # kein Log-Ordner, keine Temp-Dateien, kein Fenster
+    code = (
+        "import main.main, main._template as t;"
+        "assert t.TMPDIR is None and t.TMPFILE is None;"
+        "import logging; assert not logging.getLogger().handlers"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=60,
+        env={**os.environ, "PYTHONPATH": REPO_ROOT},
+    )
+    assert proc.returncode == 0, proc.stderr
+
+
+def test_dashboard_tab_loads_github_on_first_fetch() -> None:
+    # PyGithub kommt erst mit dem ersten Abruf eines Widgets
+    times = _import_times("main.ui.tabs.dashboard")
+    assert "main.ui.tabs.dashboard" in times
+    assert [name for name in times if name.split(".")[0] == "github"] == []
@@ -0,0 +1,278 @@
+# tests/test_jobs.py
+import threading
+import time
+
+import pytest
+
+from main.core.jobs import (
+    CANCELLED,
+    DONE,
+    FAILED,
+    HIGH,
+    LOW,
+    NORMAL,
+    JobContext,
+    JobScheduler,
+)
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = JobScheduler(max_workers=1, name="test-jobs")
+    yield scheduler
+    assert scheduler.shutdown(timeout=5)
+
+
+def _blocker(scheduler: JobScheduler) -> threading.Event:
+    # belegt den einzigen Worker, bis das Event gesetzt wird
+    gate = threading.Event()
+    started = threading.Event()
+
+    def block(ctx: JobContext) -> None:
+        started.set()
+        gate.wait(5)
+
+    scheduler.submit(block, name="blocker")
+    assert started.wait(5)
+    return gate
+
+
+def _wait_idle(scheduler: JobScheduler) -> None:
+    for job in scheduler.jobs():
+        assert job.wait(5)
+
+
+def test_result_and_callback_run_on_dispatch(scheduler: JobScheduler) -> None:
+    done = []
+    job = scheduler.submit(lambda ctx, a, b: a + b, 2, 3, on_done=done.append)
+    assert job.wait(5)
+    assert job.state == DONE and job.result == 5
+    # Callbacks laufen erst im Dispatcher (im GUI der Tk-Thread)
+    assert done == []
+    assert scheduler.dispatch() == 1
+    assert done == [job]
+
+
+def test_priority_order_and_fifo(scheduler: JobScheduler) -> None:
+    gate = _blocker(scheduler)
+    order = []
+    for name, priority in [
+        ("low", LOW),
+        ("n1", NORMAL),
+        ("high", HIGH),
+        ("n2", NORMAL),
+    ]:
+        scheduler.submit(
+            lambda ctx, n=name: order.append(n), name=name, priority=priority
+        )
+    assert [job.name for job in scheduler.jobs()] == [
+        "blocker",
+        "high",
+        "n1",
+        "n2",
+        "low",
+    ]
+    gate.set()
+    _wait_idle(scheduler)
+    assert order == ["high", "n1", "n2", "low"]
+
+
+def test_cancel_queued_job_never_runs(scheduler: JobScheduler) -> None:
+    gate = _blocker(scheduler)
+    ran = []
+    job = scheduler.submit(lambda ctx: ran.append(1))
+    assert job.cancel()
+    assert job.done and job.state == CANCELLED
+    gate.set()
+    _wait_idle(scheduler)
+    assert ran == []
+    assert not job.cancel()
+
+
+def test_cooperative_cancel_of_running_job(scheduler: JobScheduler) -> None:
+    started = threading.Event()
+
+    def loop(ctx: JobContext) -> None:
+        started.set()
+        while True:
+            ctx.check()
+            ctx.cancel_event.wait(0.01)
+
+    job = scheduler.submit(loop)
+    assert started.wait(5)
+    job.cancel()
+    assert job.wait(5)
+    assert job.state == CANCELLED
+
+
+def test_failure_is_reported(scheduler: JobScheduler) -> None:
+    def fail(ctx: JobContext) -> None:
+        raise RuntimeError("boom")
+
+    job = scheduler.submit(fail)
+    assert job.wait(5)
+    assert job.state == FAILED
+    assert str(job.error) == "boom"
+
+
+def test_progress_is_coalesced(scheduler: JobScheduler) -> None:
+    seen = []
+    reported = threading.Event()
+
+    def work(ctx: JobContext) -> None:
+        for i in range(1, 101):
+            ctx.progress(i, 100, f"{i}/100")
+        reported.set()
+        # erst nach dem Dispatch fertig werden, sonst verfällt der Fortschritt
+        ctx.cancel_event.wait(5)
+
+    job = scheduler.submit(work, on_progress=lambda job, p: seen.append(p))
+    assert reported.wait(5)
+    scheduler.dispatch()
+    # ein Event für 100 Meldungen, mit dem neuesten Stand
+    assert len(seen) == 1
+    assert seen[0].message == "100/100" and seen[0].fraction == 1.0
+    job.cancel()
+    assert job.wait(5)
+
+
+def test_bounded_pool() -> None:
+    scheduler = JobScheduler(max_workers=2)
+    gate = threading.Event()
+    lock = threading.Lock()
+    running = [0]
+    peak = [0]
+
+    def work(ctx: JobContext) -> None:
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        gate.wait(0.05)
+        with lock:
+            running[0] -= 1
+
+    jobs = [scheduler.submit(work) for _ in range(8)]
+    assert all(job.wait(5) for job in jobs)
+    assert peak[0] <= 2
+    assert scheduler.shutdown(timeout=5)
+
+
+def test_shutdown_cancels_and_joins() -> None:
+    scheduler = JobScheduler(max_workers=1)
+    started = threading.Event()
+
+    def loop(ctx: JobContext) -> None:
+        started.set()
+        ctx.cancel_event.wait(5)
+        ctx.check()
+
+    running = scheduler.submit(loop)
+    queued = scheduler.submit(lambda ctx: None)
+    assert started.wait(5)
+    assert scheduler.shutdown(timeout=5)
+    assert running.state == CANCELLED and queued.state == CANCELLED
+    # alle Worker beendet, keine Daemon-Threads nötig
+    assert scheduler._workers == []
+    with pytest.raises(RuntimeError):
+        scheduler.submit(lambda ctx: None)
+
+
+def test_attach_uses_after() -> None:
+    # Ersatz für ein Tk-Widget: after() merkt sich nur den Callback
+    class FakeWidget:
+        def __init__(self) -> None:
+            self.calls = []
+
+        def after(self, ms: int, func) -> None:
+            self.calls.append((ms, func))
+
+    scheduler = JobScheduler(max_workers=1)
+    widget = FakeWidget()
+    done = []
+    scheduler.attach(widget, interval_ms=20)
+    job = scheduler.submit(lambda ctx: 1, on_done=done.append)
+    assert job.wait(5)
+    _, tick = widget.calls[-1]
+    tick()
+    assert done == [job]
+    # der Dispatcher plant sich selbst neu ein
+    assert len(widget.calls) == 2
+    assert scheduler.shutdown(timeout=5)
+
+
+def test_periodic_job_repeats_until_cancelled(scheduler: JobScheduler) -> None:
+    runs = []
+    periodic = scheduler.every(0.05, lambda ctx: runs.append(ctx.job.id), first=0)
+    deadline = time.monotonic() + 5
+    while len(runs) < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    periodic.cancel()
+    assert len(runs) >= 3
+    assert periodic.cancelled and periodic.runs >= 3
+    count = len(runs)
+    time.sleep(0.2)
+    assert len(runs) == count
+    assert scheduler._timers == []
+
+
+def test_periodic_job_skips_while_running(scheduler: JobScheduler) -> None:
+    gate = threading.Event()
+    runs = []
+
+    def slow(ctx: JobContext) -> None:
+        runs.append(1)
+        gate.wait(5)
+
+    periodic = scheduler.every(0.01, slow, first=0)
+    time.sleep(0.2)
+    # der Worker hängt im ersten Lauf, die Timer reihen nichts nach
+    assert len(runs) == 1 and scheduler.jobs() == [periodic.job]
+    gate.set()
+    periodic.cancel()
+
+
+def test_long_running_job_has_its_own_thread() -> None:
+    scheduler = JobScheduler(max_workers=1)
+    woken = threading.Event()
+
+    def reader(ctx: JobContext) -> str:
+        # blockiert in etwas, das nur der Cancel-Hook aufweckt
+        ctx.on_cancel(woken.set)
+        woken.wait(5)
+        return "closed"
+
+    job = scheduler.submit(reader, long_running=True)
+    # der Pool bleibt frei
+    assert scheduler.submit(lambda ctx: 1).wait(5)
+    assert not job.done
+    periodic = scheduler.every(60, lambda ctx: None)
+    assert scheduler.shutdown(timeout=5)
+    assert job.result == "closed" and woken.is_set()
+    assert periodic.cancelled
+
+
+def test_daemon_job_is_abandoned_on_shutdown() -> None:
+    scheduler = JobScheduler(max_workers=1)
+    release, abandoned = threading.Event(), threading.Event()
+
+    def waiter(ctx: JobContext) -> str:
+        # wartet auf etwas, das kein Cancel erreicht
+        ctx.on_cancel(abandoned.set)
+        release.wait(5)
+        return "exited"
+
+    job = scheduler.submit(waiter, long_running=True, daemon=True)
+    assert scheduler.shutdown(timeout=0.5)
+    assert abandoned.wait(5) and not job.done
+    release.set()
+    assert job.wait(5) and job.result == "exited"
+
+
+def test_post_runs_on_dispatch(scheduler: JobScheduler) -> None:
+    calls = []
+    poster = threading.Thread(target=scheduler.post, args=(lambda: calls.append(1),))
+    poster.start()
+    poster.join(5)
+    # erst dispatch() ruft auf, im aufrufenden Thread
+    assert calls == []
+    assert scheduler.dispatch() == 1 and calls == [1]
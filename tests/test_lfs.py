@@ -0,0 +1,149 @@
+# tests/test_lfs.py
+import os
+import random
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from main.core.git import GitRepo, StatusEntry
+from main.core.lfs import AssetIndex, LargeAssetDetector, LfsMatcher, inspect_file
+
+GITATTRIBUTES = """
+# Unreal
+*.uasset filter=lfs diff=lfs merge=lfs -text
+*.umap filter=lfs diff=lfs merge=lfs -text
+Content/Movies/** filter=lfs
+/RootOnly.bin filter=lfs
+Content/Small/*.uasset -filter
+*.[Pp][Nn][Gg] filter=lfs
+"""
+
+
+@pytest.mark.parametrize(
+    "path, expected",
+    [
+        ("Content/Hero.uasset", True),
+        ("Content/Maps/L.umap", True),
+        ("Content/Movies/Intro.mp4", True),
+        ("Content/Movies/Sub/Intro.mp4", True),
+        ("RootOnly.bin", True),
+        ("Sub/RootOnly.bin", False),
+        ("Content/Small/Icon.uasset", False),
+        ("Content/UI/Logo.PNG", True),
+        ("Source/Game.cpp", False),
+        ("Content\\Hero.uasset", True),
+    ],
+)
+def test_gitattributes_matcher(path: str, expected: bool) -> None:
+    matcher = LfsMatcher(ignore_case=False)
+    matcher.add_file(GITATTRIBUTES)
+    assert matcher.matches(path) is expected
+
+
+def test_nested_gitattributes_are_relative() -> None:
+    matcher = LfsMatcher(ignore_case=False)
+    matcher.add_file("*.wav filter=lfs\n", base="Plugins/Audio")
+    assert matcher.matches("Plugins/Audio/Content/a.wav")
+    assert not matcher.matches("Content/a.wav")
+
+
+def test_inspect_file(tmp_path: Path) -> None:
+    pointer = tmp_path / "pointer.uasset"
+    pointer.write_bytes(
+        b"version https://git-lfs.github.com/spec/v1\noid sha256:abc\nsize 123\n"
+    )
+    info = inspect_file(str(pointer), pointer.stat().st_size)
+    assert info.lfs_pointer and not info.binary
+
+    text = tmp_path / "config.ini"
+    text.write_text("[Section]\nkey=value\n" * 2000)
+    info = inspect_file(str(text), text.stat().st_size)
+    # Text komprimiert gut
+    assert not info.binary and info.packed < info.size // 10
+
+
+def _write_random(path: Path, size: int) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"\0" + random.Random(size).randbytes(size - 1))
+
+
+def test_detector_report_and_cache(tmp_path: Path) -> None:
+    root = tmp_path / "project"
+    (root / "Content").mkdir(parents=True)
+    (root / ".gitattributes").write_text("*.umap filter=lfs\n")
+    _write_random(root / "Content" / "Big.uasset", 300_000)
+    _write_random(root / "Content" / "Huge.umap", 400_000)
+    _write_random(root / "Content" / "Small.uasset", 1_000)
+    (root / "Config.ini").write_text("x=1\n" * 10_000)
+
+    index = AssetIndex(tmp_path / "index.sqlite3")
+    detector = LargeAssetDetector(str(root), threshold=100_000, index=index)
+    entries = [
+        StatusEntry("untracked", "?", "?", "Content/Big.uasset"),
+        StatusEntry("changed", ".", "M", "Content/Huge.umap"),
+        StatusEntry("untracked", "?", "?", "Content/Small.uasset"),
+        StatusEntry("changed", ".", "M", "Config.ini"),
+        StatusEntry("changed", ".", "D", "Content/Deleted.uasset"),
+    ]
+    report = detector.scan(entries)
+
+    assert [a.path for a in report.untracked_large] == ["Content/Big.uasset"]
+    assert [a.path for a in report.lfs_large] == ["Content/Huge.umap"]
+    assert report.files == 4
+    assert report.lfs_bytes == 400_000
+    # Zufallsdaten komprimieren nicht, die ini fast vollständig
+    assert 700_000 < report.push_bytes < 702_000 + 40_000
+    assert index.misses == 4 and index.hits == 0
+
+    # zweiter Lauf: alles aus dem Index, nichts wird geöffnet
+    report = detector.scan(entries)
+    assert index.hits == 4
+    assert report.untracked_large[0].size == 300_000
+
+    # geänderte Datei (andere Größe/mtime) wird neu untersucht
+    _write_random(root / "Content" / "Big.uasset", 50_000)
+    stat = os.stat(root / "Content" / "Big.uasset")
+    os.utime(
+        root / "Content" / "Big.uasset", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9)
+    )
+    report = detector.scan(entries)
+    assert report.untracked_large == []
+    assert index.misses == 5
+
+    # der Index überlebt einen Neustart
+    index.close()
+    assert (
+        AssetIndex(tmp_path / "index.sqlite3").get_many({str(root / "unused"): (0, 0)})
+        == {}
+    )
+
+
+def test_sizes_works_as_change_index_sizer(tmp_path: Path) -> None:
+    (tmp_path / "a.bin").write_bytes(b"12345")
+    detector = LargeAssetDetector(
+        str(tmp_path), matcher=LfsMatcher(), index=AssetIndex(tmp_path / "i.sqlite3")
+    )
+    assert detector.sizes(str(tmp_path), ["a.bin", "missing.bin"]) == {"a.bin": 5}
+
+
+def test_detector_reads_nested_gitattributes_of_the_repo(tmp_path: Path) -> None:
+    root = tmp_path / "project"
+    (root / "Content").mkdir(parents=True)
+    subprocess.run(["git", "init", "-q", str(root)], check=True)
+    (root / "Content" / ".gitattributes").write_text("*.uasset filter=lfs\n")
+    subprocess.run(["git", "-C", str(root), "add", "."], check=True)
+    _write_random(root / "Content" / "Big.uasset", 300_000)
+
+    index = AssetIndex(tmp_path / "index.sqlite3")
+    entries = [StatusEntry("untracked", "?", "?", "Content/Big.uasset")]
+    # ohne Repository nur die .gitattributes im Wurzelordner
+    report = LargeAssetDetector(str(root), 100_000, index=index).scan(entries)
+    assert [a.path for a in report.untracked_large] == ["Content/Big.uasset"]
+
+    detector = LargeAssetDetector(
+        str(root), 100_000, index=index, repo=GitRepo(str(root))
+    )
+    report = detector.scan(entries)
+    assert report.untracked_large == []
+    assert [a.path for a in report.lfs_large] == ["Content/Big.uasset"]
@@ -0,0 +1,87 @@
+# tests/test_logbuffer.py
+import logging
+import threading
+
+import pytest
+
+from main.core.logbuffer import RingBufferHandler
+
+
+def _logger(handler: RingBufferHandler, name: str) -> logging.Logger:
+    logger: logging.Logger = logging.getLogger(name)
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(handler)
+    return logger
+
+
+def test_keeps_only_the_last_records() -> None:
+    handler = RingBufferHandler(capacity=3)
+    logger: logging.Logger = _logger(handler, "test_logbuffer.capacity")
+    for i in range(10):
+        logger.info(f"line {i}")
+
+    assert handler.records() == ["line 7", "line 8", "line 9"]
+
+
+def test_subscribers_get_replay_and_live_records_filtered_by_level() -> None:
+    handler = RingBufferHandler()
+    logger: logging.Logger = _logger(handler, "test_logbuffer.subscribe")
+    logger.debug("old debug")
+    logger.warning("old warning")
+
+    panel_a: list[str] = []
+    panel_b: list[str] = []
+    unsubscribe = handler.subscribe(panel_a.append, level=logging.WARNING)
+    handler.subscribe(panel_b.append)
+
+    logger.info("new info")
+    logger.error("new error")
+    unsubscribe()
+    logger.error("after unsubscribe")
+
+    assert panel_a == ["old warning", "new error"]
+    assert panel_b == [
+        "old debug",
+        "old warning",
+        "new info",
+        "new error",
+        "after unsubscribe",
+    ]
+
+
+def test_broken_subscriber_does_not_break_logging() -> None:
+    handler = RingBufferHandler()
+    logger: logging.Logger = _logger(handler, "test_logbuffer.broken")
+
+    def broken(_: str) -> None:
+        raise RuntimeError("widget destroyed")
+
+    handler.subscribe(broken)
+    logger.info("still logged")
+    assert handler.records() == ["still logged"]
+
+
+def test_subscribers_run_outside_the_lock() -> None:
+    handler = RingBufferHandler()
+    logger: logging.Logger = _logger(handler, "test_logbuffer.lock")
+    seen: list[str] = []
+
+    def log_from_other_thread(message: str) -> None:
+        seen.append(message)
+        if message == "first":
+            # hielte emit() noch eine Sperre, bliebe dieser Thread hängen
+            worker = threading.Thread(target=logger.info, args=("second",))
+            worker.start()
+            worker.join(2)
+            assert not worker.is_alive()
+
+    handler.subscribe(log_from_other_thread)
+    logger.info("first")
+    assert seen == ["first", "second"]
+
+
+def test_level_must_be_an_int() -> None:
+    # getLevelName() liefert für unbekannte Namen "Level X"
+    with pytest.raises(TypeError):
+        RingBufferHandler().subscribe(print, level=logging.getLevelName("VERBOSE"))
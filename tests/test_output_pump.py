@@ -0,0 +1,209 @@
+# tests/test_output_pump.py
+import threading
+
+import pytest
+
+from main.ui.pump import OutputPump
+
+
+class FakeScheduler:
+    """Ersetzt Tk's after(): Callbacks werden gesammelt und manuell ausgeführt."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[int, object]] = []
+
+    def __call__(self, delay: int, callback) -> None:
+        self.calls.append((delay, callback))
+
+    def run_next(self) -> int:
+        delay, callback = self.calls.pop(0)
+        callback()
+        return delay
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_idle_pump_schedules_nothing() -> None:
+    scheduler = FakeScheduler()
+    OutputPump(scheduler, lambda chunk: None)
+    assert scheduler.calls == []
+
+
+def test_post_wakes_pump_once() -> None:
+    scheduler = FakeScheduler()
+    seen: list[str] = []
+    pump = OutputPump(scheduler, seen.append)
+
+    pump.post("a")
+    pump.post("b")
+    pump.post("")
+    # nur ein Wakeup, egal wie viele Chunks kommen
+    assert len(scheduler.calls) == 1
+    assert scheduler.run_next() == 0
+    assert seen == ["a", "b"]
+    assert scheduler.calls == []
+
+    pump.post("c")
+    assert len(scheduler.calls) == 1
+
+
+def test_time_budget_carries_leftovers_to_next_frame() -> None:
+    scheduler = FakeScheduler()
+    clock = FakeClock()
+    seen: list[str] = []
+    frames: list[int] = []
+
+    def handler(chunk: str) -> None:
+        seen.append(chunk)
+        clock.now += 0.003  # jeder Chunk kostet 3 ms
+
+    pump = OutputPump(
+        scheduler,
+        handler,
+        on_frame=lambda: frames.append(len(seen)),
+        budget_ms=8,
+        frame_ms=16,
+        clock=clock,
+    )
+    for i in range(7):
+        pump.post(str(i))
+
+    assert scheduler.run_next() == 0
+    assert seen == ["0", "1", "2"]
+    assert scheduler.run_next() == 16
+    assert seen == ["0", "1", "2", "3", "4", "5"]
+    assert scheduler.run_next() == 16
+    assert seen == [str(i) for i in range(7)]
+    assert scheduler.calls == []
+    assert frames == [3, 6, 7]
+
+
+def test_char_budget_limits_frame_size() -> None:
+    scheduler = FakeScheduler()
+    seen: list[str] = []
+    pump = OutputPump(scheduler, seen.append, max_frame_chars=10)
+    for _ in range(5):
+        pump.post("x" * 4)
+    scheduler.run_next()
+    assert len(seen) == 3
+    assert pump.pending == 8
+
+
+def test_drop_reports_skipped_lines() -> None:
+    scheduler = FakeScheduler()
+    seen: list[str] = []
+    skipped: list[int] = []
+    pump = OutputPump(
+        scheduler, seen.append, on_skipped=skipped.append, max_pending=100
+    )
+    for i in range(30):
+        pump.post(f"line {i:02d}\n")  # 8 Zeichen pro Zeile
+
+    assert pump.pending <= 100
+    scheduler.run_next()
+    assert skipped and sum(skipped) + len(seen) == 30
+    # das Ende der Ausgabe bleibt erhalten
+    assert seen[-1] == "line 29\n"
+    assert pump.stats["skipped_lines"] == sum(skipped)
+
+
+def test_block_never_waits_in_post() -> None:
+    scheduler = FakeScheduler()
+    seen: list[str] = []
+    pump = OutputPump(scheduler, seen.append, max_pending=10, overflow="block")
+    pump.post("x" * 10)
+    assert pump.full
+
+    # der geteilte Reader-Thread darf nie hängen, auch nicht bei vollem Puffer
+    thread = threading.Thread(target=pump.post, args=("y",))
+    thread.start()
+    thread.join(2)
+    assert not thread.is_alive()
+    assert pump.pending == 11
+    scheduler.run_next()
+    assert seen == ["x" * 10, "y"]
+
+
+def test_block_drops_past_the_hard_limit() -> None:
+    scheduler = FakeScheduler()
+    seen: list[str] = []
+    skipped: list[int] = []
+    pump = OutputPump(
+        scheduler,
+        seen.append,
+        on_skipped=skipped.append,
+        max_pending=10,
+        overflow="block",
+    )
+    # ein Producer, der `full` ignoriert, kann den Speicher nicht sprengen
+    for i in range(10):
+        pump.post(f"{i}bc\n")
+    assert pump.pending <= 20
+    scheduler.run_next()
+    assert seen[-1] == "9bc\n"
+    assert sum(skipped) + len(seen) == 10
+
+
+def test_closed_pump_ignores_posts() -> None:
+    pump = OutputPump(FakeScheduler(), lambda chunk: None, overflow="block")
+    pump.post("x")
+    pump.close()
+    pump.post("y")
+    assert pump.pending == 0
+
+
+def test_invalid_overflow_mode() -> None:
+    with pytest.raises(ValueError):
+        OutputPump(FakeScheduler(), lambda chunk: None, overflow="ignore")
+
+
+def test_paused_pump_buffers_until_resume() -> None:
+    scheduler = FakeScheduler()
+    seen: list[str] = []
+    pump = OutputPump(scheduler, seen.append)
+    pump.pause()
+    pump.post("a")
+    pump.post("b")
+    # versteckter Tab: nichts wird gerendert oder geplant
+    assert scheduler.calls == []
+
+    pump.resume()
+    assert len(scheduler.calls) == 1
+    scheduler.run_next()
+    assert seen == ["a", "b"]
+
+
+def test_pause_while_scheduled() -> None:
+    scheduler = FakeScheduler()
+    seen: list[str] = []
+    pump = OutputPump(scheduler, seen.append)
+    pump.post("a")
+    pump.pause()
+    scheduler.run_next()
+    assert seen == []
+    pump.resume()
+    scheduler.run_next()
+    assert seen == ["a"]
+
+
+def test_drain_callback_after_full() -> None:
+    scheduler = FakeScheduler()
+    drained: list[bool] = []
+    pump = OutputPump(
+        scheduler,
+        lambda chunk: None,
+        on_drain=lambda: drained.append(True),
+        max_pending=10,
+        overflow="block",
+    )
+    pump.post("x" * 10)
+    assert pump.full
+    scheduler.run_next()
+    assert not pump.full
+    assert drained == [True]
@@ -0,0 +1,236 @@
+# tests/test_prelaunch.py
+import json
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from main.core.jobs import JobContext, JobScheduler
+from main.core.prelaunch import (
+    FAILED,
+    OK,
+    RUNNING,
+    SKIPPED,
+    Check,
+    CheckPipeline,
+    build_prelaunch_checks,
+)
+
+
+def _sleep(seconds: float, detail: str = "done"):
+    def check(ctx: JobContext) -> str:
+        time.sleep(seconds)
+        return detail
+
+    return check
+
+
+def test_wall_time_is_critical_path() -> None:
+    # drei unabhängige Checks à 0.2s + ein abhängiger 0.1s -> ~0.3s statt 0.7s
+    pipeline = CheckPipeline(
+        [
+            Check("a", _sleep(0.2)),
+            Check("b", _sleep(0.2)),
+            Check("c", _sleep(0.2)),
+            Check("d", _sleep(0.1), ("a", "b")),
+        ]
+    )
+    start = time.perf_counter()
+    results = pipeline.run(timeout=5)
+    elapsed = time.perf_counter() - start
+
+    assert {r.status for r in results.values()} == {OK}
+    assert elapsed < 0.55
+    assert sum(r.elapsed for r in results.values()) >= 0.7
+    assert pipeline.passed
+
+
+def test_dependency_runs_after_its_deps() -> None:
+    events: list[str] = []
+    lock = threading.Lock()
+
+    def record(name: str):
+        def check(ctx: JobContext) -> None:
+            with lock:
+                events.append(name)
+
+        return check
+
+    pipeline = CheckPipeline(
+        [
+            Check("launch", record("launch"), ("sync", "files")),
+            Check("sync", record("sync"), ("git",)),
+            Check("git", record("git")),
+            Check("files", record("files")),
+        ]
+    )
+    assert pipeline.order.index("git") < pipeline.order.index("sync")
+    pipeline.run(timeout=5)
+    assert events[-1] == "launch"
+    assert events.index("git") < events.index("sync")
+
+
+def test_failure_skips_dependents() -> None:
+    def broken(ctx: JobContext) -> None:
+        raise RuntimeError("git missing")
+
+    pipeline = CheckPipeline(
+        [
+            Check("git", broken),
+            Check("repo", _sleep(0), ("git",)),
+            Check("conflicts", _sleep(0), ("repo",)),
+            Check("plugins", _sleep(0)),
+            Check("optional", broken, required=False),
+        ]
+    )
+    results = pipeline.run(timeout=5)
+    assert results["git"].status == FAILED
+    assert results["git"].detail == "git missing"
+    assert results["repo"].status == SKIPPED
+    assert results["conflicts"].status == SKIPPED
+    assert results["plugins"].status == OK
+    assert not pipeline.passed
+
+    # poll() liefert jeden Zustandswechsel, auch "running"
+    updates = pipeline.poll()
+    assert [u.status for u in updates if u.name == "plugins"] == [RUNNING, OK]
+    assert {u.name for u in updates if u.status == SKIPPED} == {"repo", "conflicts"}
+
+
+def test_optional_failure_still_passes() -> None:
+    def broken(ctx: JobContext) -> None:
+        raise RuntimeError("offline")
+
+    pipeline = CheckPipeline(
+        [Check("a", _sleep(0)), Check("b", broken, required=False)]
+    )
+    pipeline.run(timeout=5)
+    assert pipeline.passed
+
+
+def test_invalid_graphs() -> None:
+    with pytest.raises(ValueError):
+        CheckPipeline([Check("a", _sleep(0), ("b",)), Check("b", _sleep(0), ("a",))])
+    with pytest.raises(ValueError):
+        CheckPipeline([Check("a", _sleep(0), ("missing",))])
+    with pytest.raises(ValueError):
+        CheckPipeline([Check("a", _sleep(0)), Check("a", _sleep(0))])
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="nutzt ein POSIX-Executable")
+def test_default_checks_on_a_project(tmp_path: Path) -> None:
+    repo = tmp_path / "Project"
+    repo.mkdir()
+    subprocess.run(["git", "-C", str(repo), "init", "-q"], check=True)
+    project = repo / "Game.uproject"
+    project.write_text(json.dumps({"Plugins": [{"Name": "A", "Enabled": True}]}))
+    editor = tmp_path / "UnrealEditor"
+    editor.write_text("#!/bin/sh\n")
+    editor.chmod(0o755)
+
+    checks = build_prelaunch_checks(
+        {"unreal": str(editor), "unreal_project_file": str(project)}
+    )
+    pipeline = CheckPipeline(checks)
+    results = pipeline.run(timeout=30)
+
+    assert results["unreal"].status == OK
+    assert results["project"].status == OK
+    assert results["git"].detail.startswith("git ")
+    assert results["repo"].status == OK
+    assert results["conflicts"].status == OK
+    assert results["plugins"].detail == "1 enabled"
+    # kein Remote: fetch ist ok, aber ohne Upstream
+    assert results["sync"].detail == "No upstream"
+    assert pipeline.passed
+
+
+def test_sync_fetches_once_per_interval(tmp_path: Path) -> None:
+    remote = tmp_path / "remote.git"
+    subprocess.run(["git", "init", "-q", "--bare", str(remote)], check=True)
+    repo = tmp_path / "Project"
+    repo.mkdir()
+    subprocess.run(["git", "-C", str(repo), "init", "-q"], check=True)
+    subprocess.run(
+        ["git", "-C", str(repo), "remote", "add", "origin", str(remote)], check=True
+    )
+    paths = {"repo": str(repo)}
+
+    def sync(interval: float):
+        checks = build_prelaunch_checks(paths, fetch_interval=interval)
+        return CheckPipeline(checks).run(timeout=30)["sync"]
+
+    assert sync(600).status == OK
+    # Remote weg: innerhalb des Intervalls wird gar nicht erst gefetcht
+    remote.rename(tmp_path / "gone.git")
+    assert sync(600).status == OK
+    assert sync(0).status == FAILED
+    # ein fehlgeschlagener Fetch zählt nicht, der nächste Check versucht es wieder
+    assert sync(600).status == FAILED
+
+
+def test_missing_editor_blocks_start(tmp_path: Path) -> None:
+    checks = build_prelaunch_checks(
+        {"unreal": str(tmp_path / "nope.exe"), "unreal_project_file": ""}
+    )
+    pipeline = CheckPipeline(checks)
+    results = pipeline.run(timeout=30)
+    assert results["unreal"].status == FAILED
+    assert results["plugins"].status == SKIPPED
+    assert not pipeline.passed
+
+
+def test_cancel_stops_running_and_queued_checks() -> None:
+    scheduler = JobScheduler(max_workers=1)
+    started = threading.Event()
+
+    def hang(ctx: JobContext) -> str:
+        started.set()
+        ctx.cancel_event.wait(5)
+        ctx.check()
+        return "never"
+
+    pipeline = CheckPipeline(
+        [Check("fetch", hang), Check("plugins", _sleep(0))], scheduler=scheduler
+    )
+    pipeline.start()
+    assert started.wait(5)
+    pipeline.cancel()
+    assert pipeline._done.wait(5)
+    assert {r.detail for r in pipeline.results.values()} == {"Cancelled"}
+    assert {r.status for r in pipeline.results.values()} == {FAILED}
+    assert scheduler.shutdown(timeout=5)
+
+
+def test_checks_finishing_after_cancel_start_no_dependents() -> None:
+    scheduler = JobScheduler(max_workers=1)
+    started, release = threading.Event(), threading.Event()
+    ran = []
+
+    def stubborn(ctx: JobContext) -> str:
+        # ignoriert den Abbruch und endet OK
+        started.set()
+        release.wait(5)
+        return "done"
+
+    def dependent(ctx: JobContext) -> str:
+        ran.append(True)
+        return "ran"
+
+    pipeline = CheckPipeline(
+        [Check("repo", stubborn), Check("sync", dependent, ("repo",))],
+        scheduler=scheduler,
+    )
+    pipeline.start()
+    assert started.wait(5)
+    pipeline.cancel()
+    release.set()
+    assert pipeline._done.wait(5)
+    assert pipeline.results["repo"].status == OK
+    sync = pipeline.results["sync"]
+    assert (sync.status, sync.detail) == (SKIPPED, "Cancelled")
+    assert ran == []
+    assert scheduler.shutdown(timeout=5)
@@ -0,0 +1,218 @@
+# tests/test_projects.py
+import logging
+import threading
+import time
+
+import pytest
+
+from main.core.jobs import JobScheduler
+from main.core.projects import (
+    Project,
+    ProjectRegistry,
+    WidgetResult,
+    projects_from_config,
+)
+
+PROJECTS = [Project(f"Game{i}", f"user/Game{i}", f"/work/Game{i}") for i in range(3)]
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeTasks:
+    """Zählt Fetches pro Projekt; `gate` hält sie bei Bedarf an."""
+
+    def __init__(self) -> None:
+        self.calls: dict[str, int] = {}
+        self.gate = threading.Event()
+        self.gate.set()
+        self.fail = False
+
+    def __call__(self, project: Project) -> dict:
+        def info() -> str:
+            self.gate.wait(5)
+            self.calls[project.name] = self.calls.get(project.name, 0) + 1
+            if self.fail:
+                raise RuntimeError("offline")
+            return f"{project.name} #{self.calls[project.name]}"
+
+        return {"repo_info": info, "local_status": lambda: "clean"}
+
+
+def _wait_idle(registry: ProjectRegistry, name: str) -> None:
+    deadline = time.monotonic() + 5
+    while registry.is_refreshing(name):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def setup():
+    clock, tasks = FakeClock(), FakeTasks()
+    scheduler = JobScheduler(name="test-projects")
+    registry = ProjectRegistry(
+        PROJECTS, tasks, interval=30.0, clock=clock, scheduler=scheduler
+    )
+    yield registry, clock, tasks
+    registry.stop()
+    tasks.gate.set()
+    assert scheduler.shutdown(timeout=5)
+
+
+def test_switch_returns_cache_then_refreshes(setup) -> None:
+    registry, clock, tasks = setup
+    registry.switch("Game1")
+    _wait_idle(registry, "Game1")
+    assert registry.state("Game1").results["repo_info"].value == "Game1 #1"
+    registry.poll()
+
+    # zweiter Wechsel: Cache sofort da, Refresh läuft noch
+    tasks.gate.clear()
+    registry.switch("Game0")
+    state = registry.switch("Game1")
+    assert state.results["repo_info"].value == "Game1 #1"
+    assert registry.is_refreshing("Game1")
+
+    tasks.gate.set()
+    _wait_idle(registry, "Game1")
+    _wait_idle(registry, "Game0")
+    assert state.results["repo_info"].value == "Game1 #2"
+    polled = {(name, r.name) for name, r in registry.poll()}
+    assert ("Game1", "repo_info") in polled
+    assert ("Game1", "local_status") in polled
+
+
+def test_load_time_is_logged(setup, caplog: pytest.LogCaptureFixture) -> None:
+    registry, clock, tasks = setup
+    with caplog.at_level(logging.INFO):
+        registry.switch("Game1")
+        _wait_idle(registry, "Game1")
+    assert "Dashboard widget 'repo_info' loaded in" in caplog.text
+    assert "Dashboard widget 'local_status' loaded in" in caplog.text
+
+
+def test_refresh_is_not_started_twice(setup) -> None:
+    registry, clock, tasks = setup
+    tasks.gate.clear()
+    assert registry.refresh("Game2")
+    assert not registry.refresh("Game2")
+    tasks.gate.set()
+    _wait_idle(registry, "Game2")
+    assert tasks.calls["Game2"] == 1
+
+
+def test_background_refresh_is_staggered(setup) -> None:
+    registry, clock, tasks = setup
+    registry.active = "Game0"
+
+    # Projekt i ist erst nach i * interval / n fällig
+    assert registry.tick() is None
+    clock.now = 10.0
+    assert registry.tick() == "Game1"
+    _wait_idle(registry, "Game1")
+    assert registry.tick() is None
+    clock.now = 20.0
+    assert registry.tick() == "Game2"
+    _wait_idle(registry, "Game2")
+
+    # das aktive Projekt wird nicht im Hintergrund geladen
+    clock.now = 45.0
+    assert registry.tick() == "Game1"
+    _wait_idle(registry, "Game1")
+    assert "Game0" not in tasks.calls
+
+
+def test_one_background_refresh_at_a_time(setup) -> None:
+    registry, clock, tasks = setup
+    registry.active = "Game0"
+    clock.now = 100.0
+    tasks.gate.clear()
+    assert registry.tick() == "Game1"
+    assert registry.tick() is None
+    tasks.gate.set()
+    _wait_idle(registry, "Game1")
+    assert registry.tick() == "Game2"
+    _wait_idle(registry, "Game2")
+
+
+def test_error_keeps_last_good_value(setup) -> None:
+    registry, clock, tasks = setup
+    registry.refresh("Game0")
+    _wait_idle(registry, "Game0")
+    tasks.fail = True
+    registry.refresh("Game0")
+    _wait_idle(registry, "Game0")
+
+    assert registry.state("Game0").results["repo_info"].value == "Game0 #1"
+    # der Fehler kommt nicht in die Queue, das Widget zeigt weiter den alten Wert
+    assert not [r for _, r in registry.poll() if r.error is not None]
+
+
+def test_error_without_good_value_is_shown(setup) -> None:
+    registry, clock, tasks = setup
+    tasks.fail = True
+    registry.refresh("Game0")
+    _wait_idle(registry, "Game0")
+    errors = [r for _, r in registry.poll() if r.error is not None]
+    assert errors and isinstance(errors[0].error, RuntimeError)
+    assert registry.state("Game0").results["repo_info"].error is errors[0].error
+
+
+def test_posted_results_are_cached_and_queued(setup) -> None:
+    registry, clock, tasks = setup
+    registry.post("Game2", WidgetResult("local_status", "main, 0 changes", None, 0.1))
+    assert registry.state("Game2").results["local_status"].value == "main, 0 changes"
+    assert registry.poll() == [
+        ("Game2", WidgetResult("local_status", "main, 0 changes", None, 0.1))
+    ]
+
+    # ein Fehler überschreibt den letzten guten Wert nicht und wird nicht gezeigt
+    registry.post("Game2", WidgetResult("local_status", None, OSError(), 0.0))
+    assert registry.state("Game2").results["local_status"].value == "main, 0 changes"
+    assert registry.poll() == []
+
+
+def test_projects_from_config() -> None:
+    single = projects_from_config(
+        {
+            "git": {"user": "me", "repo": "Game"},
+            "paths": {"unreal_project_file": "/work/Game/Game.uproject"},
+        }
+    )
+    assert single == [
+        Project("Game", "me/Game", "/work/Game", "/work/Game/Game.uproject")
+    ]
+
+    many = projects_from_config(
+        {
+            "git": {"user": "me", "repo": "Game"},
+            "projects": [
+                {"repo": "me/A", "unreal_project_file": "/work/A/A.uproject"},
+                {"name": "Bee", "repo": "me/B", "path": "/src/B"},
+            ],
+        }
+    )
+    assert [p.name for p in many] == ["A", "Bee"]
+    assert many[0].path == "/work/A"
+    assert many[1].path == "/src/B"
+
+
+def test_duplicate_names() -> None:
+    with pytest.raises(ValueError):
+        ProjectRegistry([PROJECTS[0], PROJECTS[0]], FakeTasks())
+
+
+def test_start_ticks_as_a_periodic_job(setup) -> None:
+    registry, clock, tasks = setup
+    registry.start()
+    ticker = registry._ticker
+    assert ticker.interval == pytest.approx(2.5)
+    assert ticker in [t[2] for t in registry._scheduler._timers]
+    registry.stop()
+    assert ticker.cancelled
+    assert registry._scheduler._timers == []
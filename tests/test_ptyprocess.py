@@ -0,0 +1,68 @@
+# tests/test_ptyprocess.py
+import sys
+import time
+
+import pytest
+
+from main.core.ptyprocess import PtyProcess, spawn_pty
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == "win32", reason="POSIX-Backend, winpty braucht eine Konsole"
+)
+
+
+def read_until(proc, needle: bytes, timeout: float = 5.0) -> bytes:
+    output = b""
+    deadline = time.monotonic() + timeout
+    while needle not in output and time.monotonic() < deadline:
+        if not proc.wait_readable(deadline - time.monotonic()):
+            break
+        data = proc.read()
+        if data == b"":
+            break
+        output += data or b""
+    return output
+
+
+def test_command_output_and_eof() -> None:
+    proc = spawn_pty(["/bin/sh", "-c", "printf 'hello\\n'"])
+    try:
+        output = read_until(proc, b"never")
+        # ONLCR der PTY macht aus \n ein \r\n
+        assert output == b"hello\r\n"
+        assert proc.read() == b""
+    finally:
+        proc.close()
+
+
+def test_interactive_shell_roundtrip() -> None:
+    proc = spawn_pty("/bin/sh")
+    try:
+        proc.write("echo $((40 + 2))" + proc.newline)
+        assert b"42" in read_until(proc, b"42")
+        assert proc.isalive()
+    finally:
+        proc.close()
+    assert not proc.isalive()
+
+
+def test_child_sees_a_terminal() -> None:
+    # ohne TERM in der Umgebung setzt das Backend einen Default
+    env = {"PATH": "/usr/bin:/bin"}
+    proc = spawn_pty(["/bin/sh", "-c", "test -t 1 && echo tty; echo $TERM"], env=env)
+    try:
+        output = read_until(proc, b"xterm-256color")
+        assert b"tty" in output
+        assert b"xterm-256color" in output
+    finally:
+        proc.close()
+
+
+def test_backend_must_implement_the_interface() -> None:
+    class Incomplete(PtyProcess):
+        def fileno(self) -> int:
+            return 0
+
+    # read/write/isalive/close fehlen
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,123 @@
+# tests/test_ptyreader.py
+import sys
+import threading
+import time
+
+import pytest
+
+from main.core.jobs import JobScheduler
+from main.core.ptyprocess import spawn_pty
+from main.core.ptyreader import PtyReader
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == "win32", reason="POSIX-Backend, winpty braucht eine Konsole"
+)
+
+
+class Collector:
+    def __init__(self) -> None:
+        self.data = b""
+        self.eof = threading.Event()
+        self.threads: set[str] = set()
+
+    def on_data(self, data: bytes) -> None:
+        self.threads.add(threading.current_thread().name)
+        self.data += data
+
+    def on_eof(self) -> None:
+        self.eof.set()
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_one_thread_serves_many_sessions() -> None:
+    scheduler = JobScheduler(max_workers=1, name="terminal")
+    reader = PtyReader(scheduler)
+    threads_before = threading.active_count()
+    procs, collectors = [], []
+    try:
+        for i in range(4):
+            proc = spawn_pty(["/bin/sh", "-c", f"echo session-{i}"])
+            collector = Collector()
+            reader.register(proc, collector.on_data, collector.on_eof)
+            procs.append(proc)
+            collectors.append(collector)
+
+        for i, collector in enumerate(collectors):
+            assert collector.eof.wait(5)
+            assert f"session-{i}".encode() in collector.data
+            assert collector.threads == {"terminal-pty-reader"}
+        # genau ein zusätzlicher Thread für alle Sessions
+        assert threading.active_count() - threads_before <= 1
+        assert reader.sessions == 0
+    finally:
+        reader.close()
+        for proc in procs:
+            proc.close()
+        assert scheduler.shutdown(timeout=5)
+
+
+def test_pause_and_resume() -> None:
+    reader = PtyReader()
+    proc = spawn_pty("/bin/sh")
+    collector = Collector()
+    try:
+        reader.register(proc, collector.on_data, collector.on_eof)
+        proc.write("echo first" + proc.newline)
+        assert wait_for(lambda: b"first\r\n" in collector.data)
+
+        reader.pause(proc)
+        time.sleep(0.1)
+        size = len(collector.data)
+        proc.write("echo second" + proc.newline)
+        time.sleep(0.3)
+        # pausiert: Ausgabe bleibt in der PTY liegen
+        assert len(collector.data) == size
+
+        reader.resume(proc)
+        assert wait_for(lambda: b"second\r\n" in collector.data)
+    finally:
+        reader.unregister(proc)
+        reader.close()
+        proc.close()
+
+
+def test_unregister_stops_callbacks() -> None:
+    reader = PtyReader()
+    proc = spawn_pty("/bin/sh")
+    collector = Collector()
+    try:
+        reader.register(proc, collector.on_data, collector.on_eof)
+        assert wait_for(lambda: reader.sessions == 1)
+        reader.unregister(proc)
+        assert wait_for(lambda: reader.sessions == 0)
+        size = len(collector.data)
+        proc.write("echo ignored" + proc.newline)
+        time.sleep(0.2)
+        assert len(collector.data) == size
+        assert not collector.eof.is_set()
+    finally:
+        reader.close()
+        proc.close()
+
+
+def test_shutdown_stops_the_reader() -> None:
+    scheduler = JobScheduler(max_workers=1)
+    reader = PtyReader(scheduler)
+    proc = spawn_pty("/bin/sh")
+    try:
+        reader.register(proc, Collector().on_data, Collector().on_eof)
+        assert wait_for(lambda: reader.sessions == 1)
+        # der Cancel weckt den Selector, kein Thread bleibt hängen
+        assert scheduler.shutdown(timeout=5)
+        assert reader._job.done
+    finally:
+        reader.close()
+        proc.close()
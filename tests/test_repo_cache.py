@@ -0,0 +1,93 @@
+# tests/test_repo_cache.py
+import threading
+import time
+
+import pytest
+
+from main.github_tools.cache import CoalescingCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now: float = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_hits_misses_and_ttl() -> None:
+    clock = FakeClock()
+    cache = CoalescingCache(ttl=10, clock=clock)
+    calls: list[str] = []
+
+    def load() -> str:
+        calls.append("load")
+        return "repo"
+
+    assert cache.get("o/a", load) == "repo"
+    assert cache.get("o/a", load) == "repo"
+    assert len(calls) == 1
+
+    clock.now = 11  # abgelaufen
+    cache.get("o/a", load)
+    assert len(calls) == 2
+
+    stats: dict[str, int] = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+
+
+def test_lru_eviction_keeps_several_repos() -> None:
+    cache = CoalescingCache(max_entries=2)
+    for name in ("o/a", "o/b"):
+        cache.get(name, lambda name=name: name)
+    cache.get("o/a", lambda: "reloaded")  # o/a wird zuletzt benutzt
+    cache.get("o/c", lambda: "o/c")
+
+    assert cache.get("o/a", lambda: "reloaded") == "o/a"
+    assert cache.get("o/b", lambda: "reloaded") == "reloaded"
+    assert cache.stats()["evictions"] >= 1
+
+
+def test_concurrent_callers_share_one_inflight_call() -> None:
+    cache = CoalescingCache()
+    started = threading.Event()
+    release = threading.Event()
+    calls: list[int] = []
+
+    def load() -> str:
+        calls.append(1)
+        started.set()
+        release.wait(2)
+        return "repo"
+
+    results: list[str] = []
+    threads: list[threading.Thread] = [
+        threading.Thread(target=lambda: results.append(cache.get("o/a", load)))
+        for _ in range(5)
+    ]
+    threads[0].start()
+    started.wait(2)
+    for t in threads[1:]:
+        t.start()
+    deadline: float = time.monotonic() + 2
+    while cache.stats()["coalesced"] < 4 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    release.set()
+    for t in threads:
+        t.join(2)
+
+    assert results == ["repo"] * 5
+    assert len(calls) == 1
+    assert cache.stats()["coalesced"] == 4
+
+
+def test_errors_are_shared_but_not_cached() -> None:
+    cache = CoalescingCache()
+
+    def broken() -> None:
+        raise LookupError("404")
+
+    with pytest.raises(LookupError):
+        cache.get("o/missing", broken)
+    assert cache.get("o/missing", lambda: "created") == "created"
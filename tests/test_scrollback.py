@@ -0,0 +1,77 @@
+# tests/test_scrollback.py
+import threading
+
+from main.ui.widgets.scrollback import ScrollbackTextbox, coalesce_chunks
+
+
+def test_adjacent_chunks_with_same_tags_are_merged() -> None:
+    chunks = [
+        ("a", ()),
+        ("b", ()),
+        ("c", ("fg_red",)),
+        ("", ("fg_red",)),
+        ("d", ("fg_red",)),
+        ("e", ()),
+    ]
+    assert coalesce_chunks(chunks) == [("ab", ()), ("cd", ("fg_red",)), ("e", ())]
+
+
+def test_empty_input() -> None:
+    assert coalesce_chunks([]) == []
+
+
+class FakeText:
+    """Nachbau der wenigen tk.Text-Aufrufe, die der Flush braucht."""
+
+    def __init__(self) -> None:
+        self.content = ""
+
+    def configure(self, **kwargs) -> None:
+        pass
+
+    def insert(self, index: str, *args) -> None:
+        assert index == "end"
+        self.content += "".join(args[0::2])
+
+    def index(self, index: str) -> str:
+        assert index == "end-1c"
+        lines = self.content.split("\n")
+        return f"{len(lines)}.{len(lines[-1])}"
+
+    def delete(self, start: str, end: str) -> None:
+        assert start == "1.0" and end.endswith(".0")
+        drop = int(end.split(".")[0]) - 1
+        self.content = "\n".join(self.content.split("\n")[drop:])
+
+    def see(self, index: str) -> None:
+        pass
+
+
+def _textbox(max_lines: int) -> ScrollbackTextbox:
+    # ohne Display: nur der Puffer, Tk-Text durch FakeText ersetzt
+    box = ScrollbackTextbox.__new__(ScrollbackTextbox)
+    box.max_lines = max_lines
+    box.flush_interval = 16
+    box._trim_slack = max(1, max_lines // 10)
+    box._pending = []
+    box._pending_lock = threading.Lock()
+    box._flush_scheduled = False
+    box._textbox = FakeText()
+    box.after = lambda ms, func: None
+    return box
+
+
+def test_line_cap_keeps_memory_flat() -> None:
+    box = _textbox(max_lines=100)
+    for i in range(2000):
+        box.append(f"line {i}\n")
+        if i % 37 == 0:
+            box.flush()
+    box.flush()
+
+    lines = box._textbox.content.split("\n")
+    # Grenze plus Spielraum fürs gebündelte Löschen, nie mehr
+    assert len(lines) <= box.max_lines + box._trim_slack
+    assert len(lines) >= box.max_lines
+    assert lines[-2:] == ["line 1999", ""]
+    assert lines[0] == f"line {2000 - len(lines) + 1}"
@@ -0,0 +1,117 @@
+# tests/test_snapshot.py
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from main.core.git import GitRepo
+from main.core.snapshot import REF_PREFIX, SnapshotStore
+from main.errors import SnapshotError
+
+
+def _git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-C", str(repo), *args], check=True, capture_output=True, text=True
+    ).stdout
+
+
+def _make_repo(path: Path) -> Path:
+    path.mkdir()
+    _git(path, "init", "-q", "-b", "main")
+    _git(path, "config", "user.email", "dev@example.com")
+    _git(path, "config", "user.name", "dev")
+    (path / "Content").mkdir()
+    (path / "Content" / "Hero.uasset").write_bytes(b"\x00hero v1")
+    (path / "Config").mkdir()
+    (path / "Config" / "DefaultGame.ini").write_text("[Game]\n")
+    _git(path, "add", ".")
+    _git(path, "commit", "-q", "-m", "init")
+    return path
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> GitRepo:
+    repo = GitRepo(str(_make_repo(tmp_path / "repo")))
+    yield repo
+    repo.close()
+
+
+def test_snapshot_and_restore(repo: GitRepo) -> None:
+    root = Path(repo.path)
+    (root / "Content" / "Hero.uasset").write_bytes(b"\x00hero v2")
+    (root / "Content" / "Maps").mkdir()
+    (root / "Content" / "Maps" / "New.umap").write_bytes(b"map" * 1000)
+
+    store = SnapshotStore(repo)
+    info = store.create("vor dem Pull")
+
+    assert info.stash is not None
+    assert info.untracked == ["Content/Maps/New.umap"]
+    assert info.bytes == len(b"\x00hero v2") + 3000
+    assert _git(root, "rev-parse", REF_PREFIX + info.id).strip() == info.stash
+    # Arbeitsverzeichnis bleibt unverändert
+    assert (root / "Content" / "Hero.uasset").read_bytes() == b"\x00hero v2"
+    # Store liegt im .git-Ordner, git sieht ihn nicht
+    assert str(store.root).startswith(str(root / ".git"))
+
+    # "Pull": Änderungen weg, untracked-Datei ersetzt
+    _git(root, "checkout", "--", ".")
+    (root / "Content" / "Maps" / "New.umap").unlink()
+    (root / "Content" / "Maps" / "New.umap").write_bytes(b"other")
+
+    store.restore(info.id)
+    assert (root / "Content" / "Hero.uasset").read_bytes() == b"\x00hero v2"
+    assert (root / "Content" / "Maps" / "New.umap").read_bytes() == b"map" * 1000
+
+
+def test_untracked_files_are_linked_not_copied(repo: GitRepo) -> None:
+    root = Path(repo.path)
+    big = root / "Content" / "Big.uasset"
+    big.write_bytes(os.urandom(1024 * 1024))
+
+    info = SnapshotStore(repo).create()
+    assert info.stash is None
+    assert info.bytes == 1024 * 1024
+    # Hardlink oder Reflink: nichts zusätzlich geschrieben
+    assert info.stored_bytes == 0
+
+
+def test_clean_tree(repo: GitRepo) -> None:
+    info = SnapshotStore(repo).create()
+    assert info.stash is None
+    assert info.untracked == []
+    assert info.bytes == 0
+
+
+def test_retention(repo: GitRepo) -> None:
+    root = Path(repo.path)
+    store = SnapshotStore(repo, keep=2)
+    ids = []
+    for i in range(3):
+        (root / "Config" / "DefaultGame.ini").write_text(f"[Game]\nrun={i}\n")
+        ids.append(store.create(f"run {i}").id)
+
+    assert [s.id for s in store.snapshots()] == ids[:0:-1]
+    assert not (store.root / ids[0]).exists()
+    refs = _git(root, "for-each-ref", "--format=%(refname)", REF_PREFIX)
+    assert REF_PREFIX + ids[0] not in refs
+    assert REF_PREFIX + ids[2] in refs
+
+
+def test_max_bytes_eviction(repo: GitRepo, tmp_path: Path) -> None:
+    root = Path(repo.path)
+    store = SnapshotStore(repo, root=tmp_path / "store", max_bytes=0)
+    # wie auf einem anderen Laufwerk: nur echte Kopien belegen Platz
+    store._cloner.reflink = store._cloner.hardlink = False
+    (root / "a.bin").write_bytes(b"a")
+    first = store.create()
+    second = store.create()
+    # der neueste bleibt immer erhalten
+    assert [s.id for s in store.snapshots()] == [second.id]
+    assert first.id != second.id
+
+
+def test_restore_unknown(repo: GitRepo) -> None:
+    with pytest.raises(SnapshotError):
+        SnapshotStore(repo).restore("missing")
@@ -0,0 +1,114 @@
+# tests/test_staging.py
+import os
+import subprocess
+import threading
+from pathlib import Path
+
+import pytest
+
+from main.core.changes import BLUEPRINTS, MAPS
+from main.core.git import GitRepo
+from main.core.lfs import LfsMatcher
+from main.core.staging import ADD, StagingPipeline, entry_paths
+from main.errors import JobCancelled
+
+
+def _git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-C", str(repo), *args], check=True, capture_output=True, text=True
+    ).stdout
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> GitRepo:
+    path = tmp_path / "repo"
+    path.mkdir()
+    _git(path, "init", "-q", "-b", "main")
+    _git(path, "config", "user.email", "dev@example.com")
+    _git(path, "config", "user.name", "dev")
+    (path / "Content").mkdir()
+    (path / "Content" / "Old.uasset").write_bytes(b"old")
+    (path / "Content" / "Gone.uasset").write_bytes(b"gone")
+    _git(path, "add", ".")
+    _git(path, "commit", "-q", "-m", "init")
+
+    # Änderungen: neue Blueprints, eine Map, geändert und gelöscht
+    for i in range(25):
+        (path / "Content" / f"BP_Actor{i}.uasset").write_bytes(os.urandom(2048))
+    (path / "Content" / "Maps").mkdir()
+    (path / "Content" / "Maps" / "Level.umap").write_bytes(b"map")
+    (path / "Content" / "Old.uasset").write_bytes(b"new")
+    (path / "Content" / "Gone.uasset").unlink()
+    # Sonderzeichen dürfen nicht als Pathspec-Muster gelesen werden
+    (path / "Content" / "BP_Weird[1]*.uasset").write_bytes(b"weird")
+    repo = GitRepo(str(path))
+    yield repo
+    repo.close()
+
+
+def _staged(repo: GitRepo) -> set[str]:
+    names = _git(Path(repo.path), "diff", "--cached", "--name-only")
+    return set(names.split("\n")) - {""}
+
+
+def test_stage_in_batches(repo: GitRepo) -> None:
+    pipeline = StagingPipeline(repo, batch_size=10, lfs=LfsMatcher())
+    events = []
+    report = pipeline.stage(repo.status().entries, on_progress=events.append)
+
+    changed = {e.path for e in repo.status().entries}
+    assert _staged(repo) == changed
+    assert len(changed) == 29
+    assert report.files == 29 and report.batches == 3
+    assert [e.files_done for e in events] == [10, 20, 29]
+    assert all(e.phase == ADD for e in events)
+    assert events[-1].bytes_done == events[-1].bytes_total
+    # git add schreibt echte Stat-Daten: nichts gilt als geändert
+    assert _git(Path(repo.path), "diff-files", "--name-only") == ""
+    # schon gestaged: ein zweiter Lauf tut nichts
+    assert pipeline.stage(repo.status().entries).files == 0
+
+
+def test_cancel_keeps_finished_batches(repo: GitRepo) -> None:
+    cancel = threading.Event()
+
+    def on_progress(progress) -> None:
+        if progress.phase == ADD:
+            cancel.set()
+
+    pipeline = StagingPipeline(repo, batch_size=10, lfs=LfsMatcher())
+    with pytest.raises(JobCancelled):
+        pipeline.stage(repo.status().entries, on_progress, cancel)
+    assert len(_staged(repo)) == 10
+
+    # weiter ab dem Rest
+    report = pipeline.stage(repo.status().entries)
+    assert report.files == 19
+    assert len(_staged(repo)) == 29
+
+
+def test_commit_only_selected_categories(repo: GitRepo) -> None:
+    pipeline = StagingPipeline(repo, lfs=LfsMatcher())
+    pipeline.stage(repo.status().entries)
+
+    maps = pipeline.select(repo.status().entries, [MAPS])
+    assert entry_paths(maps) == ["Content/Maps/Level.umap"]
+    head = pipeline.commit("Nur Maps", entry_paths(maps))
+
+    assert head == _git(Path(repo.path), "rev-parse", "HEAD").strip()
+    committed = _git(Path(repo.path), "show", "--name-only", "--format=", "HEAD")
+    assert committed.split() == ["Content/Maps/Level.umap"]
+    # die Blueprints bleiben gestaged
+    blueprints = pipeline.select(repo.status().entries, [BLUEPRINTS])
+    assert len(blueprints) == 26
+    assert all(e.index != "." for e in blueprints)
+
+
+def test_old_git_passes_paths_as_arguments(repo: GitRepo) -> None:
+    pipeline = StagingPipeline(repo, batch_size=100, lfs=LfsMatcher())
+    pipeline._from_file = False
+    # kleine Grenze: mehrere Aufrufe trotz großer batch_size
+    batches = list(pipeline._batches(["a" * 10000, "b" * 10000, "c" * 10000]))
+    assert [len(b) for b in batches] == [2, 1]
+    pipeline.stage(repo.status().entries)
+    assert len(_staged(repo)) == 29
@@ -0,0 +1,136 @@
+# tests/test_unreal_supervisor.py
+import os
+import sys
+import textwrap
+import threading
+
+import pytest
+
+from main.core.jobs import JobScheduler
+from main.core.unreal import EditorSupervisor
+from main.errors import UnrealLaunchError
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == "win32", reason="Stub-Editor braucht ein Shebang-Skript"
+)
+
+
+@pytest.fixture
+def fake_editor(tmp_path) -> str:
+    # Stub statt UnrealEditor: etwas Speicher, kurz schlafen, Exit-Code 3
+    script = tmp_path / "UnrealEditor"
+    script.write_text(f"#!{sys.executable}\n" + textwrap.dedent("""
+            import sys, time
+            data = bytearray(16 * 1024 * 1024)
+            time.sleep(float(sys.argv[2]) if len(sys.argv) > 2 else 0.4)
+            sys.exit(3)
+            """))
+    script.chmod(0o755)
+    return str(script)
+
+
+def test_launch_returns_immediately_and_reports_exit(fake_editor, tmp_path) -> None:
+    exited = threading.Event()
+    sessions = []
+
+    def on_exit(session) -> None:
+        sessions.append(session)
+        exited.set()
+
+    editor = EditorSupervisor(
+        fake_editor, str(tmp_path / "Game.uproject"), on_exit=on_exit
+    )
+    pid = editor.launch()
+    assert pid > 0
+    assert editor.running
+
+    session = editor.wait(10)
+    assert exited.wait(5)
+    assert session is not None
+    assert session.returncode == 3
+    assert session.pid == pid
+    assert sessions == [session]
+    assert not editor.running
+
+
+def test_samples_are_collected(fake_editor, tmp_path) -> None:
+    editor = EditorSupervisor(
+        fake_editor, str(tmp_path / "Game.uproject"), sample_interval=0.05
+    )
+    editor.launch()
+    session = editor.wait(10)
+
+    if not os.path.exists("/proc/self/stat"):
+        pytest.skip("weder /proc noch psutil")
+    assert session.samples
+    # der Stub hält mindestens 16 MiB
+    assert session.peak_rss >= 16 * 1024 * 1024
+    assert all(s.t >= 0 and s.cpu_percent >= 0 for s in session.samples)
+
+
+def test_post_close_hooks_run_before_wait_returns(fake_editor, tmp_path) -> None:
+    calls = []
+    editor = EditorSupervisor(
+        fake_editor, str(tmp_path / "Game.uproject"), sample_interval=0
+    )
+    editor.add_post_close_hook(lambda session: calls.append("a"))
+    # ein fehlerhafter Hook blockiert die anderen nicht
+    editor.add_post_close_hook(lambda session: 1 / 0)
+    editor.add_post_close_hook(lambda session: calls.append(session.returncode))
+
+    editor.launch()
+    editor.wait(10)
+    assert calls == ["a", 3]
+
+
+def test_relaunch_after_exit(fake_editor, tmp_path) -> None:
+    editor = EditorSupervisor(
+        fake_editor, str(tmp_path / "Game.uproject"), ["0.1"], sample_interval=0
+    )
+    first = editor.launch()
+    assert editor.wait(10).pid == first
+    second = editor.launch()
+    assert editor.wait(10).pid == second
+
+
+def test_second_launch_while_running_fails(fake_editor, tmp_path) -> None:
+    editor = EditorSupervisor(
+        fake_editor, str(tmp_path / "Game.uproject"), ["5"], sample_interval=0
+    )
+    editor.launch()
+    try:
+        with pytest.raises(UnrealLaunchError):
+            editor.launch()
+    finally:
+        editor.terminate()
+        assert editor.wait(10) is not None
+
+
+def test_missing_editor(tmp_path) -> None:
+    editor = EditorSupervisor(
+        str(tmp_path / "missing"), str(tmp_path / "Game.uproject")
+    )
+    with pytest.raises(UnrealLaunchError):
+        editor.launch()
+    assert not editor.running
+
+
+def test_shutdown_stops_supervising_but_not_the_editor(fake_editor, tmp_path) -> None:
+    scheduler = JobScheduler(max_workers=1)
+    editor = EditorSupervisor(
+        fake_editor,
+        str(tmp_path / "Game.uproject"),
+        ["2"],
+        sample_interval=0.05,
+        scheduler=scheduler,
+    )
+    editor.launch()
+    assert scheduler.shutdown(timeout=5)
+    # nicht mehr überwacht: wait() kehrt zurück, kein Sampler, der Editor läuft
+    assert editor.wait(5) is None
+    assert not editor.running and editor._sampler_job is None
+    assert editor._proc.poll() is None
+    # der aufgegebene Warte-Thread endet mit dem Editor, ohne Meldung
+    editor.terminate()
+    assert editor._wait_job.wait(5)
+    assert editor.last_session is None
@@ -0,0 +1,323 @@
+# tests/test_workflow.py
+import subprocess
+import time
+from pathlib import Path
+
+import pytest
+
+from main.core.git import GitRepo
+from main.core.jobs import CANCELLED, JobScheduler
+from main.core.staging import StagingPipeline
+from main.core.workflow import (
+    DONE,
+    FAILED,
+    PENDING,
+    SKIPPED,
+    Checkpoint,
+    Step,
+    StepMetrics,
+    WorkflowEngine,
+    build_unreal_steps,
+    default_checkpoint_path,
+    main,
+)
+
+
+def _git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-C", str(repo), *args], check=True, capture_output=True, text=True
+    ).stdout
+
+
+@pytest.fixture
+def clone(tmp_path: Path) -> Path:
+    # "GitHub": ein bare Repository, dazu ein Klon als Arbeitskopie
+    remote = tmp_path / "remote.git"
+    subprocess.run(
+        ["git", "init", "-q", "--bare", "-b", "main", str(remote)], check=True
+    )
+    seed = tmp_path / "seed"
+    seed.mkdir()
+    _git(seed, "init", "-q", "-b", "main")
+    _git(seed, "config", "user.email", "dev@example.com")
+    _git(seed, "config", "user.name", "dev")
+    (seed / "Hero.uasset").write_bytes(b"\x00hero v1")
+    _git(seed, "add", ".")
+    _git(seed, "commit", "-q", "-m", "init")
+    _git(seed, "push", "-q", str(remote), "main")
+
+    path = tmp_path / "clone"
+    subprocess.run(["git", "clone", "-q", str(remote), str(path)], check=True)
+    _git(path, "config", "user.email", "dev@example.com")
+    _git(path, "config", "user.name", "dev")
+    return path
+
+
+def _steps(calls: list[str], fail: set[str]) -> list[Step]:
+    def make(name: str) -> Step:
+        def run(ctx) -> dict:
+            calls.append(name)
+            if name in fail:
+                raise RuntimeError(f"{name} kaputt")
+            ctx.log(f"{name} ok")
+            return {name: len(calls)}
+
+        return Step(name, run)
+
+    return [make(name) for name in ("pull", "add", "push")]
+
+
+def test_resume_after_failed_step(tmp_path: Path) -> None:
+    calls: list[str] = []
+    fail = {"push"}
+    checkpoint = Checkpoint(tmp_path / "workflow.json")
+    metrics = StepMetrics(tmp_path / "metrics.json")
+    engine = WorkflowEngine(_steps(calls, fail), checkpoint, metrics)
+
+    result = engine.run()
+    assert not result.ok and result.failed_step == "push"
+    assert engine.states["push"].status == FAILED
+    assert engine.resumable()["completed"] == ["pull", "add"]
+
+    # zweiter Lauf: pull und add kommen aus dem Checkpoint
+    fail.clear()
+    engine = WorkflowEngine(_steps(calls, fail), checkpoint, metrics)
+    result = engine.run()
+    assert result.ok and result.resumed_from == "push"
+    assert calls == ["pull", "add", "push", "push"]
+    assert engine.states["pull"].resumed and engine.states["pull"].status == DONE
+    # Daten früherer Schritte bleiben erhalten
+    assert result.data == {"pull": 1, "add": 2, "push": 4}
+    assert checkpoint.load() is None
+
+    summary = metrics.summary("push")
+    assert summary.count == 2 and summary.failures == 1
+    assert sum(count for _, count in metrics.histogram("pull")) == 1
+    # neu geladen aus der Datei
+    assert StepMetrics(tmp_path / "metrics.json").summary("push").count == 2
+
+
+def test_fresh_run_ignores_checkpoint(tmp_path: Path) -> None:
+    calls: list[str] = []
+    checkpoint = Checkpoint(tmp_path / "workflow.json")
+    WorkflowEngine(_steps(calls, {"add"}), checkpoint).run()
+    assert WorkflowEngine(_steps(calls, set()), checkpoint).run(resume=False).ok
+    assert calls == ["pull", "add", "pull", "add", "push"]
+
+
+def test_checkpoint_of_other_steps_is_not_resumed(tmp_path: Path) -> None:
+    calls: list[str] = []
+    checkpoint = Checkpoint(tmp_path / "workflow.json")
+    WorkflowEngine(_steps(calls, {"push"}), checkpoint).run()
+    other = WorkflowEngine(_steps(calls, set())[:2], checkpoint)
+    assert other.resumable() is None
+
+
+def test_cancel_keeps_step_pending(tmp_path: Path) -> None:
+    checkpoint = Checkpoint(tmp_path / "workflow.json")
+
+    def wait(ctx) -> dict:
+        while True:
+            ctx.check()
+            time.sleep(0.01)
+
+    engine = WorkflowEngine(
+        [Step("pull", lambda ctx: {"head": "abc"}), Step("launch", wait)], checkpoint
+    )
+    scheduler = JobScheduler(max_workers=1)
+    progress = []
+    job = engine.start(scheduler, on_progress=lambda job, p: progress.append(p))
+    while engine.states["launch"].status != "running":
+        assert not job.wait(0.01)
+    # Fortschritt kommt über den Dispatcher: pull fertig, launch läuft
+    scheduler.dispatch()
+    assert progress and progress[-1].total == 2
+    job.cancel()
+    assert job.wait(5) and job.state == CANCELLED
+    assert engine.states["launch"].status == PENDING
+    assert engine.resumable()["completed"] == ["pull"]
+    assert scheduler.shutdown(timeout=5)
+
+
+def test_unreal_steps_against_local_remote(clone: Path) -> None:
+    repo = GitRepo(str(clone))
+    try:
+        steps = build_unreal_steps(repo, message="Neue Assets")
+        assert [s.name for s in steps] == ["pull", "status", "add", "commit", "push"]
+        engine = WorkflowEngine(steps, Checkpoint(default_checkpoint_path(repo)))
+
+        # ohne Änderungen werden add/commit/push übersprungen
+        result = engine.run()
+        assert result.ok and result.data["changes"] == 0
+        assert engine.states["push"].status == SKIPPED
+
+        (clone / "Hero.uasset").write_bytes(b"\x00hero v2")
+        (clone / "Maps").mkdir()
+        (clone / "Maps" / "Level.umap").write_bytes(b"map")
+        result = engine.run()
+        assert result.ok, result.error
+        assert result.data["changes"] == 2 and result.data["pushed"] == "main"
+        remote_head = _git(clone, "ls-remote", "origin", "main").split()[0]
+        assert remote_head == result.data["commit"]
+        assert _git(clone, "log", "-1", "--format=%s").strip() == "Neue Assets"
+    finally:
+        repo.close()
+
+
+def test_failed_push_resumes_without_recommitting(clone: Path) -> None:
+    repo = GitRepo(str(clone))
+    try:
+        steps = build_unreal_steps(repo, remote="nowhere", snapshot=False)
+        engine = WorkflowEngine(
+            steps, Checkpoint(default_checkpoint_path(repo)), repo=repo
+        )
+        (clone / "Hero.uasset").write_bytes(b"\x00hero v3")
+        result = engine.run()
+        assert result.failed_step == "push"
+        commit = result.data["commit"]
+
+        _git(
+            clone,
+            "remote",
+            "add",
+            "nowhere",
+            _git(clone, "remote", "get-url", "origin").strip(),
+        )
+        result = engine.run()
+        assert result.ok and result.resumed_from == "push"
+        assert result.data["commit"] == commit
+        assert _git(clone, "rev-list", "--count", "HEAD").strip() == "2"
+        assert _git(clone, "ls-remote", "nowhere", "main").split()[0] == commit
+        # der Push per Commit-ID setzt den Upstream trotzdem
+        upstream = _git(clone, "rev-parse", "--abbrev-ref", "main@{upstream}")
+        assert upstream.strip() == "nowhere/main"
+    finally:
+        repo.close()
+
+
+def test_crash_after_commit_resumes_at_commit(clone: Path) -> None:
+    class Crash(BaseException):
+        pass
+
+    class CrashingStaging(StagingPipeline):
+        def commit(self, message: str, paths=None) -> str:
+            super().commit(message, paths)
+            # Prozess stirbt zwischen Commit und Checkpoint
+            raise Crash()
+
+    repo = GitRepo(str(clone))
+    try:
+        checkpoint = Checkpoint(default_checkpoint_path(repo))
+        steps = build_unreal_steps(repo, snapshot=False, staging=CrashingStaging(repo))
+        (clone / "Hero.uasset").write_bytes(b"\x00hero v3")
+        with pytest.raises(Crash):
+            WorkflowEngine(steps, checkpoint, repo=repo).run()
+        commit = _git(clone, "rev-parse", "HEAD").strip()
+        assert checkpoint.load()["head"] != commit
+
+        engine = WorkflowEngine(
+            build_unreal_steps(repo, snapshot=False), checkpoint, repo=repo
+        )
+        result = engine.run()
+        assert result.ok and result.resumed_from == "commit"
+        assert result.data["commit"] == commit
+        assert _git(clone, "rev-list", "--count", "HEAD").strip() == "2"
+        assert _git(clone, "ls-remote", "origin", "main").split()[0] == commit
+    finally:
+        repo.close()
+
+
+@pytest.mark.parametrize("move", ["commit", "checkout"])
+def test_checkpoint_is_discarded_when_head_or_branch_moved(
+    clone: Path, move: str
+) -> None:
+    repo = GitRepo(str(clone))
+    try:
+        steps = build_unreal_steps(repo, remote="nowhere", snapshot=False)
+        checkpoint = Checkpoint(default_checkpoint_path(repo))
+        engine = WorkflowEngine(steps, checkpoint, repo=repo)
+        (clone / "Hero.uasset").write_bytes(b"\x00hero v3")
+        assert engine.run().failed_step == "push"
+        assert checkpoint.load()["branch"] == "main"
+        assert checkpoint.load()["head"] == engine.data["commit"]
+
+        # jemand arbeitet zwischen Fehlschlag und Resume im Repository weiter
+        if move == "commit":
+            _git(clone, "commit", "-q", "--allow-empty", "-m", "dazwischen")
+        else:
+            _git(clone, "checkout", "-q", "-b", "feature")
+        assert engine.resumable() is None
+        assert checkpoint.load() is None
+    finally:
+        repo.close()
+
+
+def test_status_warns_about_large_files_without_lfs(
+    clone: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    (clone / "Maps").mkdir()
+    (clone / "Maps" / ".gitattributes").write_text("*.umap filter=lfs\n")
+    _git(clone, "add", "Maps/.gitattributes")
+    (clone / "Maps" / "Level.umap").write_bytes(b"\x00" * 4096)
+    (clone / "Big.uasset").write_bytes(b"\x00" * 4096)
+    (clone / "Small.uasset").write_bytes(b"\x00" * 10)
+
+    repo = GitRepo(str(clone))
+    try:
+        steps = build_unreal_steps(
+            repo, steps=("status",), large_file_size=1024, snapshot=False
+        )
+        engine = WorkflowEngine(steps, Checkpoint(default_checkpoint_path(repo)))
+        assert engine.run().ok
+        warnings = [line for line in engine.states["status"].log if "Warning" in line]
+        # Level.umap liegt per verschachtelter .gitattributes in LFS
+        assert len(warnings) == 1 and "Big.uasset" in warnings[0]
+    finally:
+        repo.close()
+
+
+def test_pull_request_title_is_the_commit_subject(
+    clone: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import main.github_tools.pulls as pulls
+
+    opened = []
+
+    def create_pull_request(repo_name, head, base=None, title="", body=""):
+        opened.append((repo_name, head, title))
+        return "https://example.com/pr/1"
+
+    monkeypatch.setattr(pulls, "create_pull_request", create_pull_request)
+    repo = GitRepo(str(clone))
+    try:
+        steps = build_unreal_steps(
+            repo,
+            github_repo="me/Game",
+            message="Neue Assets\nfür Level 1\n\nDetails",
+            snapshot=False,
+        )
+        engine = WorkflowEngine(steps, Checkpoint(default_checkpoint_path(repo)))
+        (clone / "Hero.uasset").write_bytes(b"\x00hero v4")
+        result = engine.run()
+        assert result.ok, result.error
+        # wie --format=%s: erster Absatz in einer Zeile
+        assert opened == [("me/Game", "main", "Neue Assets für Level 1")]
+        assert result.data["pr_url"] == "https://example.com/pr/1"
+    finally:
+        repo.close()
+
+
+def test_headless_cli(
+    clone: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys
+) -> None:
+    # Metriken nicht im echten Cache-Ordner ablegen
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    (clone / "New.uasset").write_bytes(b"new")
+    code = main(
+        ["--repo", str(clone), "--steps", "status,add,commit", "--message", "CI"]
+    )
+    assert code == 0
+    out = capsys.readouterr().out
+    assert "commit   done" in out
+    assert _git(clone, "log", "-1", "--format=%s").strip() == "CI"